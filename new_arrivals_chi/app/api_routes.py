@@ -0,0 +1,410 @@
+"""Project: new_arrivals_chi.
+
+File name: api_routes.py
+Associated Files:
+    main.py, data_handler.py.
+
+Defines the read-only public API for the new arrivals portal. Partner agencies
+can read the organization directory from here instead of scraping the health
+search page.
+
+Methods:
+    * organizations - Streams the organization directory as NDJSON or JSON.
+    * facets - Returns matching organizations and facet counts for filters.
+    * search - Returns organizations ranked by a full-text query.
+    * open_organizations - Returns organizations open at a time or for a
+      window.
+    * organization_schedule - Returns an organization's hours today and its
+      next opening.
+    * parse_at - Reads the time of an opening hours request.
+    * calendar - Streams upcoming service occurrences as NDJSON or JSON.
+    * calendar_ics - Streams upcoming service occurrences as iCalendar.
+    * parse_calendar_request - Reads the date window and filters of a
+      calendar request.
+    * calendar_etag - Returns the entity tag of a calendar response.
+    * generate_ndjson - Yields records as newline-delimited JSON.
+    * generate_json_array - Yields records as a streamed JSON array.
+    * json_default - Serializes dates and times for the JSON encoder.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from http import HTTPStatus
+from types import MappingProxyType
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    jsonify,
+    request,
+    stream_with_context,
+)
+from new_arrivals_chi.app.data_handler import (
+    full_text_search,
+    stream_organizations,
+)
+from new_arrivals_chi.app.facets import FACET_FIELDS, get_facet_index
+from new_arrivals_chi.app.schedule import (
+    get_open_hours_index,
+    get_weekly_schedule,
+    local_minute_of_week,
+    local_today,
+)
+from new_arrivals_chi.app.occurrences import (
+    calendar_version,
+    find_occurrences,
+)
+from new_arrivals_chi.app.ical import generate_ical
+from new_arrivals_chi.app.http_cache import not_modified
+from new_arrivals_chi.app.view_models import View
+from new_arrivals_chi.app.database import MINUTES_PER_DAY, minute_of_week
+from new_arrivals_chi.app.constants import (
+    KEY_FORMAT,
+    KEY_MATCH,
+    KEY_QUERY,
+    KEY_LIMIT,
+    KEY_AT,
+    KEY_UNTIL,
+    KEY_START,
+    KEY_END,
+    KEY_CATEGORY,
+    KEY_ORGANIZATION,
+    SEARCH_RESULT_LIMIT,
+    CALENDAR_DEFAULT_DAYS,
+    CALENDAR_MAX_DAYS,
+)
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+
+@api.route("/organizations")
+def organizations():
+    """Streams every organization listed in the public directory.
+
+    The response is produced lazily, one organization at a time, so neither
+    the worker nor the database holds the whole directory in memory. By
+    default each line is one JSON document (NDJSON); `format=json` streams a
+    single JSON array instead.
+
+    Returns:
+        Streaming response with the organizations, using the same fields as
+        the organization page.
+    """
+    if request.args.get(KEY_FORMAT) == "json":
+        return Response(
+            stream_with_context(generate_json_array(stream_organizations())),
+            mimetype="application/json",
+        )
+
+    return Response(
+        stream_with_context(generate_ndjson(stream_organizations())),
+        mimetype="application/x-ndjson",
+    )
+
+
+@api.route("/facets")
+def facets():
+    """Filters the directory by facet values and counts the remaining options.
+
+    Each facet field (service, category, language, neighborhood, access and
+    day) may be given several times. Values of one field match any of them,
+    or all of them with `match=all`; different fields must all match.
+
+    Returns:
+        JSON with the total number of matching organizations, their ids and
+        the number of organizations behind every facet value.
+    """
+    filters = {
+        field: request.args.getlist(field)
+        for field in FACET_FIELDS
+        if request.args.getlist(field)
+    }
+    match_all = request.args.get(KEY_MATCH) == "all"
+
+    index = get_facet_index()
+    organization_ids = index.organization_ids(index.match(filters, match_all))
+
+    return jsonify(
+        total=len(organization_ids),
+        organization_ids=organization_ids,
+        facets=index.counts(filters, match_all),
+    )
+
+
+@api.route("/search")
+def search():
+    """Searches organization names, services, categories and service notes.
+
+    Every word of the `q` parameter must match, as a word or the start of
+    one. `limit` caps the number of results, up to SEARCH_RESULT_LIMIT.
+
+    Returns:
+        JSON with the query and the IDs of the matching organizations, best
+        match first.
+    """
+    query = request.args.get(KEY_QUERY, "")
+    limit = request.args.get(KEY_LIMIT, SEARCH_RESULT_LIMIT, type=int)
+    limit = min(max(limit, 1), SEARCH_RESULT_LIMIT)
+
+    return jsonify(query=query, organization_ids=full_text_search(query, limit))
+
+
+@api.route("/open")
+def open_organizations():
+    """Lists the organizations open at a time, or for a whole window.
+
+    `at` is an ISO 8601 date and time, taken as Chicago time unless it has an
+    offset, and defaults to now. `until` is an "HH:MM" time later the same
+    day; when given, only organizations open for the whole window are listed.
+    Answered from the in-memory opening hours index, which reads the
+    database at most once every DIRECTORY_CHECK_INTERVAL seconds.
+
+    Returns:
+        JSON with the Chicago minute of the week that was looked up and the
+        IDs of the open organizations.
+    """
+    start = parse_at()
+
+    end = None
+    if KEY_UNTIL in request.args:
+        try:
+            until = time.fromisoformat(request.args[KEY_UNTIL])
+        except ValueError:
+            abort(HTTPStatus.BAD_REQUEST)
+        end = minute_of_week(start // MINUTES_PER_DAY + 1, until)
+        if end <= start:
+            abort(HTTPStatus.BAD_REQUEST)
+
+    return jsonify(
+        minute_of_week=start,
+        organization_ids=get_open_hours_index().open_during(start, end),
+    )
+
+
+@api.route("/open/<int:organization_id>")
+def organization_schedule(organization_id):
+    """Returns an organization's opening hours today and its next opening.
+
+    Takes the same `at` parameter as open_organizations. Answered from the
+    organization's cached weekly schedule.
+
+    Returns:
+        JSON with the Chicago minute of the week that was looked up, the
+        minute the organization closes if it is open then, the
+        minute-of-week ranges of that day and the minute of the next
+        opening; or 404 Not Found if the organization is not listed.
+    """
+    minute = parse_at()
+    schedule = get_weekly_schedule(organization_id)
+    if schedule is None:
+        abort(HTTPStatus.NOT_FOUND)
+
+    return jsonify(
+        organization_id=organization_id,
+        minute_of_week=minute,
+        open_until=schedule.open_until(minute),
+        today=schedule.today(minute),
+        next_opening=schedule.next_opening(minute),
+    )
+
+
+@api.route("/calendar")
+def calendar():
+    """Streams the upcoming occurrences of listed services.
+
+    Occurrences are ordered by date and start time. By default each line is
+    one JSON document (NDJSON); `format=json` streams a JSON array instead.
+    Responses carry an entity tag, so subscribers polling the feed receive
+    304 Not Modified until service dates or organizations change.
+
+    Returns:
+        Streaming response with the occurrences, or 304 Not Modified.
+    """
+    start, end, categories, organization_id = parse_calendar_request()
+    as_array = request.args.get(KEY_FORMAT) == "json"
+
+    etag = calendar_etag(start, end, categories, organization_id, as_array)
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+
+    occurrences = find_occurrences(start, end, categories, organization_id)
+    if as_array:
+        response = Response(
+            stream_with_context(generate_json_array(occurrences)),
+            mimetype="application/json",
+        )
+    else:
+        response = Response(
+            stream_with_context(generate_ndjson(occurrences)),
+            mimetype="application/x-ndjson",
+        )
+    response.set_etag(etag, weak=True)
+    return response
+
+
+@api.route("/calendar.ics")
+def calendar_ics():
+    """Streams the upcoming occurrences of listed services as iCalendar.
+
+    Takes the same parameters as the calendar route, so a shelter can
+    subscribe to one organization, one category or the whole city.
+
+    Returns:
+        Streaming text/calendar response, or 304 Not Modified.
+    """
+    start, end, categories, organization_id = parse_calendar_request()
+
+    etag = calendar_etag(start, end, categories, organization_id, "ics")
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+
+    occurrences = find_occurrences(start, end, categories, organization_id)
+    response = Response(
+        stream_with_context(
+            generate_ical(occurrences, datetime.now(timezone.utc))
+        ),
+        mimetype="text/calendar",
+    )
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def parse_at():
+    """Reads the time of an opening hours request.
+
+    `at` is an ISO 8601 date and time, taken as Chicago time unless it has an
+    offset, and defaults to now. Aborts with 400 Bad Request when malformed.
+
+    Returns:
+        int: The Chicago minute of the week.
+    """
+    try:
+        at = datetime.fromisoformat(request.args[KEY_AT])
+    except KeyError:
+        at = None
+    except ValueError:
+        abort(HTTPStatus.BAD_REQUEST)
+    return local_minute_of_week(at)
+
+
+def parse_calendar_request():
+    """Reads the date window and filters of a calendar request.
+
+    `start` and `end` are ISO dates (end inclusive), defaulting to the next
+    CALENDAR_DEFAULT_DAYS days in Chicago. `category` may be repeated and
+    `organization` is an organization ID. Aborts with 400 Bad Request on
+    malformed values or a window longer than CALENDAR_MAX_DAYS.
+
+    Returns:
+        tuple: The start date, end date, list of categories and organization
+        ID (or None).
+    """
+    try:
+        start = date.fromisoformat(request.args.get(KEY_START, ""))
+    except ValueError:
+        if KEY_START in request.args:
+            abort(HTTPStatus.BAD_REQUEST)
+        start = local_today()
+
+    try:
+        end = date.fromisoformat(request.args.get(KEY_END, ""))
+    except ValueError:
+        if KEY_END in request.args:
+            abort(HTTPStatus.BAD_REQUEST)
+        end = start + timedelta(days=CALENDAR_DEFAULT_DAYS - 1)
+
+    if not 0 <= (end - start).days < CALENDAR_MAX_DAYS:
+        abort(HTTPStatus.BAD_REQUEST)
+
+    organization_id = None
+    if KEY_ORGANIZATION in request.args:
+        organization_id = request.args.get(KEY_ORGANIZATION, type=int)
+        if organization_id is None:
+            abort(HTTPStatus.BAD_REQUEST)
+
+    return start, end, request.args.getlist(KEY_CATEGORY), organization_id
+
+
+def calendar_etag(start, end, categories, organization_id, variant):
+    """Returns the entity tag of a calendar response.
+
+    The tag combines the calendar_version fingerprint of the service dates
+    and directory with the request's window, filters and output format.
+
+    Parameters:
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+        categories (list): The category filters.
+        organization_id (int): The organization filter, or None.
+        variant (object): Distinguishes the output formats.
+
+    Returns:
+        str: The entity tag.
+    """
+    key = "|".join(
+        str(part)
+        for part in (
+            calendar_version(),
+            start,
+            end,
+            sorted(categories),
+            organization_id,
+            variant,
+        )
+    )
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def generate_ndjson(records):
+    """Yields one JSON document per line.
+
+    Parameters:
+        records (iterable): The records to be serialized.
+
+    Yields:
+        str: A JSON document followed by a newline.
+    """
+    for record in records:
+        yield json.dumps(record, default=json_default) + "\n"
+
+
+def generate_json_array(records):
+    """Yields a JSON array one element at a time.
+
+    Parameters:
+        records (iterable): The records to be serialized.
+
+    Yields:
+        str: Pieces of the JSON array.
+    """
+    yield "["
+    for position, record in enumerate(records):
+        if position:
+            yield ","
+        yield json.dumps(record, default=json_default)
+    yield "]\n"
+
+
+def json_default(value):
+    """Serializes values the standard JSON encoder does not support.
+
+    Parameters:
+        value (object): The value to be serialized.
+
+    Returns:
+        str or dict: ISO 8601 representation of dates and times, the
+        fields of a view (see view_models.py), or a copy of a read-only
+        mapping held by a view.
+
+    Raises:
+        TypeError: If the value is not a date, time, view or read-only
+        mapping.
+    """
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, View):
+        return value.to_dict()
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -16,6 +16,7 @@ Methods:
     * post_change_password - Executes change password logic.
     * register - Route to the organization's inital register page.
     * post_register - Executes inital organization registration logic.
+    * cache_stats - Reports the cache counters to admins.
 """
 
 import bleach
@@ -28,6 +29,7 @@ from flask import (
     request,
     flash,
     current_app,
+    jsonify,
 )
 from new_arrivals_chi.app.database import User, Organization
 from new_arrivals_chi.app.utils import (
@@ -44,11 +46,16 @@ from new_arrivals_chi.app.constants import (
 )
 from flask_login import login_user, login_required, logout_user, current_user
 from functools import wraps
+from new_arrivals_chi.app.compression import compression_cache
+from new_arrivals_chi.app.render_cache import fragment_cache, render_cache
+from new_arrivals_chi.app.occurrences import calendar_cache
+from new_arrivals_chi.app.schedule import schedule_cache
 from new_arrivals_chi.app.data_handler import (
     create_user,
     change_db_password,
     change_organization_status,
     org_registration,
+    organization_cache_stats,
 )
 
 import logging
@@ -453,3 +460,24 @@ def admin_edit_organization(organization_id):
         organization=organization,
         language=language,
     )
+
+
+@authorize.route("/admin/cache_stats")
+@admin_required
+def cache_stats():
+    """Establishes route reporting the cache counters.
+
+    Returns:
+        JSON with the hit, miss, eviction and expiration counters and the
+        current size of each process-local cache: the organization cache, the
+        caches of rendered pages and search row fragments, the calendar and
+        schedule caches, and the cache of compressed pages.
+    """
+    return jsonify(
+        organization=organization_cache_stats(),
+        render=render_cache.stats(),
+        fragment=fragment_cache.stats(),
+        calendar=calendar_cache.stats(),
+        schedule=schedule_cache.stats(),
+        compression=compression_cache.stats(),
+    )
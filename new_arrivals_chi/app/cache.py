@@ -0,0 +1,229 @@
+"""Project: new_arrivals_chi.
+
+File name: cache.py
+Associated Files:
+   data_handler.py, authorize_routes.py.
+
+This file contains the process-local caching utilities used on the public read
+path, along with the data versions that writes bump to invalidate them.
+
+The versions and modification times live in the current process only: each
+worker counts the writes it handles itself and starts over when restarted.
+They only key the caches of that same process, where an entry missed by a
+write from another worker still expires after its TTL. They must not be part
+of anything sent to clients, such as ETags, since two workers can give the
+same version to different data; http_cache.py reads the database instead.
+
+Classes:
+    * LRUCache - Bounded, time-expiring cache with hit/miss/eviction counters.
+
+Methods:
+    * organization_version - Returns the current version of an organization.
+    * organization_modified - Returns when an organization last changed.
+    * data_version - Returns the current version of the directory as a whole.
+    * data_modified - Returns when the directory last changed.
+    * bump_organization_version - Marks an organization (and the directory) as
+      changed.
+    * bump_data_version - Marks every organization as changed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Least-recently-used cache whose entries also expire after a TTL.
+
+    Entries are evicted when the cache is full (least recently used first) or
+    when they are older than the time-to-live. The cache is safe to share
+    between request threads.
+    """
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic):
+        """Creates an empty cache.
+
+        Parameters:
+            maxsize (int): Maximum number of entries kept.
+            ttl (float): Seconds an entry stays valid after it is stored.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default on a miss.
+
+        Parameters:
+            key (hashable): The cache key.
+            default (object): Value returned when key is missing or expired.
+
+        Returns:
+            object: The cached value or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Stores value under key, evicting the least recently used entry.
+
+        Parameters:
+            key (hashable): The cache key.
+            value (object): The value to be cached.
+        """
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        """Removes key from the cache if present.
+
+        Parameters:
+            key (hashable): The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self):
+        """Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, expirations, current size, maxsize
+            and ttl.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+_versions_lock = threading.Lock()
+_organization_versions = {}
+_organization_modified = {}
+_data_version = 0
+_data_modified = time.time()
+# Version and time of the last change to every organization at once
+_all_version = 0
+_all_modified = _data_modified
+
+
+def organization_version(organization_id):
+    """Returns the current version of an organization.
+
+    Parameters:
+        organization_id (int): The ID of the organization.
+
+    Returns:
+        int: A counter that increases every time the organization is written
+        or the whole directory is rebuilt.
+    """
+    return max(_organization_versions.get(organization_id, 0), _all_version)
+
+
+def organization_modified(organization_id):
+    """Returns when an organization last changed in this process.
+
+    Parameters:
+        organization_id (int): The ID of the organization.
+
+    Returns:
+        float: Seconds since the epoch of the last write to the organization,
+        or of the process start if it has not been written since.
+    """
+    return max(_organization_modified.get(organization_id, 0), _all_modified)
+
+
+def data_version():
+    """Returns the current version of the directory as a whole.
+
+    Returns:
+        int: A counter that increases every time any organization is written.
+    """
+    return _data_version
+
+
+def data_modified():
+    """Returns when the directory last changed in this process.
+
+    Returns:
+        float: Seconds since the epoch of the last write to any organization,
+        or of the process start if there has been none.
+    """
+    return _data_modified
+
+
+def bump_organization_version(organization_id):
+    """Marks an organization, and therefore the directory, as changed.
+
+    Parameters:
+        organization_id (int): The ID of the organization that was written.
+
+    Returns:
+        int: The new version of the organization.
+    """
+    global _data_version, _data_modified
+
+    with _versions_lock:
+        _data_version += 1
+        _data_modified = time.time()
+        _organization_versions[organization_id] = _data_version
+        _organization_modified[organization_id] = _data_modified
+        return _data_version
+
+
+def bump_data_version():
+    """Marks every organization, and the directory, as changed.
+
+    Used when the directory is rebuilt as a whole, e.g. after data was
+    written outside of data_handler.
+
+    Returns:
+        int: The new version of the directory.
+    """
+    global _data_version, _data_modified, _all_version, _all_modified
+
+    with _versions_lock:
+        _data_version += 1
+        _data_modified = time.time()
+        _all_version = _data_version
+        _all_modified = _data_modified
+        return _data_version
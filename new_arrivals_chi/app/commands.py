@@ -0,0 +1,106 @@
+"""Project: new_arrivals_chi.
+
+File name: commands.py
+Associated Files:
+   main.py, data_handler.py, neighborhoods.py, static_export.py,
+   template_cache.py.
+
+Defines the maintenance commands available through the `flask` CLI.
+
+Methods:
+    * register_commands - Adds the commands to the Flask application.
+    * rebuild_directory_command - Rebuilds the organization directory read
+      model.
+    * build_neighborhood_graph_command - Builds the neighborhood adjacency
+      graph from a boundary file.
+    * export_static_command - Exports the public pages to static files.
+    * precompile_templates_command - Compiles the templates into the bytecode
+      cache.
+"""
+
+import json
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from new_arrivals_chi.app.data_handler import rebuild_directory
+from new_arrivals_chi.app.neighborhoods import (
+    build_adjacency,
+    save_neighborhood_graph,
+)
+from new_arrivals_chi.app.static_export import export_site
+from new_arrivals_chi.app.template_cache import precompile_templates
+from new_arrivals_chi.app.utils import load_neighborhoods
+
+
+def register_commands(app):
+    """Adds the maintenance commands to the Flask application.
+
+    Parameters:
+        app (Flask): The application to register the commands on.
+    """
+    app.cli.add_command(rebuild_directory_command)
+    app.cli.add_command(build_neighborhood_graph_command)
+    app.cli.add_command(export_static_command)
+    app.cli.add_command(precompile_templates_command)
+
+
+@click.command("rebuild-directory")
+@with_appcontext
+def rebuild_directory_command():
+    """Rebuild the organization_directory read model from scratch."""
+    count = rebuild_directory()
+    click.echo(f"Rebuilt directory with {count} organizations.")
+
+
+@click.command("build-neighborhood-graph")
+@click.argument("boundaries", type=click.File("r"))
+@click.option(
+    "--name-property",
+    default="pri_neigh",
+    show_default=True,
+    help="Feature property holding the neighborhood name.",
+)
+def build_neighborhood_graph_command(boundaries, name_property):
+    """Build static/neighborhood_adjacency.json from a GeoJSON file.
+
+    BOUNDARIES is a GeoJSON FeatureCollection of neighborhood polygons, such
+    as the City of Chicago's "Boundaries - Neighborhoods" export.
+    """
+    features = json.load(boundaries)["features"]
+    graph, unmatched = build_adjacency(
+        features, name_property, load_neighborhoods()
+    )
+    save_neighborhood_graph(graph)
+
+    click.echo(f"Wrote adjacency of {len(graph)} neighborhoods.")
+    for name in unmatched:
+        click.echo(f"No neighborhood value matches {name!r}.", err=True)
+
+
+@click.command("export-static")
+@click.argument("output", type=click.Path(file_okay=False))
+@with_appcontext
+def export_static_command(output):
+    """Export every public page in every language to OUTPUT.
+
+    Pages whose inputs did not change since the last export to OUTPUT are
+    skipped.
+    """
+    counts = export_site(output)
+    click.echo(
+        f"Wrote {counts['written']} pages, skipped {counts['skipped']} "
+        f"unchanged and removed {counts['removed']}."
+    )
+
+
+@click.command("precompile-templates")
+@with_appcontext
+def precompile_templates_command():
+    """Compile every template into the bytecode cache, e.g. at deploy time."""
+    compiled, failed = precompile_templates(current_app)
+    click.echo(
+        f"Compiled {len(compiled)} templates into "
+        f"{current_app.config['JINJA_BYTECODE_CACHE_DIR']}."
+    )
+    for name, error in failed.items():
+        click.echo(f"Could not compile {name}: {error}", err=True)
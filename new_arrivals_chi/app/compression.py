@@ -0,0 +1,182 @@
+"""Project: new_arrivals_chi.
+
+File name: compression.py
+Associated Files:
+   main.py, http_cache.py, constants.py.
+
+This file contains the compression of responses. Text responses are sent
+with gzip, or brotli when the optional brotli package is installed and the
+client accepts it. Bodies below COMPRESSION_MIN_SIZE are sent as they are,
+and streamed responses are compressed chunk by chunk, flushing after each one
+so the browser can render them progressively.
+
+Public pages carrying an ETag (see http_cache.py) are served again and again
+with the same content, so their compressed bodies are kept in an LRU cache
+keyed by a digest of the body: a hot page is only compressed once.
+
+Files sent by send_file, like the static folder, are left to the web server.
+
+Methods:
+    * init_compression - Compresses the responses of a Flask application.
+    * compress_response - Compresses a response the client accepts compressed.
+    * available_encodings - Returns the content codings the server supports.
+    * compress_body - Compresses a complete body.
+    * compress_stream - Compresses a streamed body chunk by chunk.
+"""
+
+import hashlib
+import zlib
+from functools import partial
+from http import HTTPStatus
+from flask import request
+from werkzeug.wsgi import ClosingIterator
+from new_arrivals_chi.app.cache import LRUCache
+from new_arrivals_chi.app.constants import (
+    BROTLI_QUALITY,
+    COMPRESSIBLE_MIMETYPES,
+    COMPRESSION_CACHE_SIZE,
+    COMPRESSION_MIN_SIZE,
+    GZIP_LEVEL,
+    ORGANIZATION_CACHE_TTL,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# zlib window bits selecting the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+compression_cache = LRUCache(COMPRESSION_CACHE_SIZE, ORGANIZATION_CACHE_TTL)
+
+
+def init_compression(app):
+    """Compresses the responses of a Flask application.
+
+    Parameters:
+        app (Flask): The application whose responses are compressed.
+    """
+    app.after_request(compress_response)
+
+
+def compress_response(response):
+    """Compresses a response when its type and size warrant it.
+
+    Parameters:
+        response (Response): The response about to be sent.
+
+    Returns:
+        Response: The response, compressed if the client accepts it.
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+
+    # Shared caches must not send a compressed body to clients that did not
+    # ask for one, whether or not this particular response is compressed
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.status_code != HTTPStatus.OK
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return response
+        response.set_data(
+            compress_body(body, encoding, cache="ETag" in response.headers)
+        )
+
+    response.headers["Content-Encoding"] = encoding
+
+    # Strong entity tags name exact bytes, so each coding needs its own
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+
+    return response
+
+
+def available_encodings():
+    """Returns the content codings the server supports, preferred first.
+
+    Returns:
+        list: "br" if brotli is installed, then "gzip".
+    """
+    if brotli is None:
+        return ["gzip"]
+    return ["br", "gzip"]
+
+
+def compress_body(body, encoding, cache=False):
+    """Compresses a complete response body.
+
+    Parameters:
+        body (bytes): The uncompressed body.
+        encoding (str): "gzip" or "br".
+        cache (bool): Whether to keep the compressed body for the next
+            response with the same content.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    key = (hashlib.sha1(body).digest(), encoding)
+    if cache:
+        compressed = compression_cache.get(key)
+        if compressed is not None:
+            return compressed
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        compressed = compressor.compress(body) + compressor.flush()
+
+    if cache:
+        compression_cache.set(key, compressed)
+    return compressed
+
+
+def compress_stream(chunks, encoding):
+    """Compresses a streamed response body chunk by chunk.
+
+    Parameters:
+        chunks (iterable): The chunks of the uncompressed body, as str or
+            bytes.
+        encoding (str): "gzip" or "br".
+
+    Returns:
+        iterable: The compressed body, flushed after every chunk. Closing it
+        closes chunks, which streams opened with stream_with_context need to
+        pop their request context.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, flush = compressor.process, compressor.flush
+        finish = compressor.finish
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        compress = compressor.compress
+        flush = partial(compressor.flush, zlib.Z_SYNC_FLUSH)
+        finish = compressor.flush
+
+    def compressed_chunks():
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+
+    return ClosingIterator(compressed_chunks(), getattr(chunks, "close", None))
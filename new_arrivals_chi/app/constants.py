@@ -4,3 +4,114 @@ KEY_LANGUAGE = "lang"
 KEY_TRANSLATIONS = "TRANSLATIONS"
 LANGUAGES = ["en", "es"]
 DEFAULT_LANGUAGE = "en"
+
+# Opening hours are entered, and "open now" is evaluated, in Chicago time
+TIMEZONE = "America/Chicago"
+
+# Names of the days of the week, Monday first: day_of_week n is WEEKDAYS[n - 1]
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+# Health search query parameters
+KEY_SERVICE = "service"
+KEY_NEIGHBORHOOD = "neighborhood"
+KEY_ORGANIZATION = "organization"
+KEY_HOURS = "hours"
+KEY_CURSOR = "cursor"
+KEY_OPEN = "open"
+KEY_NEAR = "near"
+KEY_HOPS = "hops"
+KEY_RADIUS = "radius"
+
+# API query parameters
+KEY_FORMAT = "format"
+KEY_MATCH = "match"
+KEY_QUERY = "q"
+KEY_LIMIT = "limit"
+KEY_AT = "at"
+KEY_UNTIL = "until"
+KEY_START = "start"
+KEY_END = "end"
+KEY_CATEGORY = "category"
+
+# Number of organizations shown per health search page
+SEARCH_PAGE_SIZE = 25
+
+# Default and maximum radius of a "near" health search, in miles
+NEAR_DEFAULT_RADIUS = 5
+NEAR_MAX_RADIUS = 50
+
+# Maximum number of borders a neighborhood search may be widened by
+NEIGHBORHOOD_MAX_HOPS = 2
+
+# Process-local cache in front of extract_organization; entries also expire
+# so workers that did not handle a write pick it up within the TTL (seconds)
+ORGANIZATION_CACHE_SIZE = 2048
+ORGANIZATION_CACHE_TTL = 300
+
+# In-memory indexes over the directory check, at most this often (seconds),
+# whether another process changed the read model since they were built
+DIRECTORY_CHECK_INTERVAL = 5
+
+# Health search dropdown options are cached per language and data version
+SEARCH_OPTIONS_CACHE_SIZE = 16
+
+# Maximum number of organizations returned by the full-text search
+SEARCH_RESULT_LIMIT = 100
+
+# Expanded service calendars are cached per date window and data version
+CALENDAR_CACHE_SIZE = 32
+
+# Default and maximum number of days covered by a calendar feed
+CALENDAR_DEFAULT_DAYS = 30
+CALENDAR_MAX_DAYS = 366
+
+# Responses of these types are compressed when the client accepts it; images
+# and fonts are already compressed
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/calendar",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "image/svg+xml",
+    }
+)
+
+# Bodies smaller than this (bytes) are sent uncompressed: below about one
+# packet, compression saves nothing but costs CPU
+COMPRESSION_MIN_SIZE = 1024
+
+# Compression levels, trading CPU on the request thread for bytes sent
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed bodies of cacheable pages are kept per content and encoding
+COMPRESSION_CACHE_SIZE = 64
+
+# Rendered informational pages are cached per endpoint, language and
+# template modification time; the TTL only frees pages no longer requested
+RENDER_CACHE_SIZE = 64
+RENDER_CACHE_TTL = 3600
+
+# Fragments of data pages (e.g. health search rows) are cached per
+# organization version and language
+FRAGMENT_CACHE_SIZE = 4096
+
+# Weekly schedules are cached per organization version
+SCHEDULE_CACHE_SIZE = 2048
+
+# Streamed pages are sent in chunks of at least this many characters, so
+# each flush of the compressor covers several table rows
+STREAM_CHUNK_SIZE = 4096
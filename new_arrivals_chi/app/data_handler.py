@@ -8,22 +8,49 @@ This file contains utility methods for validating user input and handling
 database operations.
 
 Methods:
+    * hash_password - Hashes a password with bcrypt.
     * create_user - Creates a new user in the database.
     * change_db_password - Changes the password for the current user in the
       database.
     * create_organization_profile - Creates an organization in the database.
+    * provision_organization - Creates an organization and its user in one
+      transaction.
     * org_registration - Registers an organization's location and hours.
-    * add_location - Adds a new location to the database.
-    * add_hours - Adds new operating hours to the database.
     * assign_location_foreign_key_org_table - Assigns a location ID to
-      an organization.
+      an organization, without committing.
     * change_organization_status - Changes the status of an organization in the
       database.
+    * register_write_hook - Registers a function called after an
+      organization is written.
+    * invalidate_organization - Drops cached data for an organization after
+      it is written.
+    * refresh_directory_entry - Rebuilds an organization's row in the
+      organization_directory read model.
+    * rebuild_directory - Rebuilds the whole organization_directory read model.
+    * retrieve_directory_entry - Reads an organization from the read model.
+    * retrieve_directory_entries - Reads several organizations from the read
+      model.
+    * build_directory_info - Builds the organization view from a read model
+      row.
+    * organization_cache_stats - Returns the organization cache counters.
     * extract_organization - Extracts detailed information about an
       organization.
+    * build_organization_info - Builds the organization view from a loaded
+      organization.
+    * stream_organizations - Lazily yields every listed organization using a
+      server-side cursor.
+    * listed_organization_filters - Conditions for organizations listed in the
+      public directory.
+    * search_organizations - Filters the public directory and returns one
+      keyset-paginated page of organization IDs.
+    * full_text_search - Ranks listed organizations by how well they match a
+      text query.
+    * retrieve_search_options - Retrieves the options offered by the health
+      search filters, cached per language.
+    * count_search_options - Counts the listed organizations behind every
+      health search option.
     * retrieve_hours - Retrieves the operating hours for an organization.
-    * extract_hour_info - Extracts and organizes hour information for a
-      specific day.
+    * hours_order - Sort key ordering hours rows by day, then opening time.
     * retrieve_languages - Retrieves all languages spoken at an organization.
     * retrieve_services - Retrieves detailed information about the services
       offered by an organization.
@@ -41,15 +68,88 @@ from new_arrivals_chi.app.database import (
     Organization,
     Location,
     Hours,
+    Service,
+    OrganizationDirectory,
     organizations_hours,
+    organization_search_document,
+    minute_of_week,
+    SEARCH_CONFIG,
 )
 from flask_login import current_user
 from flask_bcrypt import Bcrypt
-from sqlalchemy import insert
-
+from sqlalchemy import and_, insert, or_, text
+from sqlalchemy.dialects.postgresql import to_tsquery
+from sqlalchemy.orm import aliased, selectinload
+from new_arrivals_chi.app.cache import (
+    LRUCache,
+    organization_version,
+    data_version,
+    bump_organization_version,
+    bump_data_version,
+)
+from new_arrivals_chi.app.constants import (
+    SEARCH_PAGE_SIZE,
+    ORGANIZATION_CACHE_SIZE,
+    ORGANIZATION_CACHE_TTL,
+    SEARCH_OPTIONS_CACHE_SIZE,
+    SEARCH_RESULT_LIMIT,
+    LANGUAGES,
+    DEFAULT_LANGUAGE,
+    WEEKDAYS,
+)
+from new_arrivals_chi.app.utils import (
+    format_time_for_locale,
+    parse_search_terms,
+)
+from new_arrivals_chi.app.neighborhoods import expand_neighborhood
+from new_arrivals_chi.app.view_models import (
+    DateView,
+    HoursSlot,
+    LocationView,
+    OrganizationView,
+    ServiceView,
+)
+from datetime import time
 
 bcrypt = Bcrypt()
 
+# Rows fetched per round trip when streaming the whole directory
+STREAM_BATCH_SIZE = 100
+
+# Organization views keyed by (organization id, organization version)
+organization_cache = LRUCache(ORGANIZATION_CACHE_SIZE, ORGANIZATION_CACHE_TTL)
+
+# Health search dropdown options keyed by (language, data version)
+search_options_cache = LRUCache(
+    SEARCH_OPTIONS_CACHE_SIZE, ORGANIZATION_CACHE_TTL
+)
+
+# Functions called with an organization id after its read model row is
+# rebuilt, or with None after the whole read model is rebuilt
+write_hooks = []
+
+# Loader options that fetch an organization's full graph with one query per
+# relationship instead of one query per organization
+ORGANIZATION_LOAD_OPTIONS = (
+    selectinload(Organization.locations),
+    selectinload(Organization.languages),
+    selectinload(Organization.hours),
+    selectinload(Organization.services).selectinload(Service.service_dates),
+    selectinload(Organization.services).selectinload(Service.locations),
+)
+
+
+def hash_password(password):
+    """Hashes a password with bcrypt.
+
+    Parameters:
+        password (str): The password to be hashed.
+
+    Returns:
+        str: The bcrypt hash of the password.
+    """
+    return bcrypt.generate_password_hash(password).decode("utf-8")
+
 
 def create_user(email, password):
     """Creates a new user in the database.
@@ -63,7 +163,7 @@ def create_user(email, password):
     """
     new_user = User(
         email=email,
-        password=bcrypt.generate_password_hash(password).decode("utf-8"),
+        password=hash_password(password),
     )
     db.session.add(new_user)
     db.session.commit()
@@ -77,9 +177,7 @@ def change_db_password(password):
     Parameters:
         password (str): The new password for the current user.
     """
-    current_user.password = bcrypt.generate_password_hash(password).decode(
-        "utf-8"
-    )
+    current_user.password = hash_password(password)
     db.session.commit()
 
 
@@ -103,128 +201,141 @@ def create_organization_profile(name, phone, status):
         return None
 
     new_organization = Organization(name=name, phone=phone, status=status)
+    # A new organization has no location or services yet, so it is not
+    # listed and has no read model row to refresh
     db.session.add(new_organization)
     db.session.commit()
+    invalidate_organization(new_organization.id)
 
     return new_organization.id
 
 
+def provision_organization(name, phone, email, password, status="HIDDEN"):
+    """Creates an organization and the user who manages it.
+
+    Both rows are written in one transaction, with a single flush, so a
+    failure (e.g. an email address already in use) leaves neither the
+    organization nor the user behind.
+
+    Parameters:
+        name (str): Name of organization.
+        phone (str): Primary external contact number for the organization.
+        email (str): The email address of the organization's user.
+        password (str): The password of the organization's user.
+        status (str): Indicates the organization's status eg: ACTIVE, HIDDEN,
+        SUSPENDED.
+
+    Returns:
+        User: The new user, linked to the new organization, or None if a
+        required detail is missing.
+    """
+    if not all([name, phone, email, password, status]):
+        return None
+
+    try:
+        new_organization = Organization(name=name, phone=phone, status=status)
+        new_user = User(
+            email=email,
+            password=hash_password(password),
+            organization=new_organization,
+        )
+        db.session.add(new_user)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    invalidate_organization(new_organization.id)
+
+    return new_user
+
+
 def org_registration(location, hours):
     """Create organization location and hours information in the database.
 
     This function registers an organization's location and its operating hours
     in the database, associating them with the current user’s organization.
+    Everything is written in one transaction: the hours and their links to the
+    organization are inserted with one executemany each, the organization's
+    read model row is rebuilt in the same session, and nothing is kept if any
+    statement fails.
 
     Parameters:
         location (dict): A dictionary containing the location details with keys
                     'street', 'zip-code', 'city', 'state', and 'neighborhood'.
         hours (dict): A dictionary containing the operating hours with keys
                       being days of the week and values being lists of opening
-                      and closing time tuples.
+                      and closing time tuples, in HH:MM format.
 
     Returns:
         None
     """
-    new_location = add_location(
-        street_address=location["street"],
-        zip_code=location["zip-code"],
-        city=location["city"],
-        state=location["state"],
-        primary_location=True,
-        neighborhood=location["neighborhood"],
-    )
-
-    # Associate location with organization
-    assign_location_foreign_key_org_table(
-        organization_id=current_user.organization.id,
-        new_location_id=new_location.id,
-    )
+    organization = current_user.organization
 
-    for day in hours:
-        for hours_segment in hours[day]:
-            opening_time, closing_time = hours_segment
-            new_hours = add_hours(
-                day_of_week=day,
-                opening_time=opening_time,
-                closing_time=closing_time,
-            )
+    try:
+        new_location = Location(
+            street_address=location["street"],
+            zip_code=location["zip-code"],
+            city=location["city"],
+            state=location["state"],
+            primary_location=True,
+            neighborhood=location["neighborhood"],
+            created_by=current_user.id,
+        )
+        db.session.add(new_location)
+        db.session.flush()
+
+        # Associate location with organization
+        organization.location_id = new_location.id
+
+        # Bulk inserts skip the Hours mapper events, so the minute-of-week
+        # range is computed here
+        hours_rows = []
+        for day, segments in hours.items():
+            for opening_time, closing_time in segments:
+                opening_time = time.fromisoformat(opening_time)
+                closing_time = time.fromisoformat(closing_time)
+                hours_rows.append(
+                    {
+                        "day_of_week": int(day),
+                        "opening_time": opening_time,
+                        "closing_time": closing_time,
+                        "start_minute": minute_of_week(day, opening_time),
+                        "end_minute": minute_of_week(day, closing_time),
+                        "created_by": current_user.id,
+                    }
+                )
 
+        # Every row is linked to the same organization, so the order the ids
+        # come back in does not matter and the insert is batched
+        if hours_rows:
+            hours_ids = db.session.scalars(
+                insert(Hours).returning(Hours.id), hours_rows
+            ).all()
             db.session.execute(
-                insert(organizations_hours).values(
-                    hours_id=new_hours.id,
-                    organization_id=current_user.organization.id,
-                )
+                insert(organizations_hours),
+                [
+                    {"hours_id": hours_id, "organization_id": organization.id}
+                    for hours_id in hours_ids
+                ],
             )
 
-    db.session.commit()
-
-
-def add_location(
-    street_address, zip_code, city, state, primary_location, neighborhood
-):
-    """Add a new location to the database.
-
-    This function creates a new location with the provided details and adds it
-    to the database.
-
-    Parameters:
-        street_address (str): The street address of the location.
-        zip_code (str): The zip code of the location.
-        city (str): The city of the location.
-        state (str): The state of the location.
-        primary_location (bool): Indicates if this is the primary location.
-        neighborhood (str): The neighborhood of the location.
-
-    Returns:
-        Location: The newly created Location object.
-    """
-    new_location = Location(
-        street_address=street_address,
-        zip_code=zip_code,
-        city=city,
-        state=state,
-        primary_location=primary_location,
-        neighborhood=neighborhood,
-        created_by=current_user.id,
-    )
-
-    db.session.add(new_location)
-    db.session.commit()
-
-    return new_location
-
-
-def add_hours(day_of_week, opening_time, closing_time):
-    """Add new operating hours to the database.
-
-    This function creates a new operating hours entry with the provided details
-    and adds it to the database.
+        refresh_directory_entry(organization.id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
 
-    Parameters:
-        day_of_week (int): The day of the week ('Monday = 1, 'Tuesday' = 2, ..).
-        opening_time (str): The opening time in HH:MM format.
-        closing_time (str): The closing time in HH:MM format.
-
-    Returns:
-        Hours: The newly created Hours object.
-    """
-    new_hours = Hours(
-        day_of_week=day_of_week,
-        opening_time=opening_time,
-        closing_time=closing_time,
-        created_by=current_user.id,
-    )
-
-    db.session.add(new_hours)
-    db.session.commit()
-
-    return new_hours
+    invalidate_organization(organization.id)
 
 
 def assign_location_foreign_key_org_table(organization_id, new_location_id):
     """Add location ID to organization table.
 
-    This function updates the location ID of the specified organization.
+    This function updates the location ID of the specified organization and
+    rebuilds its read model row in the same session. Nothing is committed:
+    the caller commits the change along with the rest of its transaction,
+    then calls invalidate_organization.
 
     Parameters:
         organization_id (int): The ID of the organization to be updated.
@@ -244,7 +355,7 @@ def assign_location_foreign_key_org_table(organization_id, new_location_id):
         print(e)
 
     organization_row.location_id = new_location_id
-    db.session.commit()
+    refresh_directory_entry(organization_id)
     return
 
 
@@ -270,12 +381,252 @@ def change_organization_status(org_id):
         else:
             organization.status = "ACTIVE"
 
+        refresh_directory_entry(org_id)
         db.session.commit()  # test on test db
+        invalidate_organization(org_id)
         return organization
     else:
         return None
 
 
+def register_write_hook(hook):
+    """Registers a function called after an organization is written.
+
+    Hooks keep derived, in-memory structures in step with the read model.
+    They receive the organization's id once its organization_directory row
+    has been rebuilt, or None once the whole table has been rebuilt.
+
+    Args:
+        hook (callable): Function taking an organization id or None.
+
+    Returns:
+        callable: The hook, so this can be used as a decorator.
+    """
+    write_hooks.append(hook)
+    return hook
+
+
+def invalidate_organization(organization_id):
+    """Drops cached data for an organization after it is written.
+
+    Every function in this file that writes organization data rebuilds the
+    organization's read model row with refresh_directory_entry before its
+    single commit (new organizations are not listed yet and have none), and
+    calls this once the commit succeeded. The write hooks
+    run, then bumping the organization's version makes every cache keyed on
+    that version miss on the next read.
+
+    Args:
+        organization_id (int): The ID of the organization that was written,
+            or None when the write is not tied to an organization.
+    """
+    if organization_id is None:
+        return
+
+    for hook in write_hooks:
+        hook(organization_id)
+
+    organization_cache.discard(
+        (organization_id, organization_version(organization_id))
+    )
+    bump_organization_version(organization_id)
+
+
+def refresh_directory_entry(organization_id):
+    """Rebuilds an organization's row in the organization_directory table.
+
+    The row is removed when the organization is no longer listed in the
+    public directory. The change is only flushed: it is committed with the
+    write that changed the organization, so the two are kept or rolled back
+    together.
+
+    Args:
+        organization_id (int): The ID of the organization to be refreshed.
+    """
+    org_info = (
+        Organization.query.options(*ORGANIZATION_LOAD_OPTIONS)
+        .filter(Organization.id == organization_id)
+        .filter(*listed_organization_filters())
+        .first()
+    )
+    entry = db.session.get(OrganizationDirectory, organization_id)
+
+    if org_info is None:
+        if entry is not None:
+            db.session.delete(entry)
+    else:
+        if entry is None:
+            entry = OrganizationDirectory(organization_id=organization_id)
+            db.session.add(entry)
+        populate_directory_entry(entry, build_organization_info(org_info))
+
+    db.session.flush()
+
+
+def rebuild_directory():
+    """Rebuilds the whole organization_directory read model.
+
+    Used to fill the table after it is created and to repair it after data
+    is written outside of this file.
+
+    Returns:
+        int: The number of organizations in the rebuilt directory.
+    """
+    OrganizationDirectory.query.delete()
+
+    count = 0
+    for organization in stream_organizations():
+        entry = OrganizationDirectory(organization_id=organization.id)
+        populate_directory_entry(entry, organization)
+        db.session.add(entry)
+        count += 1
+
+    db.session.commit()
+
+    for hook in write_hooks:
+        hook(None)
+    bump_data_version()
+
+    return count
+
+
+def populate_directory_entry(entry, organization):
+    """Copies an organization view into a read model row.
+
+    Args:
+        entry (OrganizationDirectory): The row to be filled.
+        organization (OrganizationView): The organization, as built by
+            build_organization_info.
+    """
+    services = organization.service
+
+    entry.name = organization.name
+    entry.phone = organization.phone
+    entry.street_address = organization.street_address
+    entry.zip_code = organization.zip_code
+    entry.neighborhood = organization.neighborhood
+    entry.city = organization.city
+    entry.state = organization.state
+    entry.latitude = organization.latitude
+    entry.longitude = organization.longitude
+    entry.service_names = ", ".join(service.service for service in services)
+    entry.service_categories = ", ".join(
+        sorted({service.category for service in services})
+    )
+    entry.service_notes = " ".join(
+        service.service_note for service in services if service.service_note
+    )
+    entry.languages = sorted(organization.languages)
+    entry.services = [
+        {
+            "category": service.category,
+            "service": service.service,
+            "access": service.access,
+            "service_note": service.service_note,
+        }
+        for service in services
+    ]
+    entry.hours = {
+        day: [
+            [segment.open.isoformat(), segment.close.isoformat()]
+            for segment in segments
+        ]
+        for day, segments in organization.hours.items()
+    }
+
+
+def retrieve_directory_entry(organization_id):
+    """Reads an organization from the organization_directory read model.
+
+    Args:
+        organization_id (int): The ID of the organization.
+
+    Returns:
+        OrganizationView: The organization (see build_directory_info), or
+        None if the organization is not listed in the public directory.
+    """
+    entry = db.session.get(OrganizationDirectory, organization_id)
+    if entry is None:
+        return None
+    return build_directory_info(entry)
+
+
+def retrieve_directory_entries(organization_ids):
+    """Reads several organizations from the read model in one query.
+
+    Args:
+        organization_ids (list): The IDs of the organizations.
+
+    Returns:
+        list: OrganizationViews (see build_directory_info) in the same
+        order as organization_ids. Unlisted IDs are skipped.
+    """
+    if not organization_ids:
+        return []
+
+    entries = {
+        entry.organization_id: entry
+        for entry in OrganizationDirectory.query.filter(
+            OrganizationDirectory.organization_id.in_(organization_ids)
+        )
+    }
+    return [
+        build_directory_info(entries[org_id])
+        for org_id in organization_ids
+        if org_id in entries
+    ]
+
+
+def build_directory_info(entry):
+    """Builds the organization view from a read model row.
+
+    The view has the same fields as extract_organization. Services carry
+    their name, category, access and note, but not their dates and
+    locations.
+
+    Args:
+        entry (OrganizationDirectory): The read model row.
+
+    Returns:
+        OrganizationView: The organization's details.
+    """
+    return OrganizationView(
+        name=entry.name,
+        phone=entry.phone,
+        languages=tuple(entry.languages),
+        service=tuple(ServiceView(**service) for service in entry.services),
+        hours={
+            day: tuple(
+                HoursSlot(
+                    time.fromisoformat(opening_time),
+                    time.fromisoformat(closing_time),
+                )
+                for opening_time, closing_time in segments
+            )
+            for day, segments in entry.hours.items()
+        },
+        street_address=entry.street_address,
+        zip_code=entry.zip_code,
+        city=entry.city,
+        state=entry.state,
+        primary_location=True,
+        neighborhood=entry.neighborhood,
+        latitude=entry.latitude,
+        longitude=entry.longitude,
+        id=entry.organization_id,
+    )
+
+
+def organization_cache_stats():
+    """Returns the organization cache counters.
+
+    Returns:
+        dict: hits, misses, evictions, expirations, size, maxsize and ttl of
+        the cache in front of extract_organization.
+    """
+    return organization_cache.stats()
+
+
 def extract_organization(organization_id):
     """Extracts detailed information about an organization.
 
@@ -287,16 +638,59 @@ def extract_organization(organization_id):
         organization_id (int): The ID of the organization to be extracted.
 
     Returns:
-        dict: A dictionary containing the organization's details such as name,
-              phone, languages, services, hours, and primary location
-              information.
+        OrganizationView: The organization's details such as name, phone,
+              languages, services, hours, and primary location information.
+              The view is shared through the cache, and is immutable.
     """
-    org_info = Organization.query.filter_by(id=organization_id).first()
-    primary_location_info = Location.query.filter_by(
-        id=org_info.location_id
-    ).first()
+    cache_key = (organization_id, organization_version(organization_id))
+    organization = organization_cache.get(cache_key)
 
-    # Retrieve all opperating hours
+    if organization is None:
+        org_info = Organization.query.filter_by(id=organization_id).first()
+        organization = build_organization_info(org_info)
+        organization_cache.set(cache_key, organization)
+
+    return organization
+
+
+def stream_organizations(batch_size=STREAM_BATCH_SIZE):
+    """Lazily yields every organization listed in the public directory.
+
+    Rows are read through a server-side cursor (yield_per) and each batch's
+    relationships are eager-loaded together, so memory use depends on the
+    batch size rather than on the size of the directory.
+
+    Args:
+        batch_size (int): Number of organizations fetched per round trip.
+
+    Yields:
+        OrganizationView: The organizations (see extract_organization),
+              ordered by ID.
+    """
+    query = (
+        Organization.query.options(*ORGANIZATION_LOAD_OPTIONS)
+        .filter(*listed_organization_filters())
+        .order_by(Organization.id)
+        .yield_per(batch_size)
+    )
+
+    for org_info in query:
+        yield build_organization_info(org_info)
+
+
+def build_organization_info(org_info):
+    """Builds the organization view from a loaded organization.
+
+    Args:
+        org_info (Organization): The organization to be described.
+
+    Returns:
+        OrganizationView: The organization's details such as name, phone,
+              languages, services, hours, and primary location information.
+    """
+    primary_location_info = org_info.locations
+
+    # Retrieve all languages spoken
     language_list = retrieve_languages(org_info)
 
     # Retrieve all opperating hours
@@ -305,96 +699,343 @@ def extract_organization(organization_id):
     # Retrieve services and associated locations
     complete_service_info = retrieve_services(org_info.services)
 
-    organization = {
-        "name": org_info.name,
-        "phone": org_info.phone,
-        # "email": user_info.email,
-        "languages": language_list,
-        "service": complete_service_info,
-        "hours": organization_hours,
+    organization = OrganizationView(
+        name=org_info.name,
+        phone=org_info.phone,
+        languages=language_list,
+        service=complete_service_info,
+        hours=organization_hours,
         # Primary location information
-        "street_address": primary_location_info.street_address,
-        "zip_code": primary_location_info.zip_code,
-        "city": primary_location_info.city,
-        "state": primary_location_info.state,
-        "primary_location": primary_location_info.primary_location,
-        "neighborhood": primary_location_info.neighborhood,
-        "id": organization_id,
-    }
+        street_address=primary_location_info.street_address,
+        zip_code=primary_location_info.zip_code,
+        city=primary_location_info.city,
+        state=primary_location_info.state,
+        primary_location=primary_location_info.primary_location,
+        neighborhood=primary_location_info.neighborhood,
+        latitude=primary_location_info.latitude,
+        longitude=primary_location_info.longitude,
+        id=org_info.id,
+    )
 
     return organization
 
 
+def listed_organization_filters():
+    """Conditions for organizations listed in the public directory.
+
+    An organization is listed once it has a primary location and offers at
+    least one service.
+
+    Returns:
+        tuple: SQLAlchemy filter conditions on the Organization model.
+    """
+    return (
+        Organization.location_id.isnot(None),
+        Organization.services.any(),
+    )
+
+
+def search_organizations(
+    service=None,
+    neighborhood=None,
+    organization=None,
+    hours=None,
+    open_at=None,
+    organization_ids=None,
+    neighborhood_hops=0,
+    after=None,
+    page_size=SEARCH_PAGE_SIZE,
+):
+    """Filters the public directory and returns one page of organization IDs.
+
+    Filtering happens in SQL and pages are ordered by (name, id), so each page
+    is fetched with keyset pagination: the query starts right after the last
+    row of the previous page instead of counting past an offset.
+
+    Args:
+        service (str, optional): Only organizations offering this service.
+        neighborhood (str, optional): Only organizations whose primary
+            location is in this neighborhood.
+        organization (str, optional): Only organizations with this name.
+        hours (tuple, optional): (start, end) times; only organizations open
+            for the whole window on at least one day.
+        open_at (int, optional): Only organizations open at this minute of
+            the week (minutes since Monday 00:00).
+        organization_ids (list, optional): Only organizations with these IDs.
+        neighborhood_hops (int): Also match organizations in neighborhoods up
+            to this many borders away from neighborhood.
+        after (tuple, optional): (name, id) of the last organization on the
+            previous page.
+        page_size (int): Maximum number of organizations on the page.
+
+    Returns:
+        tuple: The list of organization IDs on the page and the (name, id)
+        position to pass as `after` for the next page, or None on the last
+        page.
+    """
+    query = db.session.query(Organization.id, Organization.name).filter(
+        *listed_organization_filters()
+    )
+
+    if service:
+        query = query.filter(
+            Organization.services.any(Service.service == service)
+        )
+    if neighborhood:
+        query = query.join(Location, Organization.location_id == Location.id)
+        if neighborhood_hops:
+            query = query.filter(
+                Location.neighborhood.in_(
+                    expand_neighborhood(neighborhood, neighborhood_hops)
+                )
+            )
+        else:
+            query = query.filter(Location.neighborhood == neighborhood)
+    if organization:
+        query = query.filter(Organization.name == organization)
+    if hours:
+        start, end = hours
+        query = query.filter(
+            Organization.hours.any(
+                and_(Hours.opening_time <= start, Hours.closing_time >= end)
+            )
+        )
+    if open_at is not None:
+        query = query.filter(
+            Organization.hours.any(
+                and_(Hours.start_minute <= open_at, Hours.end_minute > open_at)
+            )
+        )
+    if organization_ids is not None:
+        query = query.filter(Organization.id.in_(organization_ids))
+    if after:
+        after_name, after_id = after
+        query = query.filter(
+            or_(
+                Organization.name > after_name,
+                and_(
+                    Organization.name == after_name, Organization.id > after_id
+                ),
+            )
+        )
+
+    rows = (
+        query.order_by(Organization.name, Organization.id)
+        .limit(page_size + 1)
+        .all()
+    )
+
+    next_after = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_after = (rows[-1].name, rows[-1].id)
+
+    return [row.id for row in rows], next_after
+
+
+def full_text_search(query, limit=SEARCH_RESULT_LIMIT):
+    """Ranks listed organizations by how well they match a text query.
+
+    Organization names, service names, categories and service notes are
+    searched through a full-text index over the organization_directory read
+    model: FTS5 on SQLite, a GIN-indexed tsvector on Postgres. Every word of
+    the query must match, as a word or the start of one; matches in the name
+    rank above matches in services, which rank above matches in notes.
+
+    Args:
+        query (str): The text entered by the user.
+        limit (int): Maximum number of organization IDs returned.
+
+    Returns:
+        list: Organization IDs, best match first.
+    """
+    terms = parse_search_terms(query)
+    if not terms:
+        return []
+
+    if db.session.get_bind().dialect.name == "sqlite":
+        rows = db.session.execute(
+            text(
+                "SELECT rowid FROM organization_search "
+                "WHERE organization_search MATCH :match "
+                "ORDER BY bm25(organization_search, 10.0, 5.0, 5.0, 1.0), "
+                "rowid LIMIT :limit"
+            ),
+            {
+                "match": " ".join(f'"{term}"*' for term in terms),
+                "limit": limit,
+            },
+        )
+        return [row[0] for row in rows]
+
+    tsquery = to_tsquery(
+        SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms)
+    )
+    rows = (
+        db.session.query(OrganizationDirectory.organization_id)
+        .filter(organization_search_document.op("@@")(tsquery))
+        .order_by(
+            db.func.ts_rank(organization_search_document, tsquery).desc(),
+            OrganizationDirectory.organization_id,
+        )
+        .limit(limit)
+    )
+    return [row[0] for row in rows]
+
+
+def retrieve_search_options(language=DEFAULT_LANGUAGE):
+    """Retrieves the options offered by the health search filters.
+
+    Each filter's distinct values are counted with a GROUP BY in the database,
+    so the page does not walk every organization and service to build its
+    dropdowns. The options are cached per language until any organization is
+    written.
+
+    Args:
+        language (str): The language the page is rendered in. Unsupported
+            languages share the default language's entry.
+
+    Returns:
+        dict: For services, neighborhoods, organizations and hours, a sorted
+        list of options, each a dictionary with the value submitted by the
+        form, its label and the number of listed organizations it matches.
+    """
+    if language not in LANGUAGES:
+        language = DEFAULT_LANGUAGE
+
+    key = (language, data_version())
+    options = search_options_cache.get(key)
+    if options is None:
+        options = count_search_options(language)
+        search_options_cache.set(key, options)
+    return options
+
+
+def count_search_options(language=DEFAULT_LANGUAGE):
+    """Counts the listed organizations behind every health search option.
+
+    Args:
+        language (str): The language hours labels are formatted for.
+
+    Returns:
+        dict: Option lists as described in retrieve_search_options.
+    """
+    listed = listed_organization_filters()
+    organization_count = db.func.count(db.distinct(Organization.id))
+
+    services = (
+        db.session.query(Service.service, organization_count)
+        .join(Service.organizations)
+        .filter(*listed)
+        .group_by(Service.service)
+        .order_by(Service.service)
+    )
+    neighborhoods = (
+        db.session.query(Location.neighborhood, organization_count)
+        .join(Organization, Organization.location_id == Location.id)
+        .filter(*listed)
+        .group_by(Location.neighborhood)
+        .order_by(Location.neighborhood)
+    )
+    names = (
+        db.session.query(Organization.name, organization_count)
+        .filter(*listed)
+        .group_by(Organization.name)
+        .order_by(Organization.name)
+    )
+    # An hours option matches organizations with hours covering it, as the
+    # hours filter of search_organizations does, not only the same hours
+    hours_options = (
+        db.session.query(Hours.opening_time, Hours.closing_time)
+        .join(Hours.organizations)
+        .filter(*listed)
+        .distinct()
+        .subquery()
+    )
+    covering = aliased(Hours)
+    hours = (
+        db.session.query(
+            hours_options.c.opening_time,
+            hours_options.c.closing_time,
+            organization_count,
+        )
+        .select_from(hours_options)
+        .join(
+            covering,
+            and_(
+                covering.opening_time <= hours_options.c.opening_time,
+                covering.closing_time >= hours_options.c.closing_time,
+            ),
+        )
+        .join(covering.organizations)
+        .filter(*listed)
+        .group_by(hours_options.c.opening_time, hours_options.c.closing_time)
+        .order_by(hours_options.c.opening_time, hours_options.c.closing_time)
+    )
+
+    return {
+        "services": [
+            {"value": value, "label": value, "count": count}
+            for value, count in services
+        ],
+        "neighborhoods": [
+            {"value": value, "label": value, "count": count}
+            for value, count in neighborhoods
+        ],
+        "organizations": [
+            {"value": value, "label": value, "count": count}
+            for value, count in names
+        ],
+        "hours": [
+            {
+                "value": (
+                    f"{opening.strftime('%H:%M')}-{closing.strftime('%H:%M')}"
+                ),
+                "label": (
+                    f"{format_time_for_locale(opening, language)} - "
+                    f"{format_time_for_locale(closing, language)}"
+                ),
+                "count": count,
+            }
+            for opening, closing, count in hours
+        ],
+    }
+
+
 def retrieve_hours(all_hours):
     """Retrieves the operating hours for an organization.
 
     This function organizes the operating hours of an organization into a
-    dictionary with days of the week as keys.
+    dictionary with days of the week as keys. The rows are sorted once by day
+    and opening time, then appended to their day in order.
 
     Args:
         all_hours (list): A list of hours objects containing all hours.
 
     Returns:
-        dict: A dictionary containing the operating hours for each
-        day of the week.
+        dict: The HoursSlots of each day of the week, as tuples ordered by
+        opening time.
     """
-    # Retrieve all opperating hours
-    organization_hours = {
-        "monday": [],
-        "tuesday": [],
-        "wednesday": [],
-        "thursday": [],
-        "friday": [],
-        "saturday": [],
-        "sunday": [],
-    }
-
-    weekdays = {
-        1: "monday",
-        2: "tuesday",
-        3: "wednesday",
-        4: "thursday",
-        5: "friday",
-        6: "saturday",
-        7: "sunday",
-    }
+    organization_hours = {day: [] for day in WEEKDAYS}
 
-    for current_hour in all_hours:
-        extract_hour_info(current_hour, organization_hours, weekdays)
+    for current_hour in sorted(all_hours, key=hours_order):
+        organization_hours[WEEKDAYS[current_hour.day_of_week - 1]].append(
+            HoursSlot(current_hour.opening_time, current_hour.closing_time)
+        )
 
-    return organization_hours
+    return {day: tuple(slots) for day, slots in organization_hours.items()}
 
 
-def extract_hour_info(current_hour, organization_hours, weekdays):
-    """Extracts and organizes hour information for a specific day.
+def hours_order(current_hour):
+    """Sort key ordering hours rows by day, then opening time.
 
     Args:
-        current_hour (object): An object containing the hour information
-            for a specific day.
-        organization_hours (dict): A dictionary to store the organized
-             hour information.
-        weekdays (dict): A dictionary mapping day numbers to day names.
-    """
-    day = current_hour.day_of_week
-    day_str = weekdays[day]
-    associated_hours = {
-        "open": current_hour.opening_time,
-        "close": current_hour.closing_time,
-    }
+        current_hour (Hours): An hours row.
 
-    # Ensure the ordering of hours are correct
-    if not organization_hours[day_str]:
-        organization_hours[day_str].append(associated_hours)
-    else:
-        # Check existing entries and insert based on opening time
-        inserted = False
-        for i, existing_hours in enumerate(organization_hours[day_str]):
-            if current_hour.opening_time < existing_hours["open"]:
-                organization_hours[day_str].insert(i, associated_hours)
-                inserted = True
-                break
-        if not inserted:
-            organization_hours[day_str].append(associated_hours)
+    Returns:
+        tuple: The day of the week and the opening time.
+    """
+    return current_hour.day_of_week, current_hour.opening_time
 
 
 def retrieve_languages(org_reference):
@@ -404,13 +1045,11 @@ def retrieve_languages(org_reference):
         org_reference (object): An object reference to the organization.
 
     Returns:
-        list: A list of languages spoken at the organization.
+        tuple: The languages spoken at the organization.
     """
-    all_languages = org_reference.languages
-    language_list = []
-    for curr_language in all_languages:
-        language_list.append(curr_language.language)
-    return language_list
+    return tuple(
+        curr_language.language for curr_language in org_reference.languages
+    )
 
 
 def retrieve_services(all_services):
@@ -421,22 +1060,19 @@ def retrieve_services(all_services):
         organization.
 
     Returns:
-        list: A list of dictionaries containing detailed information about
-        each service.
-    """
-    complete_service_info = []
-    for curr_service in all_services:
-        service_info = {
-            "category": curr_service.category,
-            "service": curr_service.service,
-            "access": curr_service.access,
-            "service_note": curr_service.service_note,
-            "dates": retrieve_dates(curr_service.service_dates),
-            "locations": retrieve_locations(curr_service.locations),
-        }
-        complete_service_info.append(service_info)
-
-    return complete_service_info
+        tuple: A ServiceView of each service.
+    """
+    return tuple(
+        ServiceView(
+            category=curr_service.category,
+            service=curr_service.service,
+            access=curr_service.access,
+            service_note=curr_service.service_note,
+            dates=retrieve_dates(curr_service.service_dates),
+            locations=retrieve_locations(curr_service.locations),
+        )
+        for curr_service in all_services
+    )
 
 
 def retrieve_dates(all_dates):
@@ -446,15 +1082,9 @@ def retrieve_dates(all_dates):
         all_dates (list): A list of date objects associated with a service.
 
     Returns:
-        list: A list of dictionaries containing date information.
+        tuple: A DateView of each date.
     """
-    complete_date_info = []
-
-    # Retrieve all dates for service
-    for current_date in all_dates:
-        complete_date_info.append(extract_date_info(current_date))
-
-    return complete_date_info
+    return tuple(extract_date_info(current_date) for current_date in all_dates)
 
 
 def extract_date_info(current_date):
@@ -464,15 +1094,14 @@ def extract_date_info(current_date):
         current_date (object): An object containing date information.
 
     Returns:
-        dict: A dictionary containing detailed information about the date.
+        DateView: The date, its times and whether it repeats.
     """
-    single_date_info = {
-        "date": current_date.date,
-        "start_time": current_date.start_time,
-        "end_time": current_date.end_time,
-        "repeat": current_date.repeat,
-    }
-    return single_date_info
+    return DateView(
+        date=current_date.date,
+        start_time=current_date.start_time,
+        end_time=current_date.end_time,
+        repeat=current_date.repeat,
+    )
 
 
 def retrieve_locations(all_locations):
@@ -483,15 +1112,12 @@ def retrieve_locations(all_locations):
         service.
 
     Returns:
-        list: A list of dictionaries containing location information.
+        tuple: A LocationView of each location.
     """
-    complete_location_info = []
-
-    # Retrieve all dates for service
-    for current_location in all_locations:
-        complete_location_info.append(extract_location_info(current_location))
-
-    return complete_location_info
+    return tuple(
+        extract_location_info(current_location)
+        for current_location in all_locations
+    )
 
 
 def extract_location_info(current_location):
@@ -501,14 +1127,13 @@ def extract_location_info(current_location):
         current_location (object): An object containing location information.
 
     Returns:
-        dict: A dictionary containing detailed information about the location.
-    """
-    single_location_info = {
-        "street address": current_location.street_address,
-        "zip_code": current_location.zip_code,
-        "city": current_location.city,
-        "state": current_location.state,
-        "primary_location": current_location.primary_location,
-        "neighborhood": current_location.neighborhood,
-    }
-    return single_location_info
+        LocationView: The location's address and neighborhood.
+    """
+    return LocationView(
+        street_address=current_location.street_address,
+        zip_code=current_location.zip_code,
+        city=current_location.city,
+        state=current_location.state,
+        primary_location=current_location.primary_location,
+        neighborhood=current_location.neighborhood,
+    )
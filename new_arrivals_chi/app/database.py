@@ -1,8 +1,22 @@
 """This script contains the corresponding database models for the app."""
 
-from sqlalchemy import Enum, Table, ForeignKey, Column, Integer
+from datetime import time
+from sqlalchemy import (
+    DDL,
+    Enum,
+    Table,
+    ForeignKey,
+    Column,
+    Integer,
+    event,
+    func,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects.postgresql import to_tsvector
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from new_arrivals_chi.app.utils import zip_coordinates
 
 db = SQLAlchemy()
 
@@ -104,6 +118,8 @@ class Organization(db.Model):
     """Class for the organizations table in the database."""
 
     __tablename__ = "organizations"
+    # Supports keyset pagination of the directory ordered by (name, id)
+    __table_args__ = (db.Index("ix_organizations_name_id", "name", "id"),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(260), nullable=False)
     location_id = db.Column(
@@ -170,13 +186,25 @@ class Language(db.Model):
 
 
 class Hours(db.Model):
-    """Class for the hours table in the database."""
+    """Class for the hours table in the database.
+
+    start_minute and end_minute hold the opening and closing times as minutes
+    since Monday 00:00, so "open at" queries are integer range lookups. They
+    are kept in step with the day and times whenever a row is written.
+    """
 
     __tablename__ = "hours"
+    __table_args__ = (
+        db.Index(
+            "ix_hours_start_minute_end_minute", "start_minute", "end_minute"
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     day_of_week = db.Column(db.Integer, nullable=False)
     opening_time = db.Column(db.Time, nullable=False)
     closing_time = db.Column(db.Time, nullable=False)
+    start_minute = db.Column(db.Integer, nullable=False)
+    end_minute = db.Column(db.Integer, nullable=False)
     created_at = db.Column(
         db.DateTime(timezone=True), nullable=False, server_default=db.func.now()
     )
@@ -188,6 +216,36 @@ class Hours(db.Model):
     )
 
 
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_week(day_of_week, time_of_day):
+    """Converts a day of the week and time of day to minutes since Monday.
+
+    Parameters:
+        day_of_week (int): The day of the week (Monday = 1, ..., Sunday = 7).
+        time_of_day (datetime.time or str): The time, or "HH:MM".
+
+    Returns:
+        int: Minutes since Monday 00:00.
+    """
+    if isinstance(time_of_day, str):
+        time_of_day = time.fromisoformat(time_of_day)
+    return (
+        (int(day_of_week) - 1) * MINUTES_PER_DAY
+        + time_of_day.hour * 60
+        + time_of_day.minute
+    )
+
+
+@event.listens_for(Hours, "before_insert")
+@event.listens_for(Hours, "before_update")
+def set_hours_minutes(mapper, connection, hours):
+    """Fills the minute-of-week range of an hours row before it is written."""
+    hours.start_minute = minute_of_week(hours.day_of_week, hours.opening_time)
+    hours.end_minute = minute_of_week(hours.day_of_week, hours.closing_time)
+
+
 class Service(db.Model):
     """Class for the services table in the database."""
 
@@ -219,7 +277,11 @@ class Service(db.Model):
 
 
 class ServiceDate(db.Model):
-    """Class for the service_dates table in the database."""
+    """Class for the service_dates table in the database.
+
+    updated_at moves forward whenever a date is edited in place, so
+    fingerprints of the calendar data notice the change.
+    """
 
     __tablename__ = "service_dates"
     id = db.Column(db.Integer, primary_key=True)
@@ -239,6 +301,12 @@ class ServiceDate(db.Model):
     created_at = db.Column(
         db.DateTime(timezone=True), nullable=False, server_default=db.func.now()
     )
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        server_default=db.func.now(),
+        onupdate=db.func.now(),
+    )
     deleted_at = db.Column(db.DateTime(timezone=True), nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     deleted_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -256,10 +324,12 @@ class Location(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     street_address = db.Column(db.String(255), nullable=False)
     zip_code = db.Column(db.String(10), nullable=False)
-    neighborhood = db.Column(db.String(100), nullable=False)
+    neighborhood = db.Column(db.String(100), nullable=False, index=True)
     city = db.Column(db.String(100), nullable=False)
     state = db.Column(db.String(50), nullable=False)
     primary_location = db.Column(db.Boolean, nullable=False)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
     created_at = db.Column(
         db.DateTime(timezone=True), nullable=False, server_default=db.func.now()
     )
@@ -270,3 +340,144 @@ class Location(db.Model):
     services = db.relationship(
         "Service", secondary=location_services, back_populates="locations"
     )
+
+
+@event.listens_for(Location, "before_insert")
+@event.listens_for(Location, "before_update")
+def set_location_coordinates(mapper, connection, location):
+    """Places a location at its ZIP code's centroid before it is written.
+
+    Coordinates are looked up in the offline gazetteer when the location has
+    none or its ZIP code changed, unless they were set in the same flush.
+    """
+    state = inspect(location)
+    if (
+        state.attrs.latitude.history.has_changes()
+        or state.attrs.longitude.history.has_changes()
+    ):
+        return
+
+    if location.latitude is None or state.attrs.zip_code.history.has_changes():
+        location.latitude, location.longitude = zip_coordinates(
+            location.zip_code
+        ) or (None, None)
+
+
+class OrganizationDirectory(db.Model):
+    """Class for the organization_directory read model in the database.
+
+    Holds one denormalized row per organization listed in the public
+    directory, so public pages read a single indexed table instead of the
+    organization's location, language, hours and service tables. Rows are
+    rebuilt by data_handler whenever it writes to an organization.
+    """
+
+    __tablename__ = "organization_directory"
+    __table_args__ = (
+        db.Index(
+            "ix_organization_directory_name_id", "name", "organization_id"
+        ),
+    )
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organizations.id"), primary_key=True
+    )
+    name = db.Column(db.String(260), nullable=False)
+    phone = db.Column(db.String(25), nullable=False)
+    street_address = db.Column(db.String(255), nullable=False)
+    zip_code = db.Column(db.String(10), nullable=False)
+    neighborhood = db.Column(db.String(100), nullable=False, index=True)
+    city = db.Column(db.String(100), nullable=False)
+    state = db.Column(db.String(50), nullable=False)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    service_names = db.Column(db.Text, nullable=False)
+    service_categories = db.Column(db.Text, nullable=False)
+    service_notes = db.Column(db.Text, nullable=False, server_default="")
+    languages = db.Column(db.JSON, nullable=False)
+    services = db.Column(db.JSON, nullable=False)
+    hours = db.Column(db.JSON, nullable=False)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        nullable=False,
+        server_default=db.func.now(),
+        onupdate=db.func.now(),
+    )
+
+
+# Full-text search over the directory. Postgres indexes a weighted tsvector
+# of the read model with GIN; the "simple" configuration does not stem, since
+# organizations describe their services in several languages.
+SEARCH_CONFIG = text("'simple'::regconfig")
+
+organization_search_document = (
+    func.setweight(to_tsvector(SEARCH_CONFIG, OrganizationDirectory.name), "A")
+    .op("||")(
+        func.setweight(
+            to_tsvector(
+                SEARCH_CONFIG,
+                OrganizationDirectory.service_names
+                + " "
+                + OrganizationDirectory.service_categories,
+            ),
+            "B",
+        )
+    )
+    .op("||")(
+        func.setweight(
+            to_tsvector(SEARCH_CONFIG, OrganizationDirectory.service_notes),
+            "C",
+        )
+    )
+)
+
+db.Index(
+    "ix_organization_directory_search",
+    organization_search_document,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# SQLite indexes the read model with an external content FTS5 table, kept in
+# step with organization_directory by triggers.
+ORGANIZATION_SEARCH_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS organization_search USING fts5("
+    "name, service_names, service_categories, service_notes, "
+    "content='organization_directory', content_rowid='organization_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_insert "
+    "AFTER INSERT ON organization_directory BEGIN "
+    "INSERT INTO organization_search(rowid, name, service_names, "
+    "service_categories, service_notes) VALUES (new.organization_id, "
+    "new.name, new.service_names, new.service_categories, "
+    "new.service_notes); END",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_delete "
+    "AFTER DELETE ON organization_directory BEGIN "
+    "INSERT INTO organization_search(organization_search, rowid, name, "
+    "service_names, service_categories, service_notes) VALUES ('delete', "
+    "old.organization_id, old.name, old.service_names, "
+    "old.service_categories, old.service_notes); END",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_update "
+    "AFTER UPDATE ON organization_directory BEGIN "
+    "INSERT INTO organization_search(organization_search, rowid, name, "
+    "service_names, service_categories, service_notes) VALUES ('delete', "
+    "old.organization_id, old.name, old.service_names, "
+    "old.service_categories, old.service_notes); "
+    "INSERT INTO organization_search(rowid, name, service_names, "
+    "service_categories, service_notes) VALUES (new.organization_id, "
+    "new.name, new.service_names, new.service_categories, "
+    "new.service_notes); END",
+)
+
+for statement in ORGANIZATION_SEARCH_SQLITE_DDL:
+    event.listen(
+        OrganizationDirectory.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+
+event.listen(
+    OrganizationDirectory.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS organization_search").execute_if(
+        dialect="sqlite"
+    ),
+)
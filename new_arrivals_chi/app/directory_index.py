@@ -0,0 +1,141 @@
+"""Project: new_arrivals_chi.
+
+File name: directory_index.py
+Associated Files:
+   facets.py, schedule.py, geo.py, data_handler.py.
+
+This file contains the lazily built, process-wide indexes over the
+organization_directory read model (facets, opening hours and locations).
+
+Each server process builds its own copy of an index, so it is rebuilt when it
+is older than ORGANIZATION_CACHE_TTL or when the read model's fingerprint
+(its row count and latest updated_at) changed, which is how a process sees
+organizations written, suspended or deleted by another one. The fingerprint
+is read at most once every DIRECTORY_CHECK_INTERVAL seconds, so most lookups
+do not touch the database and another process's writes show up within that
+interval. Writes handled by this process drop the index at once.
+
+Classes:
+    * DirectoryIndex - An index over the read model, rebuilt when stale.
+
+Methods:
+    * directory_fingerprint - Returns the row count and latest update of the
+      read model.
+"""
+
+import threading
+import time
+from sqlalchemy import func
+from new_arrivals_chi.app.database import db, OrganizationDirectory
+from new_arrivals_chi.app.data_handler import register_write_hook
+from new_arrivals_chi.app.constants import (
+    DIRECTORY_CHECK_INTERVAL,
+    ORGANIZATION_CACHE_TTL,
+)
+
+
+class DirectoryIndex:
+    """An index over the read model, built on first use and rebuilt when stale.
+
+    The index itself is any object with an update(organization_id, values)
+    method, filled with the values extracted from every read model row.
+    """
+
+    def __init__(
+        self,
+        index_class,
+        entry_values,
+        ttl=ORGANIZATION_CACHE_TTL,
+        check_interval=DIRECTORY_CHECK_INTERVAL,
+        clock=time.monotonic,
+    ):
+        """Creates an index that is built on first use.
+
+        Parameters:
+            index_class (type): Creates an empty index.
+            entry_values (callable): Extracts the values indexed for a read
+                model row.
+            ttl (float): Seconds after which the index is rebuilt.
+            check_interval (float): Seconds during which the index is used
+                without reading the read model's fingerprint again.
+            clock (callable): Returns the current time in seconds.
+        """
+        self._index_class = index_class
+        self._entry_values = entry_values
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = None
+        self._built_at = None
+        self._checked_at = None
+        self.fingerprint = None
+        register_write_hook(self.discard)
+
+    def get(self):
+        """Returns the index, rebuilding it if it is stale.
+
+        The read model's fingerprint is only read when it was last checked
+        more than check_interval seconds ago.
+
+        Returns:
+            object: The index over the read model.
+        """
+        now = self._clock()
+        index = self._index
+        if (
+            index is not None
+            and now - self._built_at < self.ttl
+            and now - self._checked_at < self.check_interval
+        ):
+            return index
+
+        fingerprint = directory_fingerprint()
+        with self._lock:
+            if not self._fresh(self._index, fingerprint, now):
+                index = self._index_class()
+                for entry in OrganizationDirectory.query.yield_per(500):
+                    index.update(
+                        entry.organization_id, self._entry_values(entry)
+                    )
+                self._index = index
+                self._built_at = now
+                self.fingerprint = fingerprint
+            self._checked_at = now
+            return self._index
+
+    def _fresh(self, index, fingerprint, now):
+        return (
+            index is not None
+            and now - self._built_at < self.ttl
+            and fingerprint == self.fingerprint
+        )
+
+    def discard(self, organization_id):
+        """Drops the index, so the next get reads the fresh read model.
+
+        Registered as a data_handler write hook.
+
+        Parameters:
+            organization_id (int): The organization that was written, or None
+                when the whole read model was rebuilt.
+        """
+        with self._lock:
+            self._index = None
+
+
+def directory_fingerprint():
+    """Returns the row count and latest update of the read model.
+
+    Every write to the read model, by any process, adds or removes a row or
+    moves the latest updated_at forward.
+
+    Returns:
+        tuple: (row count, latest updated_at).
+    """
+    return tuple(
+        db.session.query(
+            func.count(OrganizationDirectory.organization_id),
+            func.max(OrganizationDirectory.updated_at),
+        ).one()
+    )
@@ -0,0 +1,224 @@
+"""Project: new_arrivals_chi.
+
+File name: facets.py
+Associated Files:
+   directory_index.py, api_routes.py.
+
+This file contains the in-memory facet index over the public directory. Every
+facet value (a service, category, language, neighborhood, access type or
+open day) maps to a bitset with one bit per organization, so combining
+filters is a handful of integer AND/OR operations and counting matches is a
+popcount, whatever the size of the directory. Lookups only read the
+database to check, at most once every DIRECTORY_CHECK_INTERVAL seconds, that
+the index is current (see directory_index.py).
+
+Bitsets are Python integers, which support arbitrary-width bitwise operations
+and bit counting in C without adding a dependency.
+
+Classes:
+    * FacetIndex - Bitset index answering filter combinations and counts.
+
+Methods:
+    * get_facet_index - Returns the process-wide index, rebuilding it when
+      stale.
+    * directory_facet_values - Extracts the facet values of a read model row.
+"""
+
+import threading
+from new_arrivals_chi.app.directory_index import DirectoryIndex
+
+FACET_FIELDS = (
+    "service",
+    "category",
+    "language",
+    "neighborhood",
+    "access",
+    "day",
+)
+
+
+class FacetIndex:
+    """Bitset index of facet values over the organizations in the directory.
+
+    Each organization occupies one bit position. Positions freed by removed
+    organizations are reused, so the bitsets stay as narrow as the directory.
+    """
+
+    def __init__(self):
+        """Creates an empty index."""
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._organization_ids = []
+        self._free_positions = []
+        self._values = {}
+        self._bitmaps = {field: {} for field in FACET_FIELDS}
+        self._all = 0
+
+    def __len__(self):
+        """Returns the number of organizations in the index."""
+        return len(self._positions)
+
+    def update(self, organization_id, facet_values):
+        """Adds an organization to the index or replaces its facet values.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+            facet_values (dict): Facet field names mapped to the set of
+                values the organization has for that field.
+        """
+        with self._lock:
+            self._remove(organization_id)
+
+            if self._free_positions:
+                position = self._free_positions.pop()
+                self._organization_ids[position] = organization_id
+            else:
+                position = len(self._organization_ids)
+                self._organization_ids.append(organization_id)
+
+            bit = 1 << position
+            self._positions[organization_id] = position
+            self._values[organization_id] = facet_values
+            self._all |= bit
+            for field, values in facet_values.items():
+                bitmaps = self._bitmaps[field]
+                for value in values:
+                    bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def remove(self, organization_id):
+        """Removes an organization from the index if present.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+        """
+        with self._lock:
+            self._remove(organization_id)
+
+    def _remove(self, organization_id):
+        position = self._positions.pop(organization_id, None)
+        if position is None:
+            return
+
+        bit = 1 << position
+        self._all &= ~bit
+        for field, values in self._values.pop(organization_id).items():
+            bitmaps = self._bitmaps[field]
+            for value in values:
+                bitmaps[value] &= ~bit
+                if not bitmaps[value]:
+                    del bitmaps[value]
+
+        self._organization_ids[position] = None
+        self._free_positions.append(position)
+
+    def match(self, filters, match_all=False):
+        """Returns the bitset of organizations matching the filters.
+
+        Values of one field are combined with OR (or AND when match_all is
+        set); different fields are always combined with AND.
+
+        Parameters:
+            filters (dict): Facet field names mapped to lists of values.
+            match_all (bool): Require every value of a field, not just one.
+
+        Returns:
+            int: Bitset of the matching organizations.
+        """
+        with self._lock:
+            return self._match(filters, match_all)
+
+    def _match(self, filters, match_all, skip_field=None):
+        result = self._all
+        for field, values in filters.items():
+            if field == skip_field or not values:
+                continue
+
+            bitmaps = self._bitmaps[field]
+            if match_all:
+                for value in values:
+                    result &= bitmaps.get(value, 0)
+            else:
+                combined = 0
+                for value in values:
+                    combined |= bitmaps.get(value, 0)
+                result &= combined
+        return result
+
+    def organization_ids(self, bitmap):
+        """Returns the organization IDs whose bits are set in bitmap.
+
+        Parameters:
+            bitmap (int): A bitset returned by match.
+
+        Returns:
+            list: Sorted organization IDs.
+        """
+        organization_ids = []
+        with self._lock:
+            while bitmap:
+                lowest = bitmap & -bitmap
+                organization_ids.append(
+                    self._organization_ids[lowest.bit_length() - 1]
+                )
+                bitmap ^= lowest
+        return sorted(organization_ids)
+
+    def counts(self, filters=None, match_all=False):
+        """Counts the organizations behind every facet value.
+
+        A field's counts honor the filters on every other field but not its
+        own, so a dropdown shows how many results each of its options would
+        give given the rest of the selection.
+
+        Parameters:
+            filters (dict, optional): Facet field names mapped to lists of
+                values, as for match.
+            match_all (bool): Require every value of a field, not just one.
+
+        Returns:
+            dict: Facet field names mapped to dictionaries of value to count.
+                Values with no matching organization are left out.
+        """
+        filters = filters or {}
+        facet_counts = {}
+        with self._lock:
+            for field in FACET_FIELDS:
+                scope = self._match(filters, match_all, skip_field=field)
+                field_counts = {}
+                for value, bitmap in self._bitmaps[field].items():
+                    count = (bitmap & scope).bit_count()
+                    if count:
+                        field_counts[value] = count
+                facet_counts[field] = dict(sorted(field_counts.items()))
+        return facet_counts
+
+
+def get_facet_index():
+    """Returns the process-wide facet index, rebuilding it when stale.
+
+    Returns:
+        FacetIndex: The index over the organization_directory read model.
+    """
+    return facet_index.get()
+
+
+def directory_facet_values(entry):
+    """Extracts the facet values of an organization_directory row.
+
+    Parameters:
+        entry (OrganizationDirectory): The read model row.
+
+    Returns:
+        dict: Facet field names mapped to sets of values.
+    """
+    return {
+        "service": {service["service"] for service in entry.services},
+        "category": {service["category"] for service in entry.services},
+        "language": set(entry.languages),
+        "neighborhood": {entry.neighborhood},
+        "access": {service["access"] for service in entry.services},
+        "day": {day for day, segments in entry.hours.items() if segments},
+    }
+
+
+facet_index = DirectoryIndex(FacetIndex, directory_facet_values)
@@ -0,0 +1,268 @@
+"""Project: new_arrivals_chi.
+
+File name: geo.py
+Associated Files:
+   directory_index.py, data_handler.py, main.py.
+
+This file contains the in-memory spatial index used to answer "what is
+closest to me". Lookups only read the database to check, at most once every
+DIRECTORY_CHECK_INTERVAL seconds, that the index is current (see
+directory_index.py). Each organization's primary
+location is placed in a grid of CELL_DEGREES square cells; a lookup scans
+rings of cells outwards from the requested point and stops as soon as no
+unscanned cell can hold a closer organization, so only the neighbourhood of
+the point is examined.
+
+Coordinates come from the offline ZIP code gazetteer (see
+utils.zip_coordinates), so distances are between ZIP code centroids.
+
+Classes:
+    * NearbyIndex - Grid index of organization locations.
+
+Methods:
+    * get_nearby_index - Returns the process-wide index, rebuilding it when
+      stale.
+    * directory_point - Extracts the coordinates of a read model row.
+    * distance_miles - Returns the great-circle distance between two points.
+    * search_nearby - Returns the closest organizations matching the health
+      search filters.
+"""
+
+import heapq
+import math
+import threading
+from new_arrivals_chi.app.data_handler import search_organizations
+from new_arrivals_chi.app.directory_index import DirectoryIndex
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * math.pi / 180
+
+# About 1.4 miles north to south; a Chicago neighborhood spans a few cells
+CELL_DEGREES = 0.02
+
+
+class NearbyIndex:
+    """Grid index of the organizations' primary locations."""
+
+    def __init__(self):
+        """Creates an empty index."""
+        self._lock = threading.Lock()
+        self._points = {}
+        self._cells = {}
+
+    def __len__(self):
+        """Returns the number of organizations in the index."""
+        return len(self._points)
+
+    def update(self, organization_id, point):
+        """Adds an organization or moves it.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+            point (tuple): (latitude, longitude) of the organization, or None
+                if it has no coordinates.
+        """
+        with self._lock:
+            self._remove(organization_id)
+            if point is None:
+                return
+
+            cell = self._cell(*point)
+            self._points[organization_id] = (point, cell)
+            self._cells.setdefault(cell, set()).add(organization_id)
+
+    def remove(self, organization_id):
+        """Removes an organization from the index if present.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+        """
+        with self._lock:
+            self._remove(organization_id)
+
+    def _remove(self, organization_id):
+        entry = self._points.pop(organization_id, None)
+        if entry is None:
+            return
+
+        _, cell = entry
+        self._cells[cell].discard(organization_id)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    @staticmethod
+    def _cell(latitude, longitude):
+        return (
+            math.floor(latitude / CELL_DEGREES),
+            math.floor(longitude / CELL_DEGREES),
+        )
+
+    @staticmethod
+    def _ring(origin, ring):
+        row, column = origin
+        if ring == 0:
+            return [origin]
+
+        cells = []
+        for offset in range(-ring, ring + 1):
+            cells.append((row - ring, column + offset))
+            cells.append((row + ring, column + offset))
+        for offset in range(-ring + 1, ring):
+            cells.append((row + offset, column - ring))
+            cells.append((row + offset, column + ring))
+        return cells
+
+    def nearest(self, latitude, longitude, radius=None, limit=None):
+        """Returns the organizations closest to a point.
+
+        Parameters:
+            latitude (float): Latitude of the point, in degrees.
+            longitude (float): Longitude of the point, in degrees.
+            radius (float, optional): Only organizations within this many
+                miles.
+            limit (int, optional): Maximum number of organizations returned.
+
+        Returns:
+            list: (organization ID, distance in miles) tuples, closest first.
+        """
+        origin = self._cell(latitude, longitude)
+        # Longitude cells narrow away from the equator; bound distances with
+        # the narrowest width the rings scanned so far can reach
+        narrowest = math.cos(math.radians(min(abs(latitude) + 1, 89)))
+        found = []
+
+        with self._lock:
+            ring = 0
+            remaining = len(self._points)
+            while remaining:
+                if 8 * ring > len(self._cells):
+                    # Far from every organization: checking the remaining
+                    # occupied cells is cheaper than walking empty rings
+                    cells = [
+                        cell
+                        for cell in self._cells
+                        if max(
+                            abs(cell[0] - origin[0]), abs(cell[1] - origin[1])
+                        )
+                        >= ring
+                    ]
+                else:
+                    cells = self._ring(origin, ring)
+
+                for cell in cells:
+                    for organization_id in self._cells.get(cell, ()):
+                        (point_latitude, point_longitude), _ = self._points[
+                            organization_id
+                        ]
+                        found.append(
+                            (
+                                distance_miles(
+                                    latitude,
+                                    longitude,
+                                    point_latitude,
+                                    point_longitude,
+                                ),
+                                organization_id,
+                            )
+                        )
+                        remaining -= 1
+
+                # Anything not scanned yet is more than ring cells away
+                unscanned = ring * CELL_DEGREES * MILES_PER_DEGREE * narrowest
+                if radius is not None and unscanned > radius:
+                    break
+                if (
+                    limit is not None
+                    and len(found) >= limit
+                    and heapq.nsmallest(limit, found)[-1][0] <= unscanned
+                ):
+                    break
+                ring += 1
+
+        found = sorted(found)
+        if radius is not None:
+            found = [entry for entry in found if entry[0] <= radius]
+        if limit is not None:
+            found = found[:limit]
+        return [
+            (organization_id, distance) for distance, organization_id in found
+        ]
+
+
+def get_nearby_index():
+    """Returns the process-wide spatial index, rebuilding it when stale.
+
+    Returns:
+        NearbyIndex: The index over the organization_directory read model.
+    """
+    return nearby_index.get()
+
+
+def directory_point(entry):
+    """Extracts the coordinates of an organization_directory row.
+
+    Parameters:
+        entry (OrganizationDirectory): The read model row.
+
+    Returns:
+        tuple: (latitude, longitude) of the primary location, or None if its
+        ZIP code is not in the gazetteer.
+    """
+    if entry.latitude is None or entry.longitude is None:
+        return None
+    return entry.latitude, entry.longitude
+
+
+def distance_miles(latitude, longitude, other_latitude, other_longitude):
+    """Returns the great-circle distance between two points.
+
+    Parameters:
+        latitude (float): Latitude of the first point, in degrees.
+        longitude (float): Longitude of the first point, in degrees.
+        other_latitude (float): Latitude of the second point, in degrees.
+        other_longitude (float): Longitude of the second point, in degrees.
+
+    Returns:
+        float: The haversine distance in miles.
+    """
+    phi, other_phi = math.radians(latitude), math.radians(other_latitude)
+    half_chord = (
+        math.sin((other_phi - phi) / 2) ** 2
+        + math.cos(phi)
+        * math.cos(other_phi)
+        * math.sin(math.radians(other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(half_chord)))
+
+
+def search_nearby(latitude, longitude, radius, limit, **filters):
+    """Returns the closest organizations matching the health search filters.
+
+    Candidates within the radius come from the spatial index rather than a
+    scan of the directory; the remaining filters are applied in SQL over
+    those candidates only.
+
+    Parameters:
+        latitude (float): Latitude of the point, in degrees.
+        longitude (float): Longitude of the point, in degrees.
+        radius (float): Only organizations within this many miles.
+        limit (int): Maximum number of organizations returned.
+        **filters: Keyword filters of data_handler.search_organizations.
+
+    Returns:
+        list: (organization ID, distance in miles) tuples, closest first.
+    """
+    nearby = get_nearby_index().nearest(latitude, longitude, radius=radius)
+    if not nearby:
+        return []
+
+    matching, _ = search_organizations(
+        organization_ids=[organization_id for organization_id, _ in nearby],
+        page_size=len(nearby),
+        **filters,
+    )
+    matching = set(matching)
+    return [entry for entry in nearby if entry[0] in matching][:limit]
+
+
+nearby_index = DirectoryIndex(NearbyIndex, directory_point)
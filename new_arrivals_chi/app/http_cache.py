@@ -0,0 +1,195 @@
+"""Project: new_arrivals_chi.
+
+File name: http_cache.py
+Associated Files:
+   main.py, cache.py.
+
+This file contains the HTTP caching of public pages. Pages carry an ETag and
+a Last-Modified date, and "Cache-Control: no-cache" so browsers revalidate
+them instead of guessing how long they stay fresh. A revalidation whose
+validators still match is answered 304 Not Modified without rendering the
+page: Jinja is not touched, and pages showing directory data cost one small
+query of the read model.
+
+Validators combine the release of the app (when its code, templates or
+translations last changed), the page's URL, and for pages showing directory
+data, the updated_at of the organization_directory rows they show. Every
+worker reads the same rows, so every worker, before and after a restart,
+gives a page the same validators. The process-local versions of cache.py only
+key in-process caches and are never part of a validator.
+
+Pages rendered for a signed-in user, or with flashed messages waiting, are
+personal and are not given validators.
+
+Methods:
+    * conditional_page - Decorator answering revalidations of a public page.
+    * not_modified - Returns a 304 Not Modified response for an ETag.
+    * page_validators - Returns the ETag and Last-Modified date of a page.
+    * is_personalized - Checks whether the response depends on the user.
+    * epoch_seconds - Converts a database timestamp to seconds since the epoch.
+    * release_modified - Returns when the app's files last changed.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+from http import HTTPStatus
+from flask import current_app, make_response, request, session
+
+APP_DIRECTORY = os.path.dirname(__file__)
+
+
+def conditional_page(state=None):
+    """Decorator answering revalidations of a public page with 304.
+
+    Parameters:
+        state (callable, optional): Called with the view's arguments, returns
+            the (version, modified) of the data the page shows, as read from
+            the database; modified is in seconds since the epoch. It returns
+            None when the data has no version, and the page is then served
+            without validators. Pages that only depend on their templates and
+            the locale take no state.
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if is_personalized():
+                return view(*args, **kwargs)
+
+            page_state = None
+            if state is not None:
+                page_state = state(*args, **kwargs)
+                if page_state is None:
+                    return view(*args, **kwargs)
+
+            etag, last_modified = page_validators(page_state)
+
+            if request.if_none_match:
+                matched = request.if_none_match.contains_weak(etag)
+            else:
+                matched = (
+                    request.if_modified_since is not None
+                    and request.if_modified_since >= last_modified
+                )
+
+            if matched:
+                response = not_modified(etag)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != HTTPStatus.OK:
+                    return response
+                response.set_etag(etag, weak=True)
+
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+
+        # Marks the view as a public page, e.g. for the static export
+        wrapper.page_state = state
+        return wrapper
+
+    return decorator
+
+
+def not_modified(etag):
+    """Returns a 304 Not Modified response for a weak entity tag.
+
+    The response repeats the validator, as RFC 9110 requires of a 304.
+
+    Parameters:
+        etag (str): The entity tag the request matched.
+
+    Returns:
+        Response: The empty 304 response.
+    """
+    response = current_app.response_class(status=HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def page_validators(state=None):
+    """Returns the ETag and Last-Modified date of the requested page.
+
+    Parameters:
+        state (tuple, optional): (version, modified) of the data the page
+            shows, or None if it only depends on its templates.
+
+    Returns:
+        tuple: The entity tag and the last modification as an aware datetime,
+        truncated to whole seconds.
+    """
+    parts = [release_modified(), request.full_path]
+    modified = release_modified()
+
+    if state is not None:
+        version, data_modified = state
+        parts.append(version)
+        modified = max(modified, data_modified)
+
+    etag = hashlib.sha1(
+        "|".join(str(part) for part in parts).encode("utf-8")
+    ).hexdigest()
+    return etag, datetime.fromtimestamp(int(modified), timezone.utc)
+
+
+def is_personalized():
+    """Checks whether the response to the request depends on the user.
+
+    Returns:
+        bool: True when a user is signed in or may be signed in from their
+        remember cookie, or when flashed messages are waiting to be shown.
+    """
+    remember_cookie = current_app.config.get(
+        "REMEMBER_COOKIE_NAME", "remember_token"
+    )
+    return (
+        "_user_id" in session
+        or "_flashes" in session
+        or remember_cookie in request.cookies
+    )
+
+
+def epoch_seconds(moment):
+    """Converts a timestamp read from the database to seconds since the epoch.
+
+    SQLite returns the UTC timestamps of server_default=now() without a time
+    zone, while Postgres returns them aware.
+
+    Parameters:
+        moment (datetime): The timestamp, or None.
+
+    Returns:
+        float: Seconds since the epoch, or 0 when moment is None.
+    """
+    if moment is None:
+        return 0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+@lru_cache(maxsize=1)
+def release_modified():
+    """Returns when the app's code, templates or data files last changed.
+
+    Every worker of a deployment computes the same value, which changes with
+    each release, so pages cached by browsers are revalidated after one.
+
+    Returns:
+        int: The latest modification time, in seconds since the epoch.
+    """
+    latest = 0
+    for directory, subdirectories, files in os.walk(APP_DIRECTORY):
+        subdirectories[:] = [
+            name for name in subdirectories if name != "__pycache__"
+        ]
+        for name in files:
+            latest = max(
+                latest, os.path.getmtime(os.path.join(directory, name))
+            )
+    return int(latest)
@@ -0,0 +1,152 @@
+"""Project: new_arrivals_chi.
+
+File name: ical.py
+Associated Files:
+   api_routes.py, occurrences.py.
+
+This file serializes service occurrences as an iCalendar (RFC 5545) feed that
+shelters and partner agencies can subscribe to from their calendar apps.
+
+Methods:
+    * generate_ical - Yields an iCalendar feed one line at a time.
+    * build_event - Returns the lines of the VEVENT for one occurrence.
+    * escape_text - Escapes a value for an iCalendar TEXT property.
+    * fold_line - Folds a content line to at most 75 octets per line.
+"""
+
+from datetime import datetime
+from new_arrivals_chi.app.constants import TIMEZONE
+
+PRODUCT_ID = "-//New Arrivals Chicago//Service Calendar//EN"
+UID_DOMAIN = "new-arrivals-chi"
+
+# Daylight saving rules of America/Chicago since 2007, so clients do not need
+# their own copy of the time zone database
+CHICAGO_VTIMEZONE = (
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TIMEZONE}",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:-0600",
+    "TZOFFSETTO:-0500",
+    "TZNAME:CDT",
+    "DTSTART:19700308T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:-0500",
+    "TZOFFSETTO:-0600",
+    "TZNAME:CST",
+    "DTSTART:19701101T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+)
+
+
+def generate_ical(occurrences, stamp):
+    """Yields an iCalendar feed one line at a time.
+
+    Parameters:
+        occurrences (iterable): Occurrence dictionaries, as built by
+            occurrences.build_calendar.
+        stamp (datetime.datetime): Time the feed is generated, in UTC; used
+            as every event's DTSTAMP.
+
+    Yields:
+        str: Folded content lines ending in CRLF.
+    """
+    header = (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        *CHICAGO_VTIMEZONE,
+    )
+    for line in header:
+        yield fold_line(line)
+
+    stamp = stamp.strftime("%Y%m%dT%H%M%SZ")
+    for occurrence in occurrences:
+        for line in build_event(occurrence, stamp):
+            yield fold_line(line)
+
+    yield fold_line("END:VCALENDAR")
+
+
+def build_event(occurrence, stamp):
+    """Returns the lines of the VEVENT for one occurrence.
+
+    Parameters:
+        occurrence (dict): The occurrence to be serialized.
+        stamp (str): The DTSTAMP value, in UTC basic format.
+
+    Returns:
+        list: The unfolded content lines of the event.
+    """
+    day = occurrence["date"]
+    start = datetime.combine(day, occurrence["start_time"])
+    end = datetime.combine(day, occurrence["end_time"])
+    uid = (
+        f"{occurrence['service_date_id']}-{occurrence['service_id']}-"
+        f"{occurrence['organization_id']}-{day:%Y%m%d}@{UID_DOMAIN}"
+    )
+    return [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;TZID={TIMEZONE}:{start:%Y%m%dT%H%M%S}",
+        f"DTEND;TZID={TIMEZONE}:{end:%Y%m%dT%H%M%S}",
+        "SUMMARY:"
+        + escape_text(
+            f"{occurrence['service']} - {occurrence['organization']}"
+        ),
+        "CATEGORIES:" + escape_text(occurrence["category"]),
+        "END:VEVENT",
+    ]
+
+
+def escape_text(value):
+    """Escapes a value for an iCalendar TEXT property.
+
+    Parameters:
+        value (str): The value to be escaped.
+
+    Returns:
+        str: The value with backslashes, semicolons, commas and newlines
+        escaped.
+    """
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """Folds a content line to at most 75 octets per line.
+
+    Parameters:
+        line (str): The unfolded content line.
+
+    Returns:
+        str: The folded line, continuation lines starting with a space, and a
+        trailing CRLF.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
@@ -13,33 +13,82 @@ Methods:
     * legal - Route to legal portion of application.
 """
 
-from flask import Flask, Blueprint, render_template, request, g, flash
+from flask import (
+    Flask,
+    Blueprint,
+    render_template,
+    stream_template,
+    request,
+    g,
+    flash,
+    get_template_attribute,
+)
 from flask_babel import Babel, lazy_gettext as _
 from datetime import timedelta
 import os
+import time
 from new_arrivals_chi.app.authorize_routes import authorize
+from new_arrivals_chi.app.api_routes import api
+from new_arrivals_chi.app.commands import register_commands
+from new_arrivals_chi.app.schedule import local_minute_of_week
+from new_arrivals_chi.app.geo import search_nearby
+from new_arrivals_chi.app.neighborhoods import load_neighborhood_graph
+from new_arrivals_chi.app.http_cache import conditional_page, epoch_seconds
+from new_arrivals_chi.app.directory_index import directory_fingerprint
+from new_arrivals_chi.app.render_cache import cached_fragments, cached_render
+from new_arrivals_chi.app.compression import init_compression
+from new_arrivals_chi.app.template_cache import init_bytecode_cache
 from flask_migrate import Migrate
 from flask_login import LoginManager, current_user, login_required
 import bleach
-from markupsafe import escape
+from markupsafe import Markup, escape
+from sqlalchemy.exc import IntegrityError
 from new_arrivals_chi.app.utils import (
     load_neighborhoods,
     validate_email_syntax,
     validate_phone_number,
     create_temp_pwd,
+    encode_cursor,
+    decode_cursor,
+    parse_hours_window,
+    parse_coordinates,
+    normalize_language,
+    format_local_time,
+    buffer_chunks,
 )
 from new_arrivals_chi.app.data_handler import (
-    create_user,
-    create_organization_profile,
+    provision_organization,
     extract_organization,
+    search_organizations,
+    retrieve_search_options,
+    retrieve_directory_entry,
+    retrieve_directory_entries,
 )
 from dotenv import load_dotenv
 from new_arrivals_chi.app.database import (
     db,
     User,
     Organization,
+    OrganizationDirectory,
+)
+from new_arrivals_chi.app.constants import (
+    KEY_LANGUAGE,
+    DEFAULT_LANGUAGE,
+    KEY_SERVICE,
+    KEY_NEIGHBORHOOD,
+    KEY_ORGANIZATION,
+    KEY_HOURS,
+    KEY_CURSOR,
+    KEY_OPEN,
+    KEY_NEAR,
+    KEY_RADIUS,
+    KEY_HOPS,
+    SEARCH_PAGE_SIZE,
+    NEIGHBORHOOD_MAX_HOPS,
+    NEAR_DEFAULT_RADIUS,
+    NEAR_MAX_RADIUS,
+    STREAM_CHUNK_SIZE,
 )
-from new_arrivals_chi.app.constants import KEY_LANGUAGE, DEFAULT_LANGUAGE
 
 migrate = Migrate()
 load_dotenv()
@@ -51,29 +100,105 @@ babel = Babel(app)
 # Initialize local selector and blueprint
 def get_locale():
     """Get the current locale based on the request."""
-    lang = request.args.get(KEY_LANGUAGE, DEFAULT_LANGUAGE)
+    lang = normalize_language(request.args.get(KEY_LANGUAGE))
     g.current_lang = lang
     return lang
 
 
+# Template of the health search rows, and where a row's distance goes
+SEARCH_ROW_TEMPLATE = "health_search_row.html"
+DISTANCE_SLOT = "<!--distance-->"
+
+
+def organization_state(organization_id):
+    """Returns the version of the data shown on an organization page.
+
+    The version is when the organization's read model row was last rebuilt.
+    Organizations not listed in the public directory have no row, and their
+    page is served without validators.
+    """
+    updated_at = (
+        db.session.query(OrganizationDirectory.updated_at)
+        .filter(OrganizationDirectory.organization_id == organization_id)
+        .scalar()
+    )
+    if updated_at is None:
+        return None
+    return updated_at, epoch_seconds(updated_at)
+
+
+def search_state():
+    """Returns the version of the data shown on a health search page.
+
+    The version is the fingerprint of the whole read model. Results filtered
+    by open=now also change with the current minute.
+    """
+    fingerprint = directory_fingerprint()
+    modified = epoch_seconds(fingerprint[1])
+    if request.args.get(KEY_OPEN) == "now":
+        minute = int(time.time() // 60)
+        return (fingerprint, minute), max(modified, minute * 60)
+    return fingerprint, modified
+
+
+def render_search_rows(organization_ids, language, distances):
+    """Renders the rows of the health search table from cached fragments.
+
+    Parameters:
+        organization_ids (list): The IDs of the organizations, in table
+            order.
+        language (str): The language of the page.
+        distances (dict): Miles from the searched point by organization ID,
+            for near searches.
+
+    Yields:
+        Markup: The rows, rendered as they are iterated.
+    """
+    rows = cached_fragments(
+        SEARCH_ROW_TEMPLATE,
+        "organization_row",
+        organization_ids,
+        retrieve_directory_entries,
+        language,
+        distance=Markup(DISTANCE_SLOT),
+    )
+    distance_label = (
+        get_template_attribute(SEARCH_ROW_TEMPLATE, "distance_label")
+        if distances
+        else None
+    )
+
+    for organization_id, row in rows:
+        distance = ""
+        if organization_id in distances:
+            distance = str(distance_label(distances[organization_id]))
+        yield Markup(row.replace(DISTANCE_SLOT, distance))
+
+
 main = Blueprint("main", __name__, static_folder="static")
 
 babel.init_app(app, locale_selector=get_locale)
 
 
 @main.route("/")
+@conditional_page()
+@cached_render
 def home():
     """Home page route."""
     return render_template("home.html")
 
 
 @main.route("/about")
+@conditional_page()
+@cached_render
 def about():
     """About page route."""
     return render_template("about.html")
 
 
 @main.route("/legal")
+@conditional_page()
+@cached_render
 def legal():
     """Establishes route for the legal page.
 
@@ -162,6 +287,8 @@ def legal():
 
 
 @main.route("/legal/tps_info")
+@conditional_page()
+@cached_render
 def legal_tps_info():
     """Establishes route for the TPS info page.
 
@@ -174,6 +301,8 @@ def legal_tps_info():
 
 
 @main.route("/legal/tps_apply")
+@conditional_page()
+@cached_render
 def legal_tps_apply():
     """Establishes route for the TPS apply page.
 
@@ -186,6 +315,8 @@ def legal_tps_apply():
 
 
 @main.route("/legal/vttc_info")
+@conditional_page()
+@cached_render
 def legal_vttc_info():
     """Establishes route for the VTTC info page.
 
@@ -198,6 +329,8 @@ def legal_vttc_info():
 
 
 @main.route("/legal/vttc_apply")
+@conditional_page()
+@cached_render
 def legal_vttc_apply():
     """Establishes route for the VTTC apply page.
 
@@ -210,6 +343,8 @@ def legal_vttc_apply():
 
 
 @main.route("/legal/asylum_info")
+@conditional_page()
+@cached_render
 def legal_asylum_info():
     """Establishes route for the Asylum info page.
 
@@ -222,6 +357,8 @@ def legal_asylum_info():
 
 
 @main.route("/legal/asylum_apply")
+@conditional_page()
+@cached_render
 def legal_asylum_apply():
     """Establishes route for the Asylum apply page.
 
@@ -234,6 +371,8 @@ def legal_asylum_apply():
 
 
 @main.route("/legal/parole_info")
+@conditional_page()
+@cached_render
 def legal_parole_info():
     """Establishes route for the Parole info page.
 
@@ -246,6 +385,8 @@ def legal_parole_info():
 
 
 @main.route("/legal/parole_apply")
+@conditional_page()
+@cached_render
 def legal_parole_apply():
     """Establishes route for the Parole apply page.
 
@@ -258,6 +399,8 @@ def legal_parole_apply():
 
 
 @main.route("/legal/undocumented_resources")
+@conditional_page()
+@cached_render
 def legal_undocumented_resources():
     """Establishes route for the Undocumented Resources page.
 
@@ -270,6 +413,8 @@ def legal_undocumented_resources():
 
 
 @main.route("/legal/work_rights")
+@conditional_page()
+@cached_render
 def workers_rights():
     """Route for information about workers' rights.
 
@@ -280,6 +425,8 @@ def workers_rights():
 
 
 @main.route("/legal/renters_rights")
+@conditional_page()
+@cached_render
 def renters_rights():
     """Route for information about renters' rights.
 
@@ -290,6 +437,8 @@ def renters_rights():
 
 
 @main.route("/legal/lawyers")
+@conditional_page()
+@cached_render
 def lawyers():
     """Route for lawyers.
 
@@ -300,6 +449,8 @@ def lawyers():
 
 
 @main.route("/health")
+@conditional_page()
+@cached_render
 def health():
     """Establishes route for the health page.
 
@@ -312,38 +463,96 @@ def health():
 
 
 @main.route("/health/search")
+@conditional_page(search_state)
 def health_search():
     """Establishes route for the health search page.
 
     This route is accessible by selecting 'Receive Assistance Now' on the
-    health page.
+    health page. The service, neighborhood, organization and hours query
+    parameters filter the directory in the database, open=now keeps only
+    organizations open at the current Chicago time, and the cursor parameter
+    selects the page. hops widens the neighborhood filter to neighborhoods
+    that many borders away, when the neighborhood adjacency graph is
+    bundled. near=latitude,longitude instead lists the closest organizations
+    within radius miles, closest first, on a single page.
 
     Returns:
-        Renders the health search page.
+        Streams one page of the health search results.
     """
-    language = bleach.clean(request.args.get(KEY_LANGUAGE, DEFAULT_LANGUAGE))
-
-    organizations = []
-
-    organization_ids = (
-        db.session.query(Organization.id)
-        .filter(Organization.location_id.isnot(None))
-        .all()
-    )
+    language = normalize_language(request.args.get(KEY_LANGUAGE))
+
+    filters = {
+        key: request.args.get(key, "")
+        for key in (
+            KEY_SERVICE,
+            KEY_NEIGHBORHOOD,
+            KEY_ORGANIZATION,
+            KEY_HOURS,
+            KEY_OPEN,
+            KEY_NEAR,
+            KEY_RADIUS,
+            KEY_HOPS,
+        )
+    }
+    # hops only widens the search when an adjacency graph is bundled
+    widen_neighborhoods = bool(load_neighborhood_graph())
+    if widen_neighborhoods:
+        hops = request.args.get(KEY_HOPS, 0, type=int)
+    else:
+        hops = 0
+        filters[KEY_HOPS] = ""
+
+    search_filters = {
+        "service": filters[KEY_SERVICE],
+        "neighborhood": filters[KEY_NEIGHBORHOOD],
+        "neighborhood_hops": min(max(hops, 0), NEIGHBORHOOD_MAX_HOPS),
+        "organization": filters[KEY_ORGANIZATION],
+        "hours": parse_hours_window(filters[KEY_HOURS]),
+        "open_at": (
+            local_minute_of_week() if filters[KEY_OPEN] == "now" else None
+        ),
+    }
 
-    for org_id in organization_ids:
-        if extract_organization(org_id[0])["service"]:
-            organizations.append(extract_organization(org_id[0]))
+    near = parse_coordinates(filters[KEY_NEAR])
+    distances = {}
+    if near:
+        radius = request.args.get(KEY_RADIUS, NEAR_DEFAULT_RADIUS, type=float)
+        radius = (
+            min(radius, NEAR_MAX_RADIUS) if radius > 0 else NEAR_DEFAULT_RADIUS
+        )
+        nearby = search_nearby(
+            *near, radius=radius, limit=SEARCH_PAGE_SIZE, **search_filters
+        )
+        organization_ids = [organization_id for organization_id, _ in nearby]
+        distances = dict(nearby)
+        next_after = None
+    else:
+        organization_ids, next_after = search_organizations(
+            after=decode_cursor(request.args.get(KEY_CURSOR)),
+            **search_filters,
+        )
 
-    return render_template(
+    # The page is streamed: the form is sent while the rows, only read from
+    # the directory when not cached, are still being rendered
+    stream = stream_template(
         "health_search.html",
-        services_info=organizations,
-        set=set,
+        organization_ids=organization_ids,
+        rows=render_search_rows(organization_ids, language, distances),
+        distances=distances,
+        search_options=retrieve_search_options(language),
+        filters=filters,
+        active_filters={key: value for key, value in filters.items() if value},
+        widen_neighborhoods=widen_neighborhoods,
+        next_cursor=encode_cursor(*next_after) if next_after else None,
+        is_first_page=KEY_CURSOR not in request.args,
         language=language,
     )
+    return buffer_chunks(stream, STREAM_CHUNK_SIZE)
 
 
 @main.route("/health_general")
+@conditional_page()
+@cached_render
 def health_general():
     """Route for general health static page.
 
@@ -355,6 +564,8 @@ def health_general():
 
 
 @main.route("/general")
+@conditional_page()
+@cached_render
 def general():
     """Route for Chicago 101 page.
 
@@ -398,6 +609,7 @@ def dashboard():
 
 
 @main.route("/org/<int:organization_id>", methods=["GET"])
+@conditional_page(organization_state)
 def org(organization_id):
     """Establishes route to the organization page.
 
@@ -409,7 +621,10 @@ def org(organization_id):
     """
     language = bleach.clean(request.args.get(KEY_LANGUAGE, DEFAULT_LANGUAGE))
 
-    organization = extract_organization(organization_id)
+    organization = retrieve_directory_entry(organization_id)
+    if organization is None:
+        # Organizations not listed in the public directory have no read model
+        organization = extract_organization(organization_id)
 
     return render_template(
         "organization.html",
@@ -497,31 +712,29 @@ def add_organization():
             flash(
                 escape("Invalid phone number (correct example: ###-###-####)")
             )
-        else:
-            # Create the organization as HIDDEN
-            new_org_id = create_organization_profile(
-                org_name, phone_number, "HIDDEN"
-            )
+        elif User.query.filter_by(email=email).first():
+            flash(escape("Email address already exists for user"))
 
+        else:
             # Create a temporary password for the user
             temp_pwd = create_temp_pwd(email, phone_number)
 
-            # Create the user with the provided email and a default password
-            new_user = create_user(email, temp_pwd)
-
-            # Update the user with the new organization
+            # Create the organization as HIDDEN, together with its user
             try:
-                user = User.query.get(new_user.id)
-                user.organization_id = new_org_id
-                db.session.commit()
-            except Exception as error:
-                print(f"Error updating user with organization: {error}")
-
-            # Redirect to the success page
-            return render_template(
-                "add_organization_success.html",
-                language=language,
-            )
+                new_user = provision_organization(
+                    org_name, phone_number, email, temp_pwd
+                )
+            except IntegrityError:
+                # The email address was taken after it was checked
+                flash(escape("Email address already exists for user"))
+            else:
+                if new_user is not None:
+                    # Redirect to the success page
+                    return render_template(
+                        "add_organization_success.html",
+                        language=language,
+                    )
+                flash(escape("Please fill in every field. Try again"))
 
     return render_template(
         "add_organization.html",
@@ -554,18 +767,31 @@ def create_app(config_override=None):
     app.config["BABEL_DEFAULT_LOCALE"] = "en"
     app.config["BABEL_TRANSLATION_DIRECTORIES"] = "../translations"
 
+    # Compiled templates are kept on disk, shared by workers and restarts
+    app.config["JINJA_BYTECODE_CACHE_DIR"] = os.getenv(
+        "JINJA_BYTECODE_CACHE_DIR",
+        default=os.path.join(app.instance_path, "jinja_bytecode"),
+    )
+
     @app.context_processor
     def inject_locale():
         return {"get_locale": get_locale}
 
+    app.add_template_filter(format_local_time, "format_time")
+
     if config_override:
         app.config.update(config_override)
 
     db.init_app(app)
     migrate.init_app(app, db)
+    init_bytecode_cache(app)
 
     app.register_blueprint(main)
     app.register_blueprint(authorize)
+    app.register_blueprint(api)
+
+    register_commands(app)
+    init_compression(app)
 
     login_manager = LoginManager()
     login_manager.login_view = "authorize.login"
@@ -0,0 +1,168 @@
+"""Project: new_arrivals_chi.
+
+File name: neighborhoods.py
+Associated Files:
+   data_handler.py, commands.py, static/neighborhood_adjacency.json.
+
+This file contains the adjacency graph of Chicago neighborhoods used to
+search "in or near" a neighborhood. The graph is bundled as
+static/neighborhood_adjacency.json and can be rebuilt offline from a GeoJSON
+file of neighborhood boundaries (see commands.build_neighborhood_graph_command);
+two neighborhoods are adjacent when their boundaries share a point. Expanded
+neighborhood sets are cached, so a search only pays for one IN filter.
+
+Methods:
+    * build_adjacency - Builds the adjacency graph of boundary features.
+    * match_neighborhood_name - Matches a boundary name to a neighborhood
+      value.
+    * save_neighborhood_graph - Writes the adjacency graph to the static
+      folder.
+    * load_neighborhood_graph - Loads the bundled adjacency graph.
+    * expand_neighborhood - Returns the neighborhoods within some hops of one.
+    * reload_neighborhood_graph - Drops the cached graph and expansions.
+"""
+
+import json
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+NEIGHBORHOOD_GRAPH_PATH = os.path.join(
+    os.path.dirname(__file__), "static", "neighborhood_adjacency.json"
+)
+
+# Boundary vertices are compared after rounding to about 10 centimeters, so
+# polygons digitized from the same line are recognized as touching
+VERTEX_PRECISION = 6
+
+
+def build_adjacency(features, name_property, neighborhoods):
+    """Builds the adjacency graph of neighborhood boundary features.
+
+    Parameters:
+        features (list): GeoJSON features with Polygon or MultiPolygon
+            geometries.
+        name_property (str): Feature property holding the neighborhood name.
+        neighborhoods (list): The neighborhood values used by the app.
+
+    Returns:
+        tuple: The graph, mapping each neighborhood to the sorted list of its
+        neighbors, and the sorted list of boundary names that match no
+        neighborhood value.
+    """
+    names_by_vertex = defaultdict(set)
+    unmatched = set()
+
+    for feature in features:
+        boundary_name = feature["properties"][name_property]
+        name = match_neighborhood_name(boundary_name, neighborhoods)
+        if name is None:
+            unmatched.add(boundary_name)
+            continue
+
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"]
+        if geometry["type"] == "Polygon":
+            polygons = [polygons]
+        for polygon in polygons:
+            for ring in polygon:
+                for longitude, latitude, *_ in ring:
+                    vertex = (
+                        round(longitude, VERTEX_PRECISION),
+                        round(latitude, VERTEX_PRECISION),
+                    )
+                    names_by_vertex[vertex].add(name)
+
+    graph = defaultdict(set)
+    for names in names_by_vertex.values():
+        for name in names:
+            graph[name].update(names - {name})
+
+    return (
+        {name: sorted(neighbors) for name, neighbors in sorted(graph.items())},
+        sorted(unmatched),
+    )
+
+
+def match_neighborhood_name(boundary_name, neighborhoods):
+    """Matches a name from a boundary file to a neighborhood value.
+
+    Boundary files write names with spaces and punctuation ("Hyde Park",
+    "Back of the Yards"); neighborhood values use underscores.
+
+    Parameters:
+        boundary_name (str): The name in the boundary file.
+        neighborhoods (list): The neighborhood values used by the app.
+
+    Returns:
+        str: The matching neighborhood value, or None.
+    """
+    key = re.sub(r"[^a-z]+", "_", boundary_name.lower()).strip("_")
+    for neighborhood in neighborhoods:
+        if neighborhood.lower() == key:
+            return neighborhood
+    return None
+
+
+def save_neighborhood_graph(graph):
+    """Writes the adjacency graph to the static folder.
+
+    Parameters:
+        graph (dict): Neighborhoods mapped to the lists of their neighbors.
+    """
+    with open(NEIGHBORHOOD_GRAPH_PATH, "w") as file:
+        json.dump(graph, file, indent=2, sort_keys=True)
+        file.write("\n")
+    reload_neighborhood_graph()
+
+
+@lru_cache(maxsize=1)
+def load_neighborhood_graph():
+    """Loads the bundled neighborhood adjacency graph.
+
+    Returns:
+        dict: Neighborhoods mapped to tuples of their neighbors. Empty if the
+        graph has not been built.
+    """
+    try:
+        with open(NEIGHBORHOOD_GRAPH_PATH) as file:
+            graph = json.load(file)
+    except FileNotFoundError:
+        return {}
+    return {name: tuple(neighbors) for name, neighbors in graph.items()}
+
+
+@lru_cache(maxsize=1024)
+def expand_neighborhood(neighborhood, hops):
+    """Returns the neighborhoods within a number of hops of a neighborhood.
+
+    Parameters:
+        neighborhood (str): The neighborhood searched for.
+        hops (int): How many borders away neighborhoods may be; 0 for the
+            neighborhood alone.
+
+    Returns:
+        tuple: The sorted neighborhood values, including the neighborhood
+        itself.
+    """
+    graph = load_neighborhood_graph()
+    reached = {neighborhood}
+    frontier = {neighborhood}
+    for _ in range(hops):
+        frontier = {
+            neighbor
+            for name in frontier
+            for neighbor in graph.get(name, ())
+            if neighbor not in reached
+        }
+        if not frontier:
+            break
+        reached |= frontier
+    return tuple(sorted(reached))
+
+
+def reload_neighborhood_graph():
+    """Drops the cached graph and expansions, e.g. after rebuilding it."""
+    load_neighborhood_graph.cache_clear()
+    expand_neighborhood.cache_clear()
@@ -0,0 +1,265 @@
+"""Project: new_arrivals_chi.
+
+File name: occurrences.py
+Associated Files:
+   database.py, data_handler.py, cache.py.
+
+This file expands the repeat rules of service dates ("every day", "every
+week", "every other week", "every month") into the occurrences that fall in a
+date window.
+
+Occurrence dates are computed arithmetically rather than by stepping through
+the calendar, and rules that repeat on the same cycle share one computed
+sequence: every weekly rule anchored on a Tuesday, for instance, has the same
+occurrences in a given window. The expanded calendar of a window is cached
+until a service date or organization changes.
+
+Methods:
+    * occurrence_dates - Returns the dates a repeat rule occurs in a window.
+    * periodic_dates - Returns the dates of a fixed-period cycle in a window.
+    * monthly_dates - Returns a day of the month in every month of a window.
+    * retrieve_calendar - Returns every occurrence in a window, cached.
+    * build_calendar - Expands every listed service date in a window.
+    * find_occurrences - Returns the occurrences in a window matching filters.
+    * calendar_version - Returns a fingerprint of the data calendars are built
+      from.
+"""
+
+from datetime import date
+from functools import lru_cache
+from new_arrivals_chi.app.database import (
+    db,
+    Organization,
+    OrganizationDirectory,
+    Service,
+    ServiceDate,
+)
+from new_arrivals_chi.app.data_handler import listed_organization_filters
+from new_arrivals_chi.app.cache import LRUCache, data_version
+from new_arrivals_chi.app.constants import (
+    CALENDAR_CACHE_SIZE,
+    ORGANIZATION_CACHE_TTL,
+)
+
+# Length in days of the repeat rules with a fixed period
+REPEAT_PERIODS = {
+    "every day": 1,
+    "every week": 7,
+    "every other week": 14,
+}
+REPEAT_MONTHLY = "every month"
+
+# Expanded calendars keyed by (start, end, data version, calendar version)
+calendar_cache = LRUCache(CALENDAR_CACHE_SIZE, ORGANIZATION_CACHE_TTL)
+
+
+def occurrence_dates(anchor, repeat, start, end):
+    """Returns the dates a repeat rule occurs on in a window.
+
+    Parameters:
+        anchor (datetime.date): The first date of the service.
+        repeat (str): The repeat rule of the service date.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+
+    Returns:
+        tuple: The occurrence dates, in order. Monthly rules skip months that
+        do not have the anchor's day, as iCalendar does.
+    """
+    start = max(start, anchor)
+    if start > end:
+        return ()
+
+    if repeat == REPEAT_MONTHLY:
+        return monthly_dates(anchor.day, start, end)
+
+    period = REPEAT_PERIODS[repeat]
+    return periodic_dates(period, anchor.toordinal() % period, start, end)
+
+
+@lru_cache(maxsize=1024)
+def periodic_dates(period, residue, start, end):
+    """Returns the dates of a fixed-period cycle in a window.
+
+    Parameters:
+        period (int): Days between occurrences.
+        residue (int): Proleptic Gregorian ordinal of any occurrence, modulo
+            period; it identifies the cycle.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+
+    Returns:
+        tuple: The dates in the window whose ordinal is congruent to residue.
+    """
+    first = start.toordinal() + (residue - start.toordinal()) % period
+    return tuple(
+        date.fromordinal(ordinal)
+        for ordinal in range(first, end.toordinal() + 1, period)
+    )
+
+
+@lru_cache(maxsize=1024)
+def monthly_dates(day, start, end):
+    """Returns a day of the month in every month of a window.
+
+    Parameters:
+        day (int): The day of the month.
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+
+    Returns:
+        tuple: The dates in the window falling on day, skipping months that
+        are too short.
+    """
+    dates = []
+    month_index = start.year * 12 + start.month - 1
+    last_month_index = end.year * 12 + end.month - 1
+    while month_index <= last_month_index:
+        year, month = divmod(month_index, 12)
+        try:
+            candidate = date(year, month + 1, day)
+        except ValueError:
+            candidate = None
+        if candidate and start <= candidate <= end:
+            dates.append(candidate)
+        month_index += 1
+    return tuple(dates)
+
+
+def retrieve_calendar(start, end):
+    """Returns every occurrence of a listed service in a window.
+
+    Parameters:
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+
+    Returns:
+        list: Occurrence dictionaries as built by build_calendar. The list is
+        shared between callers and must not be modified.
+    """
+    key = (start, end, data_version(), calendar_version())
+    calendar = calendar_cache.get(key)
+    if calendar is None:
+        calendar = build_calendar(start, end)
+        calendar_cache.set(key, calendar)
+    return calendar
+
+
+def build_calendar(start, end):
+    """Expands every service date of a listed organization in a window.
+
+    Parameters:
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+
+    Returns:
+        list: One dictionary per occurrence with its date, start and end time,
+        repeat rule, service and organization, ordered by date, start time,
+        organization and service.
+    """
+    rules = (
+        db.session.query(
+            ServiceDate.id,
+            ServiceDate.date,
+            ServiceDate.start_time,
+            ServiceDate.end_time,
+            ServiceDate.repeat,
+            Service.id,
+            Service.service,
+            Service.category,
+            Organization.id,
+            Organization.name,
+        )
+        .join(ServiceDate.services)
+        .join(Service.organizations)
+        .filter(*listed_organization_filters())
+        .filter(ServiceDate.deleted_at.is_(None))
+        .filter(Service.deleted_at.is_(None))
+        .filter(ServiceDate.date <= end)
+    )
+
+    calendar = []
+    for (
+        service_date_id,
+        anchor,
+        start_time,
+        end_time,
+        repeat,
+        service_id,
+        service,
+        category,
+        organization_id,
+        organization,
+    ) in rules:
+        for occurrence in occurrence_dates(anchor, repeat, start, end):
+            calendar.append(
+                {
+                    "date": occurrence,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "repeat": repeat,
+                    "service_date_id": service_date_id,
+                    "service_id": service_id,
+                    "service": service,
+                    "category": category,
+                    "organization_id": organization_id,
+                    "organization": organization,
+                }
+            )
+
+    calendar.sort(
+        key=lambda occurrence: (
+            occurrence["date"],
+            occurrence["start_time"],
+            occurrence["organization"],
+            occurrence["service"],
+        )
+    )
+    return calendar
+
+
+def find_occurrences(start, end, categories=None, organization_id=None):
+    """Returns the occurrences in a window matching the filters.
+
+    Parameters:
+        start (datetime.date): First day of the window.
+        end (datetime.date): Last day of the window, inclusive.
+        categories (iterable, optional): Only services in these categories.
+        organization_id (int, optional): Only services of this organization.
+
+    Returns:
+        list: Occurrence dictionaries, as built by build_calendar.
+    """
+    categories = set(categories or ())
+    return [
+        occurrence
+        for occurrence in retrieve_calendar(start, end)
+        if (not categories or occurrence["category"] in categories)
+        and (
+            organization_id is None
+            or occurrence["organization_id"] == organization_id
+        )
+    ]
+
+
+def calendar_version():
+    """Returns a fingerprint of the data calendars are built from.
+
+    The fingerprint changes whenever a service date is added, edited or
+    deleted, or an organization's read model row is rebuilt. It is read from the
+    database, so every worker computes the same value.
+
+    Returns:
+        str: The fingerprint.
+    """
+    service_dates = db.session.query(
+        db.func.count(ServiceDate.id),
+        db.func.max(ServiceDate.id),
+        db.func.max(ServiceDate.updated_at),
+        db.func.max(ServiceDate.deleted_at),
+    ).one()
+    directory = db.session.query(
+        db.func.count(OrganizationDirectory.organization_id),
+        db.func.max(OrganizationDirectory.updated_at),
+    ).one()
+    return "|".join(str(value) for value in (*service_dates, *directory))
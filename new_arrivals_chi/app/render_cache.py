@@ -0,0 +1,184 @@
+"""Project: new_arrivals_chi.
+
+File name: render_cache.py
+Associated Files:
+   main.py, http_cache.py, cache.py.
+
+This file contains the cache of rendered informational pages. Pages like the
+home, legal and health pages only depend on their templates and the language,
+so once rendered, their HTML is served from an LRU cache without running the
+view or Jinja. Entries are keyed by endpoint, language and the modification
+time of the templates; unsupported languages are rendered in the default one
+(see utils.normalize_language), so they share its entry instead of adding
+their own.
+
+Like the validators of http_cache.py, cached pages are never served to a
+signed-in user or when flashed messages are waiting.
+
+Parts of data pages that only depend on one organization and the language,
+like the rows of the health search table, are cached as fragments keyed by
+the organization's version (see cache.py), so assembling a page joins cached
+strings and a write to an organization only re-renders its own fragments.
+Organizations are only read from the database when one of their fragments
+is missing.
+
+Methods:
+    * cached_render - Decorator serving a page's rendered HTML from the cache.
+    * cached_fragments - Renders a fragment per organization lazily, reusing
+      cached ones.
+    * template_modified - Returns when the templates last changed.
+    * latest_modified - Returns the latest modification time under a folder.
+"""
+
+import os
+from functools import lru_cache, wraps
+from http import HTTPStatus
+from flask import current_app, get_template_attribute, make_response, request
+from new_arrivals_chi.app.cache import LRUCache, organization_version
+from new_arrivals_chi.app.constants import (
+    FRAGMENT_CACHE_SIZE,
+    KEY_LANGUAGE,
+    ORGANIZATION_CACHE_TTL,
+    RENDER_CACHE_SIZE,
+    RENDER_CACHE_TTL,
+)
+from new_arrivals_chi.app.http_cache import is_personalized
+from new_arrivals_chi.app.utils import normalize_language
+
+render_cache = LRUCache(RENDER_CACHE_SIZE, RENDER_CACHE_TTL)
+fragment_cache = LRUCache(FRAGMENT_CACHE_SIZE, ORGANIZATION_CACHE_TTL)
+
+
+def cached_render(view):
+    """Decorator serving a page's rendered HTML from the render cache.
+
+    Only for views whose output depends on nothing but the language.
+
+    Parameters:
+        view (callable): The view rendering the page.
+
+    Returns:
+        callable: The view, answered from the cache after its first render.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if is_personalized():
+            return view(*args, **kwargs)
+
+        key = (
+            request.endpoint,
+            normalize_language(request.args.get(KEY_LANGUAGE)),
+            template_modified(),
+        )
+        body = render_cache.get(key)
+        if body is not None:
+            return current_app.response_class(body, mimetype="text/html")
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == HTTPStatus.OK and not response.is_streamed:
+            render_cache.set(key, response.get_data())
+        return response
+
+    return wrapper
+
+
+def cached_fragments(
+    template, macro, organization_ids, load, language, **kwargs
+):
+    """Renders a fragment per organization lazily, reusing cached ones.
+
+    Only the organizations whose fragment is not cached are loaded, in one
+    call of load, and their fragments are rendered as they are iterated.
+
+    Parameters:
+        template (str): The template defining the macro.
+        macro (str): The macro, called with an organization view, the
+            language and kwargs.
+        organization_ids (list): The IDs of the organizations, in order.
+        load (callable): Called with a list of IDs, returns their
+            organization views (see data_handler.retrieve_directory_entries).
+        language (str): A supported language (see utils.normalize_language).
+        **kwargs: Further arguments of the macro; they must be the same for
+            every call, as they are not part of the cache key.
+
+    Yields:
+        tuple: The ID of each organization and its fragment, as a string.
+        Organizations that are neither cached nor loaded are skipped.
+    """
+    modified = template_modified()
+    keys = {
+        organization_id: (
+            template,
+            macro,
+            organization_id,
+            organization_version(organization_id),
+            language,
+            modified,
+        )
+        for organization_id in organization_ids
+    }
+    fragments = {
+        organization_id: fragment_cache.get(key)
+        for organization_id, key in keys.items()
+    }
+
+    missing = [
+        organization_id
+        for organization_id, fragment in fragments.items()
+        if fragment is None
+    ]
+    organizations = (
+        {organization.id: organization for organization in load(missing)}
+        if missing
+        else {}
+    )
+    render = None
+
+    for organization_id in organization_ids:
+        fragment = fragments[organization_id]
+        if fragment is None:
+            if organization_id not in organizations:
+                continue
+            if render is None:
+                render = get_template_attribute(template, macro)
+            fragment = str(
+                render(organizations[organization_id], language, **kwargs)
+            )
+            fragment_cache.set(keys[organization_id], fragment)
+        yield organization_id, fragment
+
+
+def template_modified():
+    """Returns when the application's templates last changed.
+
+    Templates are only reloaded from disk when Jinja's auto_reload is on (in
+    debug mode), so only then are they checked again on every call.
+
+    Returns:
+        float: The latest modification time, in seconds since the epoch.
+    """
+    folder = os.path.join(current_app.root_path, current_app.template_folder)
+    if current_app.jinja_env.auto_reload:
+        return latest_modified.__wrapped__(folder)
+    return latest_modified(folder)
+
+
+@lru_cache(maxsize=4)
+def latest_modified(folder):
+    """Returns the latest modification time of the files under a folder.
+
+    Parameters:
+        folder (str): Path of the folder.
+
+    Returns:
+        float: The latest modification time, in seconds since the epoch.
+    """
+    return max(
+        (
+            os.path.getmtime(os.path.join(directory, name))
+            for directory, _, files in os.walk(folder)
+            for name in files
+        ),
+        default=0,
+    )
@@ -0,0 +1,321 @@
+"""Project: new_arrivals_chi.
+
+File name: schedule.py
+Associated Files:
+   database.py, directory_index.py, api_routes.py.
+
+This file contains the in-memory index of opening hours used to answer "which
+organizations are open at this time". Lookups only read the database to
+check, at most once every DIRECTORY_CHECK_INTERVAL seconds, that the index is
+current (see directory_index.py). Opening hours are stored as minute-of-week
+ranges (minutes since Monday 00:00, see database.minute_of_week) and bucketed
+by hour of the week, so a lookup only scans the few ranges that overlap the
+requested hour.
+
+The weekly schedule of one organization is built from the index once per
+organization version and cached, with its ranges sorted and split by day,
+so today's hours are an index and the next opening a binary search.
+
+Classes:
+    * OpenHoursIndex - Bucketed interval index of opening hours.
+    * WeeklySchedule - Immutable weekly opening hours of one organization.
+
+Methods:
+    * get_open_hours_index - Returns the process-wide index, rebuilding it
+      when stale.
+    * get_weekly_schedule - Returns the cached weekly schedule of an
+      organization.
+    * directory_intervals - Extracts the minute-of-week ranges of a read model
+      row.
+    * local_minute_of_week - Converts a datetime to a Chicago minute of week.
+    * local_today - Returns today's date in Chicago.
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+from new_arrivals_chi.app.database import (
+    MINUTES_PER_DAY,
+    minute_of_week,
+)
+from new_arrivals_chi.app.cache import LRUCache, organization_version
+from new_arrivals_chi.app.directory_index import DirectoryIndex
+from new_arrivals_chi.app.constants import (
+    ORGANIZATION_CACHE_TTL,
+    SCHEDULE_CACHE_SIZE,
+    TIMEZONE,
+    WEEKDAYS,
+)
+from new_arrivals_chi.app.view_models import View
+
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+BUCKET_MINUTES = 60
+
+# Day names used as keys of the read model's hours, Monday = 1
+DAY_NUMBERS = {day: number for number, day in enumerate(WEEKDAYS, start=1)}
+
+# Weekly schedules keyed by (organization id, organization version)
+schedule_cache = LRUCache(SCHEDULE_CACHE_SIZE, ORGANIZATION_CACHE_TTL)
+
+
+class OpenHoursIndex:
+    """Interval index of organizations' weekly opening hours.
+
+    Each (start, end) minute-of-week range is stored in every hour-of-week
+    bucket it overlaps. Ranges are half-open: an organization closing at
+    17:00 is no longer open at 17:00.
+    """
+
+    def __init__(self):
+        """Creates an empty index."""
+        self._lock = threading.Lock()
+        self._buckets = [[] for _ in range(MINUTES_PER_WEEK // BUCKET_MINUTES)]
+        self._intervals = {}
+
+    def __len__(self):
+        """Returns the number of organizations in the index."""
+        return len(self._intervals)
+
+    def update(self, organization_id, intervals):
+        """Adds an organization or replaces its opening hours.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+            intervals (list): (start, end) minute-of-week ranges.
+        """
+        with self._lock:
+            self._remove(organization_id)
+            self._intervals[organization_id] = intervals
+            for start, end in intervals:
+                for bucket in self._bucket_range(start, end):
+                    self._buckets[bucket].append((start, end, organization_id))
+
+    def remove(self, organization_id):
+        """Removes an organization from the index if present.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+        """
+        with self._lock:
+            self._remove(organization_id)
+
+    def _remove(self, organization_id):
+        intervals = self._intervals.pop(organization_id, None)
+        if not intervals:
+            return
+
+        for start, end in intervals:
+            for bucket in self._bucket_range(start, end):
+                self._buckets[bucket] = [
+                    entry
+                    for entry in self._buckets[bucket]
+                    if entry[2] != organization_id
+                ]
+
+    @staticmethod
+    def _bucket_range(start, end):
+        return range(start // BUCKET_MINUTES, (end - 1) // BUCKET_MINUTES + 1)
+
+    def intervals(self, organization_id):
+        """Returns the opening hours of an organization.
+
+        Parameters:
+            organization_id (int): The ID of the organization.
+
+        Returns:
+            list: (start, end) minute-of-week ranges, or None if the
+            organization is not in the index.
+        """
+        with self._lock:
+            return self._intervals.get(organization_id)
+
+    def open_during(self, start, end=None):
+        """Returns the organizations open for a whole window.
+
+        Parameters:
+            start (int): Minute of week the window starts.
+            end (int, optional): Minute of week the window ends; defaults to
+                the minute after start, i.e. "open at start".
+
+        Returns:
+            list: Sorted IDs of the organizations open from start to end.
+        """
+        if end is None:
+            end = start + 1
+
+        with self._lock:
+            bucket = self._buckets[start // BUCKET_MINUTES]
+            return sorted(
+                {
+                    organization_id
+                    for opening, closing, organization_id in bucket
+                    if opening <= start and end <= closing
+                }
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class WeeklySchedule(View):
+    """Weekly opening hours of one organization.
+
+    Ranges are half-open minute-of-week ranges, sorted by start. days holds
+    the ranges starting on each day, Monday first, and starts the sorted
+    start minutes of all ranges.
+    """
+
+    intervals: tuple
+    days: tuple
+    starts: tuple
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        """Builds a schedule, sorting the ranges once.
+
+        Parameters:
+            intervals (iterable): (start, end) minute-of-week ranges.
+
+        Returns:
+            WeeklySchedule: The schedule.
+        """
+        ordered = tuple(sorted(intervals))
+        days = [[] for _ in WEEKDAYS]
+        for start, end in ordered:
+            days[start // MINUTES_PER_DAY].append((start, end))
+        return cls(
+            intervals=ordered,
+            days=tuple(tuple(day) for day in days),
+            starts=tuple(start for start, _ in ordered),
+        )
+
+    def today(self, minute):
+        """Returns the ranges of the day a minute falls on.
+
+        Parameters:
+            minute (int): Minute of week.
+
+        Returns:
+            tuple: The (start, end) ranges starting that day.
+        """
+        return self.days[minute // MINUTES_PER_DAY]
+
+    def open_until(self, minute):
+        """Returns when the organization closes, if it is open at a minute.
+
+        Parameters:
+            minute (int): Minute of week.
+
+        Returns:
+            int: The minute of week it closes, or None if it is closed.
+        """
+        return max(
+            (end for start, end in self.today(minute) if start <= minute < end),
+            default=None,
+        )
+
+    def next_opening(self, minute):
+        """Returns when the organization next opens after a minute.
+
+        Parameters:
+            minute (int): Minute of week.
+
+        Returns:
+            int: The minute of week of the next opening, which is earlier
+            than minute when it falls in the next week, or None if the
+            organization never opens.
+        """
+        if not self.starts:
+            return None
+        position = bisect.bisect_right(self.starts, minute)
+        return self.starts[position % len(self.starts)]
+
+
+def get_open_hours_index():
+    """Returns the process-wide opening hours index, rebuilding it when stale.
+
+    Returns:
+        OpenHoursIndex: The index over the organization_directory read model.
+    """
+    return open_hours_index.get()
+
+
+def get_weekly_schedule(organization_id):
+    """Returns the weekly schedule of an organization.
+
+    Built from the opening hours index and cached per version of the
+    organization and of the index. The index is fetched first, so once it
+    has picked up a schedule written by another process, that schedule is not
+    hidden by one cached under an older version.
+
+    Parameters:
+        organization_id (int): The ID of the organization.
+
+    Returns:
+        WeeklySchedule: The schedule, or None if the organization is not
+        listed in the public directory.
+    """
+    index = get_open_hours_index()
+    key = (
+        organization_id,
+        organization_version(organization_id),
+        open_hours_index.fingerprint,
+    )
+    schedule = schedule_cache.get(key)
+    if schedule is None:
+        intervals = index.intervals(organization_id)
+        if intervals is None:
+            return None
+        schedule = WeeklySchedule.from_intervals(intervals)
+        schedule_cache.set(key, schedule)
+    return schedule
+
+
+def directory_intervals(entry):
+    """Extracts the minute-of-week ranges of an organization_directory row.
+
+    Parameters:
+        entry (OrganizationDirectory): The read model row.
+
+    Returns:
+        list: (start, end) minute-of-week ranges.
+    """
+    return [
+        (
+            minute_of_week(DAY_NUMBERS[day], opening),
+            minute_of_week(DAY_NUMBERS[day], closing),
+        )
+        for day, segments in entry.hours.items()
+        for opening, closing in segments
+    ]
+
+
+def local_minute_of_week(moment=None):
+    """Converts a datetime to minutes since Monday 00:00 in Chicago.
+
+    Parameters:
+        moment (datetime, optional): The moment to convert. Naive
+            datetimes are taken as Chicago time, aware ones are converted.
+            Defaults to now.
+
+    Returns:
+        int: Minutes since Monday 00:00, Chicago time.
+    """
+    zone = ZoneInfo(TIMEZONE)
+    if moment is None:
+        moment = datetime.now(zone)
+    elif moment.tzinfo is not None:
+        moment = moment.astimezone(zone)
+    return minute_of_week(moment.isoweekday(), time(moment.hour, moment.minute))
+
+
+def local_today():
+    """Returns today's date in Chicago.
+
+    Returns:
+        datetime.date: The current date, Chicago time.
+    """
+    return datetime.now(ZoneInfo(TIMEZONE)).date()
+
+
+open_hours_index = DirectoryIndex(OpenHoursIndex, directory_intervals)
@@ -1,67 +1,40 @@
 /**
-   Implements filtering mechanisim for table
+   Submits the health search filters whenever a dropdown changes.
 
-   Resource 1: https://www.w3schools.com/howto/howto_js_filter_table.asp
-
-   Resource 2: https://stackoverflow.com/questions/51187477/how-to-filter-a-html-table-using-simple-javascript
+   Filtering and pagination run on the server; changing a filter starts the
+   results over from the first page. Where the browser can share its
+   location, "Closest to me" submits it so results are ordered by distance.
+   While they are, the button is pressed, and pressing it again clears the
+   location so later filter changes are no longer sorted by distance.
 */
 
-function filterTable() {
-    var suppliesDropdown = document.getElementById("supplies");
-    var neighborhoodDropdown = document.getElementById("neighborhood");
-    var organizationDropdown = document.getElementById("organization");
-    var hoursDropdown = document.getElementById("hours");
-
-    var tableBody = document.querySelector("#healthTable tbody");
-
-    var supplies = suppliesDropdown.value;
-    var neighborhood = neighborhoodDropdown.value;
-    var organization = organizationDropdown.value;
-    var hours = hoursDropdown.value;
-
-    var rows = tableBody.querySelectorAll("tr");
-    rows.forEach(function(row) {
-        var cells = row.querySelectorAll("td");
-        var showRow = true;
-
-        if (supplies) {
-            var services = cells[0].textContent.toLowerCase().split(', ');
-            if (!services.some(service => service.includes(supplies.toLowerCase()))) {
-                showRow = false;
-            }
-        }
+document.addEventListener("DOMContentLoaded", function() {
+    var filterForm = document.getElementById("searchFilters");
+    var dropdowns = filterForm.querySelectorAll("select");
 
-        if (neighborhood && cells[1].textContent !== neighborhood) {
-            showRow = false;
-        }
-        if (organization && cells[2].textContent !== organization) {
-            showRow = false;
-        }
-        if (hours) {
-            var hrs = cells[3].textContent.toLowerCase();
-            if (!hrs.includes(hours)) {
-                showRow = false;
-            }
-        }
+    dropdowns.forEach(function(dropdown) {
+        dropdown.addEventListener("change", function() {
+            filterForm.submit();
+        });
+    });
 
-        if (showRow) {
-            row.style.display = "";
-        } else {
-            row.style.display = "none";
+    var nearMe = document.getElementById("nearMe");
+    var near = document.getElementById("near");
+    if ("geolocation" in navigator) {
+        nearMe.hidden = false;
+    }
+    nearMe.addEventListener("click", function() {
+        if (nearMe.getAttribute("aria-pressed") === "true") {
+            near.value = "";
+            document.getElementById("radius").value = "";
+            filterForm.submit();
+            return;
         }
+        navigator.geolocation.getCurrentPosition(function(position) {
+            near.value =
+                position.coords.latitude.toFixed(4) + "," +
+                position.coords.longitude.toFixed(4);
+            filterForm.submit();
+        });
     });
-}
-
-document.addEventListener("DOMContentLoaded", function() {
-    var suppliesDropdown = document.getElementById("supplies");
-    var neighborhoodDropdown = document.getElementById("neighborhood");
-    var organizationDropdown = document.getElementById("organization");
-    var hoursDropdown = document.getElementById("hours");
-
-    suppliesDropdown.addEventListener("change", filterTable);
-    neighborhoodDropdown.addEventListener("change", filterTable);
-    organizationDropdown.addEventListener("change", filterTable);
-    hoursDropdown.addEventListener("change", filterTable);
-
-    filterTable();
 });
@@ -0,0 +1,195 @@
+"""Project: new_arrivals_chi.
+
+File name: static_export.py
+Associated Files:
+   commands.py, http_cache.py, compression.py.
+
+This file contains the export of the public pages to static files, so a web
+server or CDN can serve them without running the app. Every public page of
+the main blueprint (the views decorated with http_cache.conditional_page) is
+rendered in every language into <output>/<language>/<path>/index.html,
+together with gzip (and, if installed, brotli) copies compressed at the
+highest level. Organization pages are exported for every organization listed
+in the directory, and the health search page without filters.
+
+A manifest.json records, for every page, a fingerprint of its inputs (the
+release of the app, and the directory rows the page shows) and of its
+content. A rebuild only renders the pages whose inputs changed, and removes
+the files of pages that are no longer exported, e.g. of organizations that
+left the directory.
+
+Methods:
+    * export_site - Exports the public pages to a directory.
+    * public_pages - Lists the public pages with the fingerprint of their
+      inputs.
+    * directory_fingerprints - Returns fingerprints of the directory rows.
+    * page_file - Returns the file a page is exported to.
+    * write_file - Writes a file atomically.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from http import HTTPStatus
+from flask import current_app
+from new_arrivals_chi.app import compression
+from new_arrivals_chi.app.constants import KEY_LANGUAGE, LANGUAGES
+from new_arrivals_chi.app.database import db, OrganizationDirectory
+from new_arrivals_chi.app.http_cache import release_modified
+
+MANIFEST_NAME = "manifest.json"
+
+
+def export_site(output, languages=LANGUAGES):
+    """Exports the public pages to a directory, skipping unchanged pages.
+
+    Must run in an application context.
+
+    Parameters:
+        output (str): The directory the pages are written to.
+        languages (list): The languages each page is exported in.
+
+    Returns:
+        dict: The number of pages written, skipped and removed.
+    """
+    manifest_path = os.path.join(output, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as file:
+            previous = json.load(file)["pages"]
+    except FileNotFoundError:
+        previous = {}
+
+    client = current_app.test_client()
+    pages = {}
+    counts = {"written": 0, "skipped": 0, "removed": 0}
+
+    for path, inputs in public_pages():
+        for language in languages:
+            name = page_file(language, path)
+            fingerprint = hashlib.sha256(
+                f"{inputs}|{language}".encode("utf-8")
+            ).hexdigest()
+
+            entry = previous.get(name)
+            if (
+                entry is not None
+                and entry["inputs"] == fingerprint
+                and os.path.exists(os.path.join(output, name))
+            ):
+                pages[name] = entry
+                counts["skipped"] += 1
+                continue
+
+            response = client.get(path, query_string={KEY_LANGUAGE: language})
+            if response.status_code != HTTPStatus.OK:
+                raise RuntimeError(
+                    f"{path} answered {response.status_code} in {language}."
+                )
+            body = response.get_data()
+
+            target = os.path.join(output, name)
+            write_file(target, body)
+            write_file(f"{target}.gz", gzip.compress(body, 9, mtime=0))
+            if compression.brotli is not None:
+                write_file(f"{target}.br", compression.brotli.compress(body))
+
+            pages[name] = {
+                "path": path,
+                "language": language,
+                "inputs": fingerprint,
+                "sha256": hashlib.sha256(body).hexdigest(),
+            }
+            counts["written"] += 1
+
+    for name in previous.keys() - pages.keys():
+        for suffix in ("", ".gz", ".br"):
+            try:
+                os.remove(os.path.join(output, name + suffix))
+            except FileNotFoundError:
+                pass
+        counts["removed"] += 1
+
+    write_file(
+        manifest_path,
+        json.dumps({"pages": pages}, indent=2, sort_keys=True).encode("utf-8"),
+    )
+    return counts
+
+
+def public_pages():
+    """Lists the public pages of the main blueprint.
+
+    Yields:
+        tuple: The URL path of each page and a fingerprint of its inputs.
+    """
+    release = release_modified()
+    directory = directory_fingerprints()
+    whole_directory = hashlib.sha256(
+        json.dumps(sorted(directory.items())).encode("utf-8")
+    ).hexdigest()
+
+    for rule in sorted(
+        current_app.url_map.iter_rules(), key=lambda rule: rule.rule
+    ):
+        view = current_app.view_functions[rule.endpoint]
+        if (
+            not rule.endpoint.startswith("main.")
+            or "GET" not in rule.methods
+            or not hasattr(view, "page_state")
+        ):
+            continue
+
+        if not rule.arguments:
+            data = whole_directory if view.page_state else ""
+            yield rule.rule, f"{release}|{data}"
+        elif rule.arguments == {"organization_id"}:
+            for organization_id, updated_at in sorted(directory.items()):
+                path = rule.build({"organization_id": organization_id})[1]
+                yield path, f"{release}|{updated_at}"
+
+
+def directory_fingerprints():
+    """Returns fingerprints of the rows of the organization directory.
+
+    Returns:
+        dict: The IDs of the listed organizations mapped to when their row
+        was last rebuilt.
+    """
+    rows = db.session.query(
+        OrganizationDirectory.organization_id,
+        OrganizationDirectory.updated_at,
+    )
+    return {
+        organization_id: str(updated_at) for organization_id, updated_at in rows
+    }
+
+
+def page_file(language, path):
+    """Returns the file a page is exported to.
+
+    Parameters:
+        language (str): The language of the page.
+        path (str): The URL path of the page, e.g. "/legal/tps_info".
+
+    Returns:
+        str: The file, relative to the output directory, e.g.
+        "es/legal/tps_info/index.html".
+    """
+    return "/".join(
+        part for part in (language, path.strip("/"), "index.html") if part
+    )
+
+
+def write_file(path, data):
+    """Writes a file atomically, so it is never served half written.
+
+    Parameters:
+        path (str): The path of the file.
+        data (bytes): The content of the file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
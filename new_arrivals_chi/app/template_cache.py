@@ -0,0 +1,69 @@
+"""Project: new_arrivals_chi.
+
+File name: template_cache.py
+Associated Files:
+   main.py, commands.py.
+
+This file contains the persistent cache of compiled templates. Jinja compiles
+every template to Python bytecode the first time a worker renders it, which
+makes the first requests after a restart slow. With a bytecode cache, the
+compiled code is stored in a directory shared by all workers and reused
+across restarts; templates are still checked against their source, so an
+edited template is compiled again. precompile_templates fills the cache at
+deploy time, before any worker starts.
+
+Methods:
+    * init_bytecode_cache - Configures the bytecode cache of an application.
+    * precompile_templates - Compiles every template into the bytecode cache.
+"""
+
+import os
+from jinja2 import FileSystemBytecodeCache, TemplateSyntaxError
+
+
+def init_bytecode_cache(app):
+    """Configures the bytecode cache of a Flask application's templates.
+
+    The cache is stored in the JINJA_BYTECODE_CACHE_DIR directory of the
+    application's config; the cache is disabled if it is empty.
+
+    Parameters:
+        app (Flask): The application whose templates are cached.
+    """
+    directory = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if not directory:
+        app.jinja_env.bytecode_cache = None
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(app):
+    """Compiles every template of an application into its bytecode cache.
+
+    Templates whose cached bytecode is up to date are left as they are.
+
+    Parameters:
+        app (Flask): The application whose templates are compiled.
+
+    Returns:
+        tuple: The names of the compiled templates, and the templates that
+        failed to compile mapped to their syntax error.
+    """
+    environment = app.jinja_env
+    if environment.bytecode_cache is None:
+        raise RuntimeError("The template bytecode cache is disabled.")
+
+    compiled = []
+    failed = {}
+    for name in environment.list_templates(extensions=["html"]):
+        try:
+            # Loading through the loader, rather than get_template, skips the
+            # in-memory template cache so the bytecode cache is consulted
+            environment.loader.load(environment, name, environment.globals)
+        except TemplateSyntaxError as error:
+            failed[name] = error
+        else:
+            compiled.append(name)
+    return compiled, failed
@@ -24,19 +24,42 @@ Methods:
     * validate_neighborhood - Validates the neighborhood name.
     * validate_hours - Validates the operating hours.
     * setup_logger - Creates a logger for recording the output of the script.
+    * create_temp_pwd - Creates a temporary password for a new user.
+    * encode_cursor - Encodes a (name, id) keyset position as a URL token.
+    * decode_cursor - Decodes a URL token back into a (name, id) position.
+    * parse_hours_window - Parses an "HH:MM-HH:MM" hours filter.
+    * parse_search_terms - Splits a full-text search query into words.
+    * load_zip_centroids - Loads the offline ZIP code gazetteer.
+    * zip_coordinates - Looks up the coordinates of a ZIP code.
+    * parse_coordinates - Parses a "latitude,longitude" location filter.
+    * normalize_language - Maps a requested language to a supported one.
+    * format_time_for_locale - Formats a time of day for a language.
+    * format_local_time - Template filter formatting a time of day for the
+      language of the request.
+    * buffer_chunks - Joins the chunks of a stream into larger ones.
 """
 
+import base64
+import binascii
+import csv
+import json
 import logging
 import re
 import os
 import bleach
 import us
-from datetime import datetime
+from datetime import datetime, time
+from functools import lru_cache
 from password_strength import PasswordPolicy
 from flask_bcrypt import Bcrypt
 
-from flask import current_app
-
+from babel import dates
+from flask import current_app, request
+from new_arrivals_chi.app.constants import (
+    DEFAULT_LANGUAGE,
+    KEY_LANGUAGE,
+    LANGUAGES,
+)
 
 bcrypt = Bcrypt()
 
@@ -450,3 +473,222 @@ def create_temp_pwd(email, phone):
     temp_pwd = email_string + phone_digits
 
     return temp_pwd
+
+
+def encode_cursor(name, organization_id):
+    """Encodes a keyset pagination position as an opaque URL-safe token.
+
+    Parameters:
+        name (str): Name of the last organization on the current page.
+        organization_id (int): ID of the last organization on the current page.
+
+    Returns:
+        str: The URL-safe token for the position.
+    """
+    payload = json.dumps([name, organization_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token):
+    """Decodes a token created by encode_cursor.
+
+    Parameters:
+        token (str): The token received in the request.
+
+    Returns:
+        tuple: The (name, organization_id) position, or None if the token is
+        missing or malformed.
+    """
+    if not token:
+        return None
+
+    try:
+        name, organization_id = json.loads(
+            base64.urlsafe_b64decode(token.encode("ascii"))
+        )
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+    if not isinstance(name, str) or not isinstance(organization_id, int):
+        return None
+    return name, organization_id
+
+
+def parse_hours_window(value):
+    """Parses an hours filter in "HH:MM-HH:MM" format.
+
+    Parameters:
+        value (str): The hours filter received in the request.
+
+    Returns:
+        tuple: The (start, end) times of the window, or None if the value is
+        missing, malformed or the window does not end after it starts.
+    """
+    if not value:
+        return None
+
+    try:
+        start, end = (time.fromisoformat(part) for part in value.split("-"))
+    except ValueError:
+        return None
+
+    if start >= end:
+        return None
+    return start, end
+
+
+def parse_search_terms(value, max_terms=10):
+    """Splits a full-text search query into lowercase words.
+
+    Only letters, digits and underscores are kept, so the words can be
+    embedded in FTS5 and tsquery expressions without escaping.
+
+    Parameters:
+        value (str): The search query received in the request.
+        max_terms (int): Maximum number of words kept.
+
+    Returns:
+        list: The words of the query, in order.
+    """
+    if not value:
+        return []
+    return re.findall(r"\w+", value.lower())[:max_terms]
+
+
+@lru_cache(maxsize=1)
+def load_zip_centroids():
+    """Loads the offline ZIP code gazetteer from the static folder.
+
+    zip_centroids.csv holds the centroid of every Illinois ZIP code, taken
+    from the zipcodes package (MIT licensed), so locations are placed on the
+    map without calling a geocoding service.
+
+    Returns:
+        dict: ZIP codes mapped to (latitude, longitude) tuples.
+    """
+    path = os.path.join(
+        os.path.dirname(__file__), "static", "zip_centroids.csv"
+    )
+    with open(path, newline="") as file:
+        return {
+            row["zip_code"]: (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(file)
+        }
+
+
+def zip_coordinates(zip_code):
+    """Looks up the coordinates of a ZIP code in the offline gazetteer.
+
+    Parameters:
+        zip_code (str): A five digit ZIP code, or ZIP+4.
+
+    Returns:
+        tuple: The (latitude, longitude) of the ZIP code's centroid, or None
+        if the ZIP code is not in the gazetteer.
+    """
+    if not zip_code:
+        return None
+    return load_zip_centroids().get(zip_code[:5])
+
+
+def parse_coordinates(value):
+    """Parses a location filter in "latitude,longitude" format.
+
+    Parameters:
+        value (str): The location received in the request.
+
+    Returns:
+        tuple: The (latitude, longitude) in degrees, or None if the value is
+        missing, malformed or out of range.
+    """
+    if not value:
+        return None
+
+    try:
+        latitude, longitude = (float(part) for part in value.split(","))
+    except ValueError:
+        return None
+
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def normalize_language(value):
+    """Maps a requested language to one the app is translated into.
+
+    Parameters:
+        value (str): The language received in the request.
+
+    Returns:
+        str: The language if it is supported, else the default language.
+    """
+    if value in LANGUAGES:
+        return value
+    return DEFAULT_LANGUAGE
+
+
+@lru_cache(maxsize=4096)
+def format_time_for_locale(value, language):
+    """Formats a time of day the way a language writes it.
+
+    E.g. "9:30 AM" in English and "9:30" in Spanish. There are at most a few
+    thousand (time, language) pairs, so every one is only formatted once.
+
+    Parameters:
+        value (datetime.time): The time to be formatted.
+        language (str): A supported language.
+
+    Returns:
+        str: The formatted time.
+    """
+    return dates.format_time(value, format="short", locale=language)
+
+
+def format_local_time(value):
+    """Formats a time of day for the language of the current request.
+
+    Registered as the format_time template filter. The language is read from
+    the request, like main.get_locale, rather than from flask_babel, which
+    keeps the first locale for the whole application context.
+
+    Parameters:
+        value (datetime.time): The time to be formatted.
+
+    Returns:
+        str: The formatted time.
+    """
+    language = normalize_language(request.args.get(KEY_LANGUAGE))
+    return format_time_for_locale(value, language)
+
+
+def buffer_chunks(chunks, size):
+    """Joins the chunks of a stream into chunks of at least size characters.
+
+    Jinja yields a stream of small strings, each of which would otherwise be
+    written, and flushed by the compressor, separately.
+
+    Parameters:
+        chunks (iterable): The strings of the stream.
+        size (int): The minimum length of a joined chunk; the last one may be
+            shorter.
+
+    Yields:
+        str: The joined chunks. Closing the generator closes chunks.
+    """
+    buffer = []
+    length = 0
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                yield "".join(buffer)
+                buffer = []
+                length = 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
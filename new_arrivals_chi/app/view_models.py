@@ -0,0 +1,193 @@
+"""Project: new_arrivals_chi.
+
+File name: view_models.py
+Associated Files:
+   data_handler.py, api_routes.py, render_cache.py.
+
+This file contains the read-only views of an organization built by
+data_handler.py for pages, the API and the caches. Views are frozen,
+slotted dataclasses: they take less memory than the dictionaries they
+replace, and are safe to share through process-local caches.
+
+Views keep the dictionary-style access of those dictionaries, so
+view["name"] and Jinja's organization.name and service['service'] all work,
+and each one converts itself to a plain dictionary for JSON (see
+api_routes.json_default).
+
+Classes:
+    * View - Base class giving views dictionary-style access.
+    * HoursSlot - One opening interval of a day.
+    * DateView - One date of a service.
+    * LocationView - One location of a service.
+    * ServiceView - One service offered by an organization.
+    * OrganizationView - An organization with its hours and services.
+
+Methods:
+    * field_keys - Returns the keys of the fields of a view class.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import date, time
+from functools import lru_cache
+from types import MappingProxyType
+
+
+class View:
+    """Base class giving views dictionary-style access to their fields.
+
+    Fields are read under their names, except those listed in renamed_keys,
+    which keep the key of the dictionary the view replaces.
+    """
+
+    __slots__ = ()
+
+    # Field names mapped to the keys they are read under, where they differ
+    renamed_keys = {}
+
+    def __getitem__(self, key):
+        """Returns a field, like a dictionary's item.
+
+        Raises:
+            KeyError: If the view has no such key.
+        """
+        return getattr(self, field_keys(type(self))[key])
+
+    def __contains__(self, key):
+        """Checks whether the view has a key."""
+        return key in field_keys(type(self))
+
+    def get(self, key, default=None):
+        """Returns a field, or default if the view has no such key."""
+        name = field_keys(type(self)).get(key)
+        if name is None:
+            return default
+        return getattr(self, name)
+
+    def keys(self):
+        """Returns the keys of the fields, so dict(view) works."""
+        return tuple(field_keys(type(self)))
+
+    def to_dict(self):
+        """Converts the view to a dictionary, without converting nested views.
+
+        json.dumps converts nested views through its default function, so a
+        view is serialized without copying it first.
+
+        Returns:
+            dict: The fields of the view under their keys, in declaration
+            order.
+        """
+        return {
+            key: getattr(self, name)
+            for key, name in field_keys(type(self)).items()
+        }
+
+
+@lru_cache(maxsize=None)
+def field_keys(view_class):
+    """Returns the keys of the fields of a view class.
+
+    Parameters:
+        view_class (type): A dataclass derived from View.
+
+    Returns:
+        MappingProxyType: The keys mapped to the field names, in declaration
+        order.
+    """
+    return MappingProxyType(
+        {
+            view_class.renamed_keys.get(field.name, field.name): field.name
+            for field in fields(view_class)
+        }
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class HoursSlot(View):
+    """One interval during which an organization is open on a day."""
+
+    open: time
+    close: time
+
+
+@dataclass(frozen=True, slots=True)
+class DateView(View):
+    """One date on which a service is offered.
+
+    repeat is the date's repeat rule, e.g. "every week".
+    """
+
+    date: date
+    start_time: time
+    end_time: time
+    repeat: str
+
+
+@dataclass(frozen=True, slots=True)
+class LocationView(View):
+    """One location at which a service is offered.
+
+    The street address is read as location["street address"], the key it
+    always had in the API, and as location.street_address.
+    """
+
+    renamed_keys = {"street_address": "street address"}
+
+    street_address: str
+    zip_code: str
+    city: str
+    state: str
+    primary_location: bool
+    neighborhood: str
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceView(View):
+    """One service offered by an organization.
+
+    Services read from the directory read model carry no dates and
+    locations.
+    """
+
+    category: str
+    service: str
+    access: str
+    service_note: str
+    dates: tuple = ()
+    locations: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class OrganizationView(View):
+    """An organization with its primary location, hours and services.
+
+    Hours map each day of the week, from "monday" to "sunday", to a tuple of
+    its HoursSlots ordered by opening time. The mapping is read-only, so a
+    view shared through a cache cannot be changed by one of its readers.
+    """
+
+    name: str
+    phone: str
+    languages: tuple
+    service: tuple
+    hours: Mapping
+    street_address: str
+    zip_code: str
+    city: str
+    state: str
+    primary_location: bool
+    neighborhood: str
+    latitude: float
+    longitude: float
+    id: int
+
+    def __post_init__(self):
+        """Freezes the hours into a read-only mapping of tuples."""
+        object.__setattr__(
+            self,
+            "hours",
+            MappingProxyType(
+                {day: tuple(slots) for day, slots in self.hours.items()}
+            ),
+        )
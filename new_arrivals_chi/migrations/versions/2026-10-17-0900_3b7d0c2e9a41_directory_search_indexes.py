@@ -0,0 +1,37 @@
+"""directory search indexes.
+
+Revision ID: 3b7d0c2e9a41
+Revises: feba3a15cf10
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b7d0c2e9a41"
+down_revision = "feba3a15cf10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("organizations", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_organizations_name_id", ["name", "id"], unique=False
+        )
+
+    with op.batch_alter_table("locations", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_locations_neighborhood"),
+            ["neighborhood"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("locations", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_locations_neighborhood"))
+
+    with op.batch_alter_table("organizations", schema=None) as batch_op:
+        batch_op.drop_index("ix_organizations_name_id")
@@ -0,0 +1,71 @@
+"""organization directory read model.
+
+Revision ID: 8f2a6d41c7e5
+Revises: 3b7d0c2e9a41
+Create Date: 2026-10-17 10:00:00.000000
+
+Run `flask rebuild-directory` (or `make rebuild_directory`) after upgrading to
+fill the table from the existing organizations.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "8f2a6d41c7e5"
+down_revision = "3b7d0c2e9a41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "organization_directory",
+        sa.Column("organization_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=260), nullable=False),
+        sa.Column("phone", sa.String(length=25), nullable=False),
+        sa.Column("street_address", sa.String(length=255), nullable=False),
+        sa.Column("zip_code", sa.String(length=10), nullable=False),
+        sa.Column("neighborhood", sa.String(length=100), nullable=False),
+        sa.Column("city", sa.String(length=100), nullable=False),
+        sa.Column("state", sa.String(length=50), nullable=False),
+        sa.Column("service_names", sa.Text(), nullable=False),
+        sa.Column("service_categories", sa.Text(), nullable=False),
+        sa.Column("languages", sa.JSON(), nullable=False),
+        sa.Column("services", sa.JSON(), nullable=False),
+        sa.Column("hours", sa.JSON(), nullable=False),
+        sa.Column("hours_summary", sa.Text(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"]),
+        sa.PrimaryKeyConstraint("organization_id"),
+    )
+    with op.batch_alter_table(
+        "organization_directory", schema=None
+    ) as batch_op:
+        batch_op.create_index(
+            "ix_organization_directory_name_id",
+            ["name", "organization_id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_organization_directory_neighborhood"),
+            ["neighborhood"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table(
+        "organization_directory", schema=None
+    ) as batch_op:
+        batch_op.drop_index(
+            batch_op.f("ix_organization_directory_neighborhood")
+        )
+        batch_op.drop_index("ix_organization_directory_name_id")
+
+    op.drop_table("organization_directory")
@@ -0,0 +1,95 @@
+"""organization full-text search.
+
+Revision ID: c41e7b9d2f60
+Revises: 8f2a6d41c7e5
+Create Date: 2026-10-17 11:00:00.000000
+
+Run `flask rebuild-directory` (or `make rebuild_directory`) after upgrading to
+fill service_notes for the existing organizations.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c41e7b9d2f60"
+down_revision = "8f2a6d41c7e5"
+branch_labels = None
+depends_on = None
+
+POSTGRES_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "service_names || ' ' || service_categories), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, service_notes), 'C')"
+)
+
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS organization_search USING fts5("
+    "name, service_names, service_categories, service_notes, "
+    "content='organization_directory', content_rowid='organization_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_insert "
+    "AFTER INSERT ON organization_directory BEGIN "
+    "INSERT INTO organization_search(rowid, name, service_names, "
+    "service_categories, service_notes) VALUES (new.organization_id, "
+    "new.name, new.service_names, new.service_categories, "
+    "new.service_notes); END",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_delete "
+    "AFTER DELETE ON organization_directory BEGIN "
+    "INSERT INTO organization_search(organization_search, rowid, name, "
+    "service_names, service_categories, service_notes) VALUES ('delete', "
+    "old.organization_id, old.name, old.service_names, "
+    "old.service_categories, old.service_notes); END",
+    "CREATE TRIGGER IF NOT EXISTS organization_search_update "
+    "AFTER UPDATE ON organization_directory BEGIN "
+    "INSERT INTO organization_search(organization_search, rowid, name, "
+    "service_names, service_categories, service_notes) VALUES ('delete', "
+    "old.organization_id, old.name, old.service_names, "
+    "old.service_categories, old.service_notes); "
+    "INSERT INTO organization_search(rowid, name, service_names, "
+    "service_categories, service_notes) VALUES (new.organization_id, "
+    "new.name, new.service_names, new.service_categories, "
+    "new.service_notes); END",
+    "INSERT INTO organization_search(organization_search) VALUES ('rebuild')",
+)
+
+
+def upgrade():
+    with op.batch_alter_table(
+        "organization_directory", schema=None
+    ) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "service_notes",
+                sa.Text(),
+                server_default="",
+                nullable=False,
+            )
+        )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_organization_directory_search "
+            "ON organization_directory "
+            f"USING gin (({POSTGRES_SEARCH_DOCUMENT}))"
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_organization_directory_search")
+    elif dialect == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS organization_search_{trigger}")
+        op.execute("DROP TABLE IF EXISTS organization_search")
+
+    with op.batch_alter_table(
+        "organization_directory", schema=None
+    ) as batch_op:
+        batch_op.drop_column("service_notes")
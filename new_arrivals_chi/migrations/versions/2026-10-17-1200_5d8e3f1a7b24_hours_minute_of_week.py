@@ -0,0 +1,82 @@
+"""hours minute of week ranges.
+
+Revision ID: 5d8e3f1a7b24
+Revises: c41e7b9d2f60
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5d8e3f1a7b24"
+down_revision = "c41e7b9d2f60"
+branch_labels = None
+depends_on = None
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def upgrade():
+    with op.batch_alter_table("hours", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("start_minute", sa.Integer(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("end_minute", sa.Integer(), nullable=True)
+        )
+
+    # Minutes since Monday 00:00 for the existing rows
+    connection = op.get_bind()
+    hours = sa.table(
+        "hours",
+        sa.column("id", sa.Integer),
+        sa.column("day_of_week", sa.Integer),
+        sa.column("opening_time", sa.Time),
+        sa.column("closing_time", sa.Time),
+        sa.column("start_minute", sa.Integer),
+        sa.column("end_minute", sa.Integer),
+    )
+    rows = connection.execute(
+        sa.select(
+            hours.c.id,
+            hours.c.day_of_week,
+            hours.c.opening_time,
+            hours.c.closing_time,
+        )
+    ).all()
+    for row in rows:
+        day_start = (row.day_of_week - 1) * MINUTES_PER_DAY
+        connection.execute(
+            hours.update()
+            .where(hours.c.id == row.id)
+            .values(
+                start_minute=day_start
+                + row.opening_time.hour * 60
+                + row.opening_time.minute,
+                end_minute=day_start
+                + row.closing_time.hour * 60
+                + row.closing_time.minute,
+            )
+        )
+
+    with op.batch_alter_table("hours", schema=None) as batch_op:
+        batch_op.alter_column(
+            "start_minute", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.alter_column(
+            "end_minute", existing_type=sa.Integer(), nullable=False
+        )
+        batch_op.create_index(
+            "ix_hours_start_minute_end_minute",
+            ["start_minute", "end_minute"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("hours", schema=None) as batch_op:
+        batch_op.drop_index("ix_hours_start_minute_end_minute")
+        batch_op.drop_column("end_minute")
+        batch_op.drop_column("start_minute")
@@ -0,0 +1,97 @@
+"""location coordinates.
+
+Revision ID: 9b7c2e4d6a13
+Revises: 5d8e3f1a7b24
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+import csv
+import os
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9b7c2e4d6a13"
+down_revision = "5d8e3f1a7b24"
+branch_labels = None
+depends_on = None
+
+ZIP_CENTROIDS = os.path.join(
+    os.path.dirname(__file__), "..", "..", "app", "static", "zip_centroids.csv"
+)
+
+
+def upgrade():
+    for table in ("locations", "organization_directory"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(
+                sa.Column("latitude", sa.Float(), nullable=True)
+            )
+            batch_op.add_column(
+                sa.Column("longitude", sa.Float(), nullable=True)
+            )
+
+    # Place the existing locations at their ZIP code's centroid
+    with open(ZIP_CENTROIDS, newline="") as file:
+        centroids = {
+            row["zip_code"]: (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(file)
+        }
+
+    connection = op.get_bind()
+    locations = sa.table(
+        "locations",
+        sa.column("id", sa.Integer),
+        sa.column("zip_code", sa.String),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+    )
+    rows = connection.execute(
+        sa.select(locations.c.id, locations.c.zip_code)
+    ).all()
+    for row in rows:
+        centroid = centroids.get((row.zip_code or "")[:5])
+        if centroid is None:
+            continue
+        connection.execute(
+            locations.update()
+            .where(locations.c.id == row.id)
+            .values(latitude=centroid[0], longitude=centroid[1])
+        )
+
+    # Copy them to the read model rows of the organizations they belong to
+    organizations = sa.table(
+        "organizations",
+        sa.column("id", sa.Integer),
+        sa.column("location_id", sa.Integer),
+    )
+    directory = sa.table(
+        "organization_directory",
+        sa.column("organization_id", sa.Integer),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+    )
+    for column in ("latitude", "longitude"):
+        connection.execute(
+            directory.update().values(
+                {
+                    column: sa.select(locations.c[column])
+                    .select_from(
+                        organizations.join(
+                            locations,
+                            organizations.c.location_id == locations.c.id,
+                        )
+                    )
+                    .where(organizations.c.id == directory.c.organization_id)
+                    .scalar_subquery()
+                }
+            )
+        )
+
+
+def downgrade():
+    for table in ("organization_directory", "locations"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column("longitude")
+            batch_op.drop_column("latitude")
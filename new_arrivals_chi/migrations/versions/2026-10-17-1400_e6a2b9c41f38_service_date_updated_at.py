@@ -0,0 +1,33 @@
+"""service date updated_at.
+
+Revision ID: e6a2b9c41f38
+Revises: 9b7c2e4d6a13
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e6a2b9c41f38"
+down_revision = "9b7c2e4d6a13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("service_dates", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("service_dates", schema=None) as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,33 @@
+"""drop directory hours_summary.
+
+Revision ID: a7d3f5c81e02
+Revises: e6a2b9c41f38
+Create Date: 2026-10-17 15:00:00.000000
+
+Hours are formatted for the language of each request, so the English summary
+precomputed in the read model is no longer read. The column is dropped in
+place rather than in batch mode, so that SQLite keeps the organization_search
+triggers on organization_directory.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a7d3f5c81e02"
+down_revision = "e6a2b9c41f38"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_column("organization_directory", "hours_summary")
+
+
+def downgrade():
+    op.add_column(
+        "organization_directory",
+        sa.Column(
+            "hours_summary", sa.Text(), server_default="", nullable=False
+        ),
+    )
@@ -0,0 +1,66 @@
+"""Project: New Arrivals Chi.
+
+File name: api_test.py
+
+Associated Files: api_routes.py, data_handler.py
+
+This test suite verifies the read-only public API routes.
+
+Methods:
+   * test_organizations_ndjson
+   * test_organizations_json_array
+"""
+
+import json
+from http import HTTPStatus
+from new_arrivals_chi.app.api_routes import json_default
+from new_arrivals_chi.app.data_handler import extract_organization
+
+
+def test_organizations_ndjson(client, directory_organizations, setup_logger):
+    """Test the directory streams one organization per line."""
+    logger = setup_logger("test_organizations_ndjson")
+    try:
+        response = client.get("/api/organizations")
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed, "Response was not streamed"
+
+        lines = response.get_data(as_text=True).splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [record["name"] for record in records] == [
+            "Alpha Aid",
+            "Beta Health",
+            "Gamma Legal",
+        ], "Unlisted organizations were streamed"
+
+        expected = json.loads(
+            json.dumps(
+                extract_organization(directory_organizations["Alpha Aid"]),
+                default=json_default,
+            )
+        )
+        assert records[0] == expected, "Fields differ from the org page"
+        assert records[0]["hours"]["monday"][0]["open"] == "09:00:00"
+        logger.info("Directory streamed as NDJSON.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_organizations_json_array(
+    client, directory_organizations, setup_logger
+):
+    """Test the directory streams as a single JSON array on request."""
+    logger = setup_logger("test_organizations_json_array")
+    try:
+        response = client.get("/api/organizations?format=json")
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "application/json"
+
+        records = json.loads(response.get_data(as_text=True))
+        assert len(records) == 3, "Wrong number of organizations"
+        logger.info("Directory streamed as a JSON array.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
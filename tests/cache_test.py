@@ -0,0 +1,124 @@
+"""Project: New Arrivals Chi.
+
+File name: cache_test.py
+
+Associated Files: cache.py, data_handler.py, authorize_routes.py
+
+This test suite verifies the process-local caches on the public read path and
+that writes invalidate them.
+
+Methods:
+   * test_lru_cache_evicts_least_recently_used
+   * test_lru_cache_expires_entries
+   * test_extract_organization_cached_until_written
+   * test_cache_stats_route
+"""
+
+from http import HTTPStatus
+from new_arrivals_chi.app.cache import LRUCache
+from new_arrivals_chi.app.database import db, User
+from new_arrivals_chi.app.data_handler import (
+    bcrypt,
+    change_organization_status,
+    extract_organization,
+    organization_cache,
+)
+
+
+def test_lru_cache_evicts_least_recently_used(setup_logger):
+    """Test a full cache evicts the least recently used entry."""
+    logger = setup_logger("test_lru_cache_evicts_least_recently_used")
+    try:
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None, "Most recently used entry evicted"
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+        logger.info("LRU eviction works.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_lru_cache_expires_entries(setup_logger):
+    """Test entries expire once their time-to-live has passed."""
+    logger = setup_logger("test_lru_cache_expires_entries")
+    try:
+        now = [0.0]
+        cache = LRUCache(maxsize=10, ttl=5, clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 4.9
+        assert cache.get("a") == 1
+        now[0] = 5.0
+        assert cache.get("a") is None, "Entry outlived its TTL"
+        assert cache.stats()["expirations"] == 1
+        logger.info("TTL expiry works.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_extract_organization_cached_until_written(
+    client, directory_organizations, setup_logger
+):
+    """Test organization dictionaries are cached and writes invalidate them."""
+    logger = setup_logger("test_extract_organization_cached_until_written")
+    try:
+        org_id = directory_organizations["Beta Health"]
+        first = extract_organization(org_id)
+        hits = organization_cache.stats()["hits"]
+
+        assert extract_organization(org_id) is first, "Second read missed"
+        assert organization_cache.stats()["hits"] == hits + 1
+
+        change_organization_status(org_id)
+        refreshed = extract_organization(org_id)
+        assert refreshed is not first, "Write did not invalidate the cache"
+        assert refreshed == first
+        logger.info("Organization cache invalidated by writes.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_cache_stats_route(client, setup_logger):
+    """Test admins can read the cache counters."""
+    logger = setup_logger("test_cache_stats_route")
+    admin = User(
+        email="admin@example.com",
+        role="admin",
+        password=bcrypt.generate_password_hash("AdminP@ss1!").decode("utf-8"),
+    )
+    db.session.add(admin)
+    db.session.commit()
+    try:
+        client.post(
+            "/login",
+            data={"email": "admin@example.com", "password": "AdminP@ss1!"},
+        )
+        response = client.get("/admin/cache_stats")
+        assert response.status_code == HTTPStatus.OK
+        stats = response.get_json()
+        assert set(stats) == {
+            "organization",
+            "render",
+            "fragment",
+            "calendar",
+            "schedule",
+            "compression",
+        }
+        for counters in stats.values():
+            assert set(counters) >= {"hits", "misses", "evictions", "size"}
+        logger.info("Cache stats reported to admin.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        client.get("/logout")
+        db.session.delete(admin)
+        db.session.commit()
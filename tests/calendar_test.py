@@ -0,0 +1,223 @@
+"""Project: New Arrivals Chi.
+
+File name: calendar_test.py
+
+Associated Files: api_routes.py, ical.py, occurrences.py
+
+This test suite verifies the calendar feeds of upcoming service occurrences.
+
+Methods:
+   * test_calendar_ndjson
+   * test_calendar_not_modified
+   * test_calendar_follows_edited_dates
+   * test_calendar_rejects_bad_windows
+   * test_calendar_ics
+   * test_fold_line
+"""
+
+import json
+from datetime import date, datetime, time, timezone
+from http import HTTPStatus
+from new_arrivals_chi.app.database import db, Service, ServiceDate
+from new_arrivals_chi.app.ical import escape_text, fold_line
+
+WEEK = {"start": "2026-10-19", "end": "2026-10-25"}
+
+
+def test_calendar_ndjson(client, directory_organizations, setup_logger):
+    """Test the calendar streams one occurrence per line, with filters."""
+    logger = setup_logger("test_calendar_ndjson")
+    try:
+        response = client.get("/api/calendar", query_string=WEEK)
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed, "Response was not streamed"
+
+        records = [
+            json.loads(line)
+            for line in response.get_data(as_text=True).splitlines()
+        ]
+        assert len(records) == 4
+        assert records[0]["date"] == "2026-10-19"
+        assert records[0]["start_time"] == "09:00:00"
+
+        response = client.get(
+            "/api/calendar",
+            query_string={
+                **WEEK,
+                "organization": directory_organizations["Beta Health"],
+                "format": "json",
+            },
+        )
+        records = json.loads(response.get_data(as_text=True))
+        assert [record["service"] for record in records] == [
+            "Counseling",
+            "Vaccinations",
+        ]
+        logger.info("Calendar streamed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_calendar_not_modified(client, directory_organizations, setup_logger):
+    """Test the ETag changes with the service dates."""
+    logger = setup_logger("test_calendar_not_modified")
+    service_date = None
+    try:
+        response = client.get("/api/calendar", query_string=WEEK)
+        response.get_data()
+        etag = response.headers["ETag"]
+        assert etag.startswith("W/")
+
+        response = client.get(
+            "/api/calendar",
+            query_string=WEEK,
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag, "Validator not repeated"
+        assert response.get_data() == b""
+
+        other = client.get(
+            "/api/calendar", query_string={**WEEK, "category": "Food"}
+        )
+        other.get_data()
+        assert other.headers["ETag"] != etag, "Filters share an ETag"
+
+        service_date = ServiceDate(
+            date=date(2026, 10, 20),
+            start_time=time(14, 0),
+            end_time=time(15, 0),
+            repeat="every week",
+        )
+        service_date.services.append(Service.query.first())
+        db.session.add(service_date)
+        db.session.commit()
+        response = client.get(
+            "/api/calendar",
+            query_string=WEEK,
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.OK, "Stale ETag matched"
+        assert len(response.get_data(as_text=True).splitlines()) == 5
+        logger.info("Calendar ETag followed service dates.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        if service_date is not None:
+            service_date.services.clear()
+            db.session.delete(service_date)
+            db.session.commit()
+
+
+def test_calendar_follows_edited_dates(
+    client, directory_organizations, setup_logger
+):
+    """Test the ETag changes when a service date is edited in place."""
+    logger = setup_logger("test_calendar_follows_edited_dates")
+    # Dates written earlier, so the edit below gets a later updated_at
+    ServiceDate.query.update(
+        {"updated_at": datetime(2024, 6, 1, tzinfo=timezone.utc)}
+    )
+    db.session.commit()
+    try:
+        response = client.get("/api/calendar", query_string=WEEK)
+        response.get_data()
+        etag = response.headers["ETag"]
+
+        service_date = ServiceDate.query.order_by(ServiceDate.id).first()
+        service_date.start_time = time(8, 0)
+        db.session.commit()
+
+        response = client.get(
+            "/api/calendar",
+            query_string=WEEK,
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.OK, "Stale ETag matched"
+        records = [
+            json.loads(line)
+            for line in response.get_data(as_text=True).splitlines()
+        ]
+        assert "08:00:00" in [record["start_time"] for record in records]
+        logger.info("Calendar ETag followed an edited date.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_calendar_rejects_bad_windows(client, setup_logger):
+    """Test malformed and oversized windows are rejected."""
+    logger = setup_logger("test_calendar_rejects_bad_windows")
+    try:
+        for query_string in (
+            {"start": "tomorrow"},
+            {"start": "2026-10-25", "end": "2026-10-19"},
+            {"start": "2026-01-01", "end": "2027-06-01"},
+            {"organization": "alpha"},
+        ):
+            response = client.get("/api/calendar", query_string=query_string)
+            assert (
+                response.status_code == HTTPStatus.BAD_REQUEST
+            ), f"{query_string} accepted"
+        assert client.get("/api/calendar").status_code == HTTPStatus.OK
+        logger.info("Bad windows rejected.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_calendar_ics(client, directory_organizations, setup_logger):
+    """Test the iCalendar feed holds one event per occurrence."""
+    logger = setup_logger("test_calendar_ics")
+    try:
+        response = client.get(
+            "/api/calendar.ics", query_string={**WEEK, "category": "Food"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "text/calendar"
+        etag = response.headers["ETag"]
+        body = response.get_data(as_text=True)
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert body.endswith("END:VCALENDAR\r\n")
+        assert body.count("BEGIN:VEVENT") == 1
+        assert "DTSTART;TZID=America/Chicago:20261019T090000" in body
+        assert "SUMMARY:Hot Meals - Alpha Aid" in body
+
+        response = client.get(
+            "/api/calendar.ics",
+            query_string={**WEEK, "category": "Food"},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag, "Validator not repeated"
+        logger.info("iCalendar feed generated.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_fold_line(setup_logger):
+    """Test long lines are folded at 75 octets without splitting characters."""
+    logger = setup_logger("test_fold_line")
+    try:
+        assert fold_line("SUMMARY:short") == "SUMMARY:short\r\n"
+
+        line = "SUMMARY:" + "á" * 80
+        folded = fold_line(line)
+        physical = folded.split("\r\n")[:-1]
+        assert all(len(part.encode("utf-8")) <= 75 for part in physical)
+        assert (
+            "".join(
+                part[1:] if index else part
+                for index, part in enumerate(physical)
+            )
+            == line
+        ), "Unfolding does not restore the line"
+        assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+        logger.info("Lines folded.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
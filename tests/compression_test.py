@@ -0,0 +1,140 @@
+"""Project: New Arrivals Chi.
+
+File name: compression_test.py
+
+Associated Files: compression.py, main.py
+
+This test suite verifies the compression of responses.
+
+Methods:
+   * test_page_compressed
+   * test_compression_not_accepted
+   * test_compression_rules
+   * test_compressed_pages_cached
+   * test_stream_compressed
+"""
+
+import gzip
+import json
+from http import HTTPStatus
+from flask import Response
+from new_arrivals_chi.app.compression import (
+    compress_response,
+    compression_cache,
+)
+
+GZIP = {"Accept-Encoding": "gzip, deflate"}
+
+
+def test_page_compressed(anonymous_client, setup_logger):
+    """Test pages are sent gzipped to clients that accept it."""
+    logger = setup_logger("test_page_compressed")
+    try:
+        plain = anonymous_client.get("/legal")
+        response = anonymous_client.get("/legal", headers=GZIP)
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.vary
+        assert gzip.decompress(response.data) == plain.data
+        assert len(response.data) < len(plain.data)
+        assert response.content_length == len(response.data)
+
+        # Validators hold for every coding of the page
+        response = anonymous_client.get(
+            "/legal",
+            headers={**GZIP, "If-None-Match": plain.headers["ETag"]},
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert "Content-Encoding" not in response.headers
+        logger.info("Page compressed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_compression_not_accepted(anonymous_client, setup_logger):
+    """Test clients that do not accept gzip get the page as it is."""
+    logger = setup_logger("test_compression_not_accepted")
+    try:
+        for headers in ({}, {"Accept-Encoding": "gzip;q=0, identity"}):
+            response = anonymous_client.get("/legal", headers=headers)
+            assert "Content-Encoding" not in response.headers
+            assert b"<html" in response.data
+            assert "Accept-Encoding" in response.vary
+        logger.info("Uncompressed page sent.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_compression_rules(app, setup_logger):
+    """Test small bodies and binary types are not compressed."""
+    logger = setup_logger("test_compression_rules")
+    try:
+        with app.test_request_context(headers=GZIP):
+            response = compress_response(Response("<p>Hello</p>"))
+            assert "Content-Encoding" not in response.headers
+
+            response = compress_response(
+                Response(b"\x89PNG" * 1024, mimetype="image/png")
+            )
+            assert "Content-Encoding" not in response.headers
+            assert "Accept-Encoding" not in response.vary
+
+            # Strong entity tags name the bytes, so they change with them
+            response = Response("<p>Hello</p>" * 1024)
+            response.set_etag("page")
+            response = compress_response(response)
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.get_etag() == ("page-gzip", False)
+        logger.info("Compression rules applied.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_compressed_pages_cached(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test public pages are compressed once, then served from the cache."""
+    logger = setup_logger("test_compressed_pages_cached")
+    try:
+        compression_cache.clear()
+        alpha = directory_organizations["Alpha Aid"]
+        first = anonymous_client.get(f"/org/{alpha}", headers=GZIP)
+        second = anonymous_client.get(f"/org/{alpha}", headers=GZIP)
+        assert second.data == first.data
+        assert compression_cache.stats()["hits"] == 1
+        assert b"Alpha Aid" in gzip.decompress(second.data)
+
+        # Responses without validators are compressed but not kept
+        compression_cache.clear()
+        response = anonymous_client.get("/login", headers=GZIP)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert compression_cache.stats()["size"] == 0
+        logger.info("Compressed pages cached.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_stream_compressed(client, directory_organizations, setup_logger):
+    """Test streamed responses are compressed chunk by chunk."""
+    logger = setup_logger("test_stream_compressed")
+    try:
+        response = client.get(
+            "/api/calendar",
+            query_string={"start": "2026-10-19", "end": "2026-10-25"},
+            headers=GZIP,
+        )
+        assert response.is_streamed, "Response was not streamed"
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+
+        lines = gzip.decompress(response.get_data()).splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[0])["date"] == "2026-10-19"
+        logger.info("Stream compressed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,225 @@
+"""Project: New Arrivals Chi.
+
+File name: conditional_test.py
+
+Associated Files: http_cache.py, main.py, cache.py
+
+This test suite verifies that public pages answer conditional requests.
+
+Methods:
+   * test_static_page_not_modified
+   * test_organization_page_not_modified
+   * test_search_page_not_modified
+   * test_validators_shared_by_workers
+   * test_unlisted_organization_page_not_cached
+   * test_if_modified_since
+   * test_personalized_page_not_cached
+"""
+
+from datetime import timedelta
+from http import HTTPStatus
+from new_arrivals_chi.app.cache import (
+    bump_data_version,
+    bump_organization_version,
+)
+from new_arrivals_chi.app.database import db, OrganizationDirectory
+
+
+def rebuild_entry(organization_id):
+    """Moves a read model row's updated_at past every other row's.
+
+    Stands in for any worker rebuilding the row a second after the last
+    write, without touching this process's versions.
+    """
+    latest = db.session.query(db.func.max(OrganizationDirectory.updated_at))
+    entry = db.session.get(OrganizationDirectory, organization_id)
+    entry.updated_at = latest.scalar() + timedelta(seconds=1)
+    db.session.commit()
+
+
+def test_static_page_not_modified(anonymous_client, setup_logger):
+    """Test a static page is revalidated from its ETag."""
+    logger = setup_logger("test_static_page_not_modified")
+    try:
+        response = anonymous_client.get("/legal")
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers["ETag"]
+        assert etag.startswith("W/")
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "Last-Modified" in response.headers
+
+        response = anonymous_client.get(
+            "/legal", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.get_data() == b""
+        assert response.headers["ETag"] == etag
+
+        # Every locale is its own page
+        response = anonymous_client.get(
+            "/legal",
+            query_string={"lang": "es"},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+        logger.info("Static page revalidated.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_organization_page_not_modified(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test an organization page's ETag changes when it is written."""
+    logger = setup_logger("test_organization_page_not_modified")
+    try:
+        alpha = directory_organizations["Alpha Aid"]
+        beta = directory_organizations["Beta Health"]
+
+        response = anonymous_client.get(f"/org/{alpha}")
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers["ETag"]
+
+        response = anonymous_client.get(
+            f"/org/{alpha}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        # Writes to other organizations leave the page valid
+        rebuild_entry(beta)
+        response = anonymous_client.get(
+            f"/org/{alpha}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        rebuild_entry(alpha)
+        response = anonymous_client.get(
+            f"/org/{alpha}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+        assert b"Alpha Aid" in response.data
+        logger.info("Organization page revalidated.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_page_not_modified(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test a search page's ETag changes when any organization is written."""
+    logger = setup_logger("test_search_page_not_modified")
+    try:
+        url = "/health/search?neighborhood=Pilsen"
+        response = anonymous_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers["ETag"]
+
+        response = anonymous_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        rebuild_entry(directory_organizations["Beta Health"])
+        response = anonymous_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+        logger.info("Search page revalidated.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_validators_shared_by_workers(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test validators do not depend on this process's data versions."""
+    logger = setup_logger("test_validators_shared_by_workers")
+    try:
+        alpha = directory_organizations["Alpha Aid"]
+        urls = [f"/org/{alpha}", "/health/search?neighborhood=Pilsen"]
+        etags = {url: anonymous_client.get(url).headers["ETag"] for url in urls}
+
+        # Another worker, or this one after a restart, counts other versions
+        bump_organization_version(alpha)
+        bump_data_version()
+        for url in urls:
+            response = anonymous_client.get(
+                url, headers={"If-None-Match": etags[url]}
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, url
+            assert response.headers["ETag"] == etags[url]
+        logger.info("Validators shared by workers.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_unlisted_organization_page_not_cached(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test organizations without a read model row get no validators."""
+    logger = setup_logger("test_unlisted_organization_page_not_cached")
+    try:
+        delta = directory_organizations["Delta No Services"]
+        response = anonymous_client.get(f"/org/{delta}")
+        assert response.status_code == HTTPStatus.OK
+        assert "ETag" not in response.headers
+        assert "Last-Modified" not in response.headers
+        assert b"Delta No Services" in response.data
+        logger.info("Unlisted organization page not cached.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_if_modified_since(anonymous_client, setup_logger):
+    """Test pages are also revalidated from their Last-Modified date."""
+    logger = setup_logger("test_if_modified_since")
+    try:
+        response = anonymous_client.get("/about")
+        last_modified = response.headers["Last-Modified"]
+
+        response = anonymous_client.get(
+            "/about", headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = anonymous_client.get(
+            "/about",
+            headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        # If-None-Match takes precedence over If-Modified-Since
+        response = anonymous_client.get(
+            "/about",
+            headers={
+                "If-None-Match": 'W/"stale"',
+                "If-Modified-Since": last_modified,
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        logger.info("Last-Modified revalidated.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_personalized_page_not_cached(client, logged_in_state, setup_logger):
+    """Test pages rendered for a signed-in user carry no validators."""
+    logger = setup_logger("test_personalized_page_not_cached")
+    try:
+        response = client.get("/about")
+        assert response.status_code == HTTPStatus.OK
+        assert "ETag" not in response.headers
+        assert "Last-Modified" not in response.headers
+
+        response = client.get("/about", headers={"If-None-Match": "*"})
+        assert response.status_code == HTTPStatus.OK
+        logger.info("Personalized page not cached.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        client.get("/logout")
@@ -9,29 +9,61 @@ Associated Files:
 Fixtures:
    - app: Flask application instance configured for testing.
    - client: A test client for the app.
+   - anonymous_client: A test client whose session is never signed in.
    - database: Sets up a clean database before each test, tears down after.
    - setup_logger: Creates a logger with file and console handlers for testing.
    - capture_templates: Captures the templates rendered during a test.
    - test_user: Creates a test user in the database before test, removes after.
    - login_client: Logs in user for testing routes that require authentication.
+   - directory_organizations: Populates a small, deterministic directory of
+     organizations with locations, hours, languages and services.
+   - neighborhood_graph: Replaces the bundled neighborhood adjacency graph
+     with a small one for the duration of a test.
+   - bytecode_directory: Points the template bytecode cache to an empty
+     temporary directory.
+   - directory_checked_every_lookup: Makes the in-memory directory indexes
+     check the read model on every lookup.
 """
 
+import json
 import pytest
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, date, time
 from new_arrivals_chi.app.main import create_app, db, User
-from new_arrivals_chi.app.database import Organization
+from new_arrivals_chi.app.data_handler import (
+    organization_cache,
+    rebuild_directory,
+    search_options_cache,
+)
+from new_arrivals_chi.app.occurrences import calendar_cache
+from new_arrivals_chi.app import neighborhoods
+from new_arrivals_chi.app.facets import facet_index
+from new_arrivals_chi.app.geo import nearby_index
+from new_arrivals_chi.app.schedule import open_hours_index
+from new_arrivals_chi.app.database import (
+    Organization,
+    OrganizationDirectory,
+    Location,
+    Hours,
+    Language,
+    Service,
+    ServiceDate,
+)
 from flask import template_rendered
+from jinja2 import FileSystemBytecodeCache
 from flask_bcrypt import Bcrypt
 
 bcrypt = Bcrypt()
 
 
 @pytest.fixture(scope="session")
-def app():
+def app(tmp_path_factory):
     """Provides the Flask application instance configured for testing.
 
+    Compiled templates are cached in a temporary directory rather than the
+    instance folder.
+
     Returns:
         Yields the Flask application instance with test configurations applied.
     """
@@ -43,6 +75,9 @@ def app():
         "DEBUG": False,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///test_fake_data.db",
         "SECRET_KEY": "testing_key",
+        "JINJA_BYTECODE_CACHE_DIR": str(
+            tmp_path_factory.mktemp("jinja_bytecode")
+        ),
     }
     app = create_app(config_override=test_config)
     with app.app_context():
@@ -65,6 +100,12 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(scope="function")
+def anonymous_client(app):
+    """Client with a session of its own, never signed in by other tests."""
+    return app.test_client()
+
+
 @pytest.fixture(scope="function")
 def database(app):
     """Sets up a clean database before each test and tears it down after.
@@ -177,3 +218,184 @@ def logged_in_state(client, test_user):
         follow_redirects=True,
     )
     yield client
+
+
+# ZIP codes of the fixture neighborhoods, which place them on the map
+NEIGHBORHOOD_ZIP_CODES = {"Pilsen": "60608", "Hyde_Park": "60615"}
+
+
+def build_directory_organization(
+    name, neighborhood, hours, services, languages
+):
+    """Build an organization with its related rows (not yet added/committed).
+
+    Parameters:
+        name (str): Name of the organization.
+        neighborhood (str): Neighborhood of the primary location, or None to
+            leave the organization without a primary location.
+        hours (list): Tuples of (day_of_week, opening_time, closing_time).
+        services (list): Tuples of (service, category, access).
+        languages (list): Languages spoken at the organization.
+
+    Returns:
+        tuple: The organization and a list of every row created for it.
+    """
+    organization = Organization(
+        name=name, phone="312-555-0100", status="ACTIVE"
+    )
+    rows = [organization]
+
+    if neighborhood:
+        location = Location(
+            street_address="1 Main St",
+            zip_code=NEIGHBORHOOD_ZIP_CODES[neighborhood],
+            city="Chicago",
+            state="IL",
+            primary_location=True,
+            neighborhood=neighborhood,
+        )
+        organization.locations = location
+        rows.append(location)
+
+    for day, opening_time, closing_time in hours:
+        hours_row = Hours(
+            day_of_week=day,
+            opening_time=opening_time,
+            closing_time=closing_time,
+        )
+        organization.hours.append(hours_row)
+        rows.append(hours_row)
+
+    for service_name, category, access in services:
+        service = Service(
+            service=service_name, category=category, access=access
+        )
+        service_date = ServiceDate(
+            date=date(2024, 6, 3),
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+            repeat="every week",
+        )
+        service.service_dates.append(service_date)
+        organization.services.append(service)
+        rows.extend([service, service_date])
+
+    for language_name in languages:
+        language = Language(language=language_name)
+        organization.languages.append(language)
+        rows.append(language)
+
+    return organization, rows
+
+
+@pytest.fixture(scope="function")
+def directory_organizations(client):
+    """Populate a small directory of organizations, remove it after the test.
+
+    Yields:
+        dict: Maps organization names to their ids.
+    """
+    specs = [
+        (
+            "Alpha Aid",
+            "Pilsen",
+            [(1, time(13, 0), time(17, 0)), (1, time(9, 0), time(12, 0))],
+            [("Hot Meals", "Food", "Walk-Ins Only")],
+            ["es"],
+        ),
+        (
+            "Beta Health",
+            "Hyde_Park",
+            [(2, time(8, 0), time(16, 0))],
+            [
+                ("Vaccinations", "Healthcare", "Appointments Only"),
+                ("Counseling", "Healthcare", "Walk-Ins Only"),
+            ],
+            ["en", "es"],
+        ),
+        (
+            "Gamma Legal",
+            "Pilsen",
+            [(5, time(9, 0), time(17, 0))],
+            [("Legal Advice", "Legal", "Appointments Only")],
+            ["en"],
+        ),
+        ("Delta No Services", "Pilsen", [(3, time(9, 0), time(17, 0))], [], []),
+        ("Epsilon No Location", None, [], [("Clothing", "Goods", "Any")], []),
+    ]
+
+    # SQLite reuses deleted ids, so entries cached by earlier tests could
+    # otherwise be served for these organizations
+    organization_cache.clear()
+    search_options_cache.clear()
+    calendar_cache.clear()
+
+    created = []
+    organization_ids = {}
+    for spec in specs:
+        organization, rows = build_directory_organization(*spec)
+        db.session.add_all(rows)
+        created.extend(rows)
+    db.session.commit()
+
+    for row in created:
+        if isinstance(row, Organization):
+            organization_ids[row.name] = row.id
+
+    rebuild_directory()
+
+    yield organization_ids
+
+    db.session.rollback()
+    OrganizationDirectory.query.delete()
+    for row in created:
+        db.session.delete(row)
+    db.session.commit()
+
+
+@pytest.fixture(scope="function")
+def neighborhood_graph(tmp_path, monkeypatch):
+    """Replace the neighborhood adjacency graph with a small one.
+
+    Pilsen borders Little_Village and Bridgeport; Bridgeport borders
+    Hyde_Park, so Hyde_Park is two hops from Pilsen.
+
+    Yields:
+        str: Path of the graph file, which may be rewritten by the test.
+    """
+    graph = {
+        "Bridgeport": ["Hyde_Park", "Pilsen"],
+        "Hyde_Park": ["Bridgeport"],
+        "Little_Village": ["Pilsen"],
+        "Pilsen": ["Bridgeport", "Little_Village"],
+    }
+    path = tmp_path / "neighborhood_adjacency.json"
+    path.write_text(json.dumps(graph))
+
+    monkeypatch.setattr(neighborhoods, "NEIGHBORHOOD_GRAPH_PATH", str(path))
+    neighborhoods.reload_neighborhood_graph()
+    yield str(path)
+
+    monkeypatch.undo()
+    neighborhoods.reload_neighborhood_graph()
+
+
+@pytest.fixture(scope="function")
+def bytecode_directory(app, tmp_path, monkeypatch):
+    """Points the app's bytecode cache to an empty temporary directory."""
+    monkeypatch.setitem(app.config, "JINJA_BYTECODE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        app.jinja_env, "bytecode_cache", FileSystemBytecodeCache(str(tmp_path))
+    )
+    return tmp_path
+
+
+@pytest.fixture(scope="function")
+def directory_checked_every_lookup(monkeypatch):
+    """Makes the in-memory directory indexes check the read model every time.
+
+    Stands in for DIRECTORY_CHECK_INTERVAL elapsing between the lookups of a
+    test, so writes made as another process would are picked up at once.
+    """
+    for index in (facet_index, nearby_index, open_hours_index):
+        monkeypatch.setattr(index, "check_interval", 0)
@@ -0,0 +1,155 @@
+"""Project: New Arrivals Chi.
+
+File name: directory_index_test.py
+
+Associated Files: directory_index.py, facets.py, schedule.py, geo.py
+
+This test suite verifies the in-memory indexes over the organization
+directory are rebuilt when they are stale.
+
+Methods:
+   * test_indexes_follow_other_processes
+   * test_index_rebuilt_after_ttl
+   * test_index_checked_once_per_interval
+"""
+
+from datetime import time
+from http import HTTPStatus
+from sqlalchemy import event
+from new_arrivals_chi.app import data_handler
+from new_arrivals_chi.app.database import (
+    db,
+    OrganizationDirectory,
+    minute_of_week,
+)
+from new_arrivals_chi.app.directory_index import DirectoryIndex
+from new_arrivals_chi.app.facets import get_facet_index
+from new_arrivals_chi.app.geo import get_nearby_index
+from new_arrivals_chi.app.schedule import get_open_hours_index
+
+# Gamma Legal is open on Fridays from 9:00 to 17:00
+FRIDAY_MORNING = (minute_of_week(5, time(9)), minute_of_week(5, time(10)))
+
+
+def test_indexes_follow_other_processes(
+    client,
+    directory_organizations,
+    directory_checked_every_lookup,
+    setup_logger,
+):
+    """Test indexes drop organizations removed by another process."""
+    logger = setup_logger("test_indexes_follow_other_processes")
+    gamma = directory_organizations["Gamma Legal"]
+    try:
+        facets = get_facet_index()
+        pilsen = facets.match({"neighborhood": ["Pilsen"]})
+        assert gamma in facets.organization_ids(pilsen)
+        assert gamma in get_open_hours_index().open_during(*FRIDAY_MORNING)
+        assert get_facet_index() is facets, "Fresh index rebuilt"
+
+        OrganizationDirectory.query.filter_by(organization_id=gamma).delete()
+        db.session.commit()
+
+        facets = get_facet_index()
+        pilsen = facets.match({"neighborhood": ["Pilsen"]})
+        assert gamma not in facets.organization_ids(pilsen)
+        assert gamma not in get_open_hours_index().open_during(*FRIDAY_MORNING)
+        assert gamma not in [
+            organization_id
+            for organization_id, _ in get_nearby_index().nearest(41.85, -87.66)
+        ]
+        assert client.get(f"/api/open/{gamma}").status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        logger.info("Indexes followed another process.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_index_rebuilt_after_ttl(client, setup_logger):
+    """Test an index is rebuilt once it is older than its TTL."""
+    logger = setup_logger("test_index_rebuilt_after_ttl")
+    now = [0.0]
+    builds = []
+
+    class CountedIndex(dict):
+        def __init__(self):
+            builds.append(self)
+
+        def update(self, organization_id, values):
+            self[organization_id] = values
+
+    directory_index = DirectoryIndex(
+        CountedIndex, lambda entry: entry.name, ttl=60, clock=lambda: now[0]
+    )
+    try:
+        index = directory_index.get()
+        now[0] = 59
+        assert directory_index.get() is index
+        assert len(builds) == 1
+
+        now[0] = 60
+        index = directory_index.get()
+        assert len(builds) == 2, "Not rebuilt after TTL"
+        assert directory_index.get() is index
+
+        # Writes in this process drop the index at once
+        directory_index.discard(None)
+        assert directory_index.get() is not index
+        assert len(builds) == 3
+        logger.info("Index rebuilt after its TTL.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        data_handler.write_hooks.remove(directory_index.discard)
+
+
+def test_index_checked_once_per_interval(
+    client, directory_organizations, setup_logger
+):
+    """Test lookups only read the database once per check interval."""
+    logger = setup_logger("test_index_checked_once_per_interval")
+    gamma = directory_organizations["Gamma Legal"]
+    now = [0.0]
+    statements = []
+
+    class NameIndex(dict):
+        def update(self, organization_id, values):
+            self[organization_id] = values
+
+    def log_statement(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    directory_index = DirectoryIndex(
+        NameIndex,
+        lambda entry: entry.name,
+        ttl=60,
+        check_interval=5,
+        clock=lambda: now[0],
+    )
+    index = directory_index.get()
+    event.listen(db.engine, "before_cursor_execute", log_statement)
+    try:
+
+        # Removed as another process would, without this process's hooks
+        OrganizationDirectory.query.filter_by(organization_id=gamma).delete()
+        db.session.commit()
+        statements.clear()
+
+        now[0] = 4.9
+        assert directory_index.get() is index
+        assert statements == [], "Database read within the interval"
+        assert gamma in index
+
+        now[0] = 5
+        assert gamma not in directory_index.get(), "Removal not picked up"
+        assert len(statements) == 2, "Fingerprint and rebuild not read"
+        logger.info("Index checked once per interval.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        event.remove(db.engine, "before_cursor_execute", log_statement)
+        data_handler.write_hooks.remove(directory_index.discard)
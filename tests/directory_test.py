@@ -0,0 +1,319 @@
+"""Project: New Arrivals Chi.
+
+File name: directory_test.py
+
+Associated Files: main.py, data_handler.py, health_search.html
+
+This test suite verifies how the public organization directory is read from
+the database and rendered on the health search page.
+
+Methods:
+   * test_health_search_lists_directory
+   * test_search_organizations_filters
+   * test_search_organizations_keyset_pages
+   * test_health_search_filter_and_cursor
+   * test_directory_read_model_rows
+   * test_directory_read_model_refreshed_on_write
+   * test_org_page_reads_read_model
+   * test_search_options_counts
+   * test_search_options_cached_per_language
+"""
+
+from datetime import time
+from http import HTTPStatus
+from new_arrivals_chi.app.database import db, Location, OrganizationDirectory
+from new_arrivals_chi.app.data_handler import (
+    assign_location_foreign_key_org_table,
+    invalidate_organization,
+    extract_organization,
+    search_organizations,
+    retrieve_directory_entry,
+    retrieve_search_options,
+    search_options_cache,
+    change_organization_status,
+)
+from new_arrivals_chi.app.utils import encode_cursor, decode_cursor
+
+
+def test_health_search_lists_directory(
+    client, directory_organizations, capture_templates, setup_logger
+):
+    """Test the health search page lists organizations offering services."""
+    logger = setup_logger("test_health_search_lists_directory")
+    try:
+        response = client.get("/health/search")
+        assert response.status_code == HTTPStatus.OK
+        assert response.is_streamed, "Search page was not streamed"
+        assert b"Gamma Legal" in response.data
+
+        template, context = capture_templates[-1]
+        assert template.name == "health_search.html"
+        assert set(context["organization_ids"]) == {
+            directory_organizations[name]
+            for name in ("Alpha Aid", "Beta Health", "Gamma Legal")
+        }
+        logger.info("Health search lists the directory.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_organizations_filters(
+    client, directory_organizations, setup_logger
+):
+    """Test the directory filters run in SQL and combine with AND."""
+    logger = setup_logger("test_search_organizations_filters")
+    try:
+        ids, _ = search_organizations(neighborhood="Pilsen")
+        assert ids == [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Gamma Legal"],
+        ], "Neighborhood filter failed or listed an org without services"
+
+        ids, _ = search_organizations(service="Counseling")
+        assert ids == [directory_organizations["Beta Health"]]
+
+        ids, _ = search_organizations(hours=(time(10, 0), time(11, 30)))
+        assert ids == [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Beta Health"],
+            directory_organizations["Gamma Legal"],
+        ], "Hours window filter failed"
+
+        ids, _ = search_organizations(
+            neighborhood="Pilsen", hours=(time(14, 0), time(16, 0))
+        )
+        assert ids == [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Gamma Legal"],
+        ]
+
+        ids, _ = search_organizations(hours=(time(11, 0), time(14, 0)))
+        assert directory_organizations["Alpha Aid"] not in ids
+        logger.info("Directory filters applied in SQL.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_organizations_keyset_pages(
+    client, directory_organizations, setup_logger
+):
+    """Test walking the directory one page at a time with a keyset cursor."""
+    logger = setup_logger("test_search_organizations_keyset_pages")
+    try:
+        seen = []
+        after = None
+        while True:
+            ids, after = search_organizations(after=after, page_size=2)
+            seen.extend(ids)
+            if after is None:
+                break
+
+        assert seen == [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Beta Health"],
+            directory_organizations["Gamma Legal"],
+        ], "Pages skipped or repeated organizations"
+        logger.info("Keyset pagination walked the directory.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_health_search_filter_and_cursor(
+    client, directory_organizations, capture_templates, setup_logger
+):
+    """Test the health search route applies filters and the page cursor."""
+    logger = setup_logger("test_health_search_filter_and_cursor")
+    try:
+        cursor = encode_cursor(
+            "Alpha Aid", directory_organizations["Alpha Aid"]
+        )
+        assert decode_cursor(cursor) == (
+            "Alpha Aid",
+            directory_organizations["Alpha Aid"],
+        )
+        assert decode_cursor("not-a-cursor") is None
+
+        response = client.get(
+            "/health/search",
+            query_string={"neighborhood": "Pilsen", "cursor": cursor},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert b"Gamma Legal" in response.data
+
+        _, context = capture_templates[-1]
+        assert context["organization_ids"] == [
+            directory_organizations["Gamma Legal"]
+        ], "Filter or cursor not applied"
+        assert context["next_cursor"] is None
+        neighborhoods = [
+            option["value"]
+            for option in context["search_options"]["neighborhoods"]
+        ]
+        assert "Hyde_Park" in neighborhoods, "Options follow the filters"
+        logger.info("Health search applied filters and cursor.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_directory_read_model_rows(
+    client, directory_organizations, setup_logger
+):
+    """Test the read model holds one row per listed organization."""
+    logger = setup_logger("test_directory_read_model_rows")
+    try:
+        names = {entry.name for entry in OrganizationDirectory.query}
+        assert names == {"Alpha Aid", "Beta Health", "Gamma Legal"}
+
+        entry = db.session.get(
+            OrganizationDirectory, directory_organizations["Beta Health"]
+        )
+        assert entry.service_names == "Vaccinations, Counseling"
+        assert entry.service_categories == "Healthcare"
+        assert entry.languages == ["en", "es"]
+        assert entry.hours["monday"] == []
+        assert entry.hours["tuesday"] == [["08:00:00", "16:00:00"]]
+
+        alpha_id = directory_organizations["Alpha Aid"]
+        from_read_model = retrieve_directory_entry(alpha_id)
+        from_tables = extract_organization(alpha_id)
+        for key in ("name", "phone", "languages", "hours", "neighborhood"):
+            assert from_read_model[key] == from_tables[key], f"{key} differs"
+        logger.info("Read model rows built.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_directory_read_model_refreshed_on_write(
+    client, directory_organizations, setup_logger
+):
+    """Test data_handler writes add and remove read model rows."""
+    logger = setup_logger("test_directory_read_model_refreshed_on_write")
+    org_id = directory_organizations["Epsilon No Location"]
+    location = Location(
+        street_address="2 Main St",
+        zip_code="60615",
+        city="Chicago",
+        state="IL",
+        primary_location=True,
+        neighborhood="Hyde_Park",
+    )
+    db.session.add(location)
+    db.session.commit()
+    try:
+        assert retrieve_directory_entry(org_id) is None
+
+        assign_location_foreign_key_org_table(org_id, location.id)
+        db.session.commit()
+        invalidate_organization(org_id)
+        entry = retrieve_directory_entry(org_id)
+        assert entry is not None, "Listed organization missing from read model"
+        assert entry["neighborhood"] == "Hyde_Park"
+
+        assign_location_foreign_key_org_table(org_id, None)
+        db.session.commit()
+        invalidate_organization(org_id)
+        assert retrieve_directory_entry(org_id) is None, "Row not removed"
+        logger.info("Read model refreshed by writes.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        assign_location_foreign_key_org_table(org_id, None)
+        db.session.delete(location)
+        db.session.commit()
+        invalidate_organization(org_id)
+
+
+def test_org_page_reads_read_model(
+    client, directory_organizations, capture_templates, setup_logger
+):
+    """Test the organization page renders listed orgs from the read model."""
+    logger = setup_logger("test_org_page_reads_read_model")
+    try:
+        org_id = directory_organizations["Gamma Legal"]
+        response = client.get(f"/org/{org_id}")
+        assert response.status_code == HTTPStatus.OK
+        assert b"Gamma Legal" in response.data
+
+        _, context = capture_templates[-1]
+        assert context["organization"]["hours"]["friday"][0]["open"] == time(9)
+        logger.info("Organization page read from the read model.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_options_counts(client, directory_organizations, setup_logger):
+    """Test the search options count listed organizations per value."""
+    logger = setup_logger("test_search_options_counts")
+    try:
+        options = retrieve_search_options("en")
+
+        assert options["neighborhoods"] == [
+            {"value": "Hyde_Park", "label": "Hyde_Park", "count": 1},
+            {"value": "Pilsen", "label": "Pilsen", "count": 2},
+        ], "Unlisted organizations counted"
+        assert [option["value"] for option in options["services"]] == [
+            "Counseling",
+            "Hot Meals",
+            "Legal Advice",
+            "Vaccinations",
+        ]
+        assert {
+            "value": "09:00-17:00",
+            "label": "9:00\u202fAM - 5:00\u202fPM",
+            "count": 1,
+        } in options["hours"]
+        assert [option["count"] for option in options["organizations"]] == [
+            1,
+            1,
+            1,
+        ]
+
+        # An hours option counts the organizations its filter returns
+        for option in options["hours"]:
+            start, end = option["value"].split("-")
+            matching, _ = search_organizations(
+                hours=(time.fromisoformat(start), time.fromisoformat(end))
+            )
+            assert option["count"] == len(matching), option["value"]
+        assert {
+            option["value"]: option["count"] for option in options["hours"]
+        }["09:00-12:00"] == 3
+        logger.info("Search options counted.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_options_cached_per_language(
+    client, directory_organizations, setup_logger
+):
+    """Test search options are cached per language until a write."""
+    logger = setup_logger("test_search_options_cached_per_language")
+    try:
+        options = retrieve_search_options("en")
+        assert retrieve_search_options("en") is options, "Not cached"
+        assert retrieve_search_options("xx") is options, "Unknown language"
+
+        spanish = retrieve_search_options("es")
+        assert spanish is not options
+        assert spanish["services"] == options["services"]
+        assert {
+            "value": "09:00-17:00",
+            "label": "9:00 - 17:00",
+            "count": 1,
+        } in spanish["hours"], "Hours not formatted for the language"
+        assert search_options_cache.stats()["size"] == 2
+
+        change_organization_status(directory_organizations["Alpha Aid"])
+        assert retrieve_search_options("en") is not options, "Stale options"
+        logger.info("Search options cached per language.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
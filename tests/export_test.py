@@ -0,0 +1,108 @@
+"""Project: New Arrivals Chi.
+
+File name: export_test.py
+
+Associated Files: static_export.py, commands.py
+
+This test suite verifies the export of the public pages to static files.
+
+Methods:
+   * test_export_static
+   * test_export_incremental
+   * test_page_file
+"""
+
+import gzip
+import json
+from datetime import datetime
+from new_arrivals_chi.app.database import db, OrganizationDirectory
+from new_arrivals_chi.app.static_export import page_file
+
+
+def test_export_static(app, directory_organizations, tmp_path, setup_logger):
+    """Test every public page is exported in every language."""
+    logger = setup_logger("test_export_static")
+    try:
+        result = app.test_cli_runner().invoke(
+            args=["export-static", str(tmp_path)]
+        )
+        assert result.exit_code == 0, result.output
+
+        alpha = directory_organizations["Alpha Aid"]
+        for name in (
+            "en/index.html",
+            "es/legal/tps_info/index.html",
+            "en/health/search/index.html",
+            f"es/org/{alpha}/index.html",
+        ):
+            assert (tmp_path / name).exists(), f"{name} was not exported"
+
+        # Only organizations listed in the directory get a page
+        delta = directory_organizations["Delta No Services"]
+        assert not (tmp_path / f"en/org/{delta}/index.html").exists()
+        assert not (tmp_path / "en/dashboard/index.html").exists()
+
+        page = tmp_path / "es/health/search/index.html"
+        assert b'<html lang="es">' in page.read_bytes()
+        assert b"Alpha Aid" in page.read_bytes()
+        compressed = (tmp_path / "es/health/search/index.html.gz").read_bytes()
+        assert gzip.decompress(compressed) == page.read_bytes()
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        entry = manifest["pages"]["es/health/search/index.html"]
+        assert entry["path"] == "/health/search"
+        assert len(entry["sha256"]) == 64
+        logger.info("Public pages exported.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_export_incremental(
+    app, directory_organizations, tmp_path, setup_logger
+):
+    """Test a rebuild only renders the pages whose inputs changed."""
+    logger = setup_logger("test_export_incremental")
+    try:
+        runner = app.test_cli_runner()
+        runner.invoke(args=["export-static", str(tmp_path)])
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        total = len(manifest["pages"])
+
+        result = runner.invoke(args=["export-static", str(tmp_path)])
+        assert f"Wrote 0 pages, skipped {total}" in result.output
+
+        alpha = directory_organizations["Alpha Aid"]
+        entry = db.session.get(OrganizationDirectory, alpha)
+        entry.updated_at = datetime(2030, 1, 1)
+        db.session.commit()
+
+        # The organization's pages and the search pages, in both languages
+        result = runner.invoke(args=["export-static", str(tmp_path)])
+        assert f"Wrote 4 pages, skipped {total - 4}" in result.output
+
+        db.session.delete(entry)
+        db.session.commit()
+        result = runner.invoke(args=["export-static", str(tmp_path)])
+        assert "removed 2" in result.output
+        assert not (tmp_path / f"en/org/{alpha}/index.html").exists()
+        assert not (tmp_path / f"en/org/{alpha}/index.html.gz").exists()
+        logger.info("Export rebuilt incrementally.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_page_file(setup_logger):
+    """Test pages are exported to an index.html per path and language."""
+    logger = setup_logger("test_page_file")
+    try:
+        assert page_file("en", "/") == "en/index.html"
+        assert page_file("es", "/legal/tps_info") == (
+            "es/legal/tps_info/index.html"
+        )
+        assert page_file("en", "/org/7") == "en/org/7/index.html"
+        logger.info("Page files named.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,182 @@
+"""Project: New Arrivals Chi.
+
+File name: facets_test.py
+
+Associated Files: facets.py, api_routes.py, data_handler.py
+
+This test suite verifies the bitset facet index over the public directory and
+the facets API route.
+
+Methods:
+   * test_facet_index_match
+   * test_facet_index_counts
+   * test_facet_index_remove_reuses_positions
+   * test_facets_route
+   * test_facets_follow_writes
+"""
+
+from http import HTTPStatus
+from new_arrivals_chi.app.database import db, Location
+from new_arrivals_chi.app.data_handler import (
+    assign_location_foreign_key_org_table,
+    invalidate_organization,
+)
+from new_arrivals_chi.app.facets import FacetIndex, get_facet_index
+
+
+def build_index():
+    """Builds a small index of three organizations."""
+    index = FacetIndex()
+    index.update(
+        1,
+        {"service": {"Hot Meals"}, "language": {"es"}, "day": {"monday"}},
+    )
+    index.update(
+        2,
+        {
+            "service": {"Vaccinations", "Counseling"},
+            "language": {"en", "es"},
+            "day": {"tuesday"},
+        },
+    )
+    index.update(
+        3,
+        {"service": {"Hot Meals"}, "language": {"en"}, "day": {"monday"}},
+    )
+    return index
+
+
+def test_facet_index_match(setup_logger):
+    """Test values of a field are ORed and fields are ANDed."""
+    logger = setup_logger("test_facet_index_match")
+    try:
+        index = build_index()
+        assert len(index) == 3
+
+        either = index.match({"language": ["en", "es"]})
+        assert index.organization_ids(either) == [1, 2, 3]
+
+        both = index.match({"language": ["en", "es"]}, match_all=True)
+        assert index.organization_ids(both) == [2], "AND within field failed"
+
+        combined = index.match({"service": ["Hot Meals"], "language": ["en"]})
+        assert index.organization_ids(combined) == [3], "AND across failed"
+
+        unknown = index.match({"service": ["Unknown"]})
+        assert index.organization_ids(unknown) == []
+        logger.info("Facet combinations matched.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_facet_index_counts(setup_logger):
+    """Test counts ignore their own field's filter but honor the others."""
+    logger = setup_logger("test_facet_index_counts")
+    try:
+        index = build_index()
+        counts = index.counts({"language": ["es"], "day": ["monday"]})
+
+        assert counts["service"] == {"Hot Meals": 1}
+        assert counts["language"] == {
+            "en": 1,
+            "es": 1,
+        }, "Own filter applied to language counts"
+        assert counts["day"] == {"monday": 1, "tuesday": 1}
+        logger.info("Facet counts computed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_facet_index_remove_reuses_positions(setup_logger):
+    """Test removed organizations drop out and their bit is reused."""
+    logger = setup_logger("test_facet_index_remove_reuses_positions")
+    try:
+        index = build_index()
+        index.remove(1)
+        assert index.counts()["service"] == {
+            "Counseling": 1,
+            "Hot Meals": 1,
+            "Vaccinations": 1,
+        }
+
+        index.update(4, {"service": {"Clothing"}})
+        assert index.organization_ids(index.match({})) == [2, 3, 4]
+        assert index.match({"service": ["Clothing"]}) == 1, "Bit not reused"
+
+        index.update(4, {"service": {"Legal Advice"}})
+        assert "Clothing" not in index.counts()["service"], "Stale value"
+        logger.info("Removed organizations dropped from the index.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_facets_route(client, directory_organizations, setup_logger):
+    """Test the facets route filters the directory and counts options."""
+    logger = setup_logger("test_facets_route")
+    try:
+        response = client.get(
+            "/api/facets?neighborhood=Pilsen&neighborhood=Hyde_Park"
+            "&language=es"
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        data = response.get_json()
+        assert data["organization_ids"] == sorted(
+            [
+                directory_organizations["Alpha Aid"],
+                directory_organizations["Beta Health"],
+            ]
+        )
+        assert data["total"] == 2
+        assert data["facets"]["neighborhood"] == {"Hyde_Park": 1, "Pilsen": 1}
+        assert data["facets"]["language"] == {"en": 2, "es": 2}
+        assert data["facets"]["category"] == {"Food": 1, "Healthcare": 1}
+
+        response = client.get("/api/facets?language=en&language=es&match=all")
+        assert response.get_json()["organization_ids"] == [
+            directory_organizations["Beta Health"]
+        ], "match=all ignored"
+        logger.info("Facets route filtered the directory.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_facets_follow_writes(client, directory_organizations, setup_logger):
+    """Test data_handler writes are reflected by the facet index at once."""
+    logger = setup_logger("test_facets_follow_writes")
+    org_id = directory_organizations["Epsilon No Location"]
+    location = Location(
+        street_address="2 Main St",
+        zip_code="60615",
+        city="Chicago",
+        state="IL",
+        primary_location=True,
+        neighborhood="Hyde_Park",
+    )
+    db.session.add(location)
+    db.session.commit()
+    try:
+        index = get_facet_index()
+        assert "Clothing" not in index.counts()["service"]
+
+        assign_location_foreign_key_org_table(org_id, location.id)
+        db.session.commit()
+        invalidate_organization(org_id)
+        index = get_facet_index()
+        clothing = index.match({"service": ["Clothing"]})
+        assert index.organization_ids(clothing) == [org_id]
+        assert index.counts()["neighborhood"]["Hyde_Park"] == 2
+
+        assign_location_foreign_key_org_table(org_id, None)
+        db.session.commit()
+        invalidate_organization(org_id)
+        index = get_facet_index()
+        assert "Clothing" not in index.counts()["service"], "Not removed"
+        logger.info("Facet index followed writes.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,196 @@
+"""Project: New Arrivals Chi.
+
+File name: geo_test.py
+
+Associated Files: geo.py, database.py, utils.py, main.py
+
+This test suite verifies the coordinates of locations and the nearest
+organization search built on them.
+
+Methods:
+   * test_location_coordinates_set_on_write
+   * test_parse_coordinates
+   * test_nearby_index
+   * test_nearby_index_matches_scan
+   * test_health_search_near
+"""
+
+import random
+from http import HTTPStatus
+from new_arrivals_chi.app.database import db, Location
+from new_arrivals_chi.app.geo import NearbyIndex, distance_miles
+from new_arrivals_chi.app.utils import parse_coordinates, zip_coordinates
+
+HYDE_PARK = (41.8022, -87.6006)
+PILSEN = (41.8515, -87.6694)
+
+
+def test_location_coordinates_set_on_write(client, setup_logger):
+    """Test locations are placed at their ZIP code's centroid."""
+    logger = setup_logger("test_location_coordinates_set_on_write")
+    location = Location(
+        street_address="5801 S Ellis Ave",
+        zip_code="60615",
+        city="Chicago",
+        state="IL",
+        primary_location=True,
+        neighborhood="Hyde_Park",
+    )
+    db.session.add(location)
+    db.session.commit()
+    try:
+        assert (location.latitude, location.longitude) == HYDE_PARK
+
+        location.zip_code = "60608"
+        db.session.commit()
+        assert (location.latitude, location.longitude) == PILSEN
+
+        location.latitude, location.longitude = 41.85, -87.65
+        db.session.commit()
+        assert (location.latitude, location.longitude) == (41.85, -87.65)
+
+        location.zip_code = "99999"
+        db.session.commit()
+        assert location.latitude is None, "Stale coordinates kept"
+        assert zip_coordinates("60615-1234") == HYDE_PARK
+        logger.info("Location coordinates looked up on write.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        db.session.delete(location)
+        db.session.commit()
+
+
+def test_parse_coordinates(setup_logger):
+    """Test location filters are parsed and validated."""
+    logger = setup_logger("test_parse_coordinates")
+    try:
+        assert parse_coordinates("41.8022,-87.6006") == HYDE_PARK
+        assert parse_coordinates(" 41.8 , -87.6 ") == (41.8, -87.6)
+        for value in ("", None, "41.8", "north,west", "91,0", "0,181", "nan,0"):
+            assert parse_coordinates(value) is None, f"{value!r} accepted"
+        logger.info("Location filters parsed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_nearby_index(setup_logger):
+    """Test nearest lookups, radius and limit, moves and removal."""
+    logger = setup_logger("test_nearby_index")
+    try:
+        index = NearbyIndex()
+        index.update(1, HYDE_PARK)
+        index.update(2, PILSEN)
+        index.update(3, (41.9742, -87.9073))
+        index.update(4, None)
+
+        assert len(index) == 3, "Organization without coordinates indexed"
+        nearest = index.nearest(*HYDE_PARK)
+        assert [organization_id for organization_id, _ in nearest] == [1, 2, 3]
+        assert nearest[0][1] == 0
+        assert 4.5 < nearest[1][1] < 5.5
+
+        assert index.nearest(*HYDE_PARK, radius=1) == [(1, 0.0)]
+        assert [entry[0] for entry in index.nearest(*PILSEN, limit=2)] == [
+            2,
+            1,
+        ]
+        assert index.nearest(0, 0, limit=1)[0][0] == 1, "Far query failed"
+
+        index.update(1, (41.9742, -87.9073))
+        assert index.nearest(*HYDE_PARK, limit=1)[0][0] == 2, "Stale point"
+        index.remove(2)
+        assert index.nearest(*HYDE_PARK, radius=10) == []
+        logger.info("Nearby index answered lookups.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_nearby_index_matches_scan(setup_logger):
+    """Test the grid search returns what scanning every point returns."""
+    logger = setup_logger("test_nearby_index_matches_scan")
+    generator = random.Random(30320)
+    points = {
+        organization_id: (
+            generator.uniform(41.64, 42.02),
+            generator.uniform(-87.94, -87.52),
+        )
+        for organization_id in range(300)
+    }
+    index = NearbyIndex()
+    for organization_id, point in points.items():
+        index.update(organization_id, point)
+
+    try:
+        for _ in range(25):
+            origin = (
+                generator.uniform(41.6, 42.1),
+                generator.uniform(-88.0, -87.5),
+            )
+            scan = sorted(
+                (distance_miles(*origin, *point), organization_id)
+                for organization_id, point in points.items()
+            )
+            expected = [organization_id for _, organization_id in scan]
+
+            found = index.nearest(*origin, limit=10)
+            assert [entry[0] for entry in found] == expected[:10]
+
+            found = index.nearest(*origin, radius=3)
+            within = [entry[1] for entry in scan if entry[0] <= 3]
+            assert [entry[0] for entry in found] == within
+        logger.info("Grid search matched a full scan.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_health_search_near(
+    client, directory_organizations, capture_templates, setup_logger
+):
+    """Test the health search page lists the closest organizations first."""
+    logger = setup_logger("test_health_search_near")
+    near = ",".join(str(degrees) for degrees in HYDE_PARK)
+    try:
+        response = client.get(
+            "/health/search", query_string={"near": near, "radius": 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert b"0.0 mi" in response.data
+        # The button is shown pressed, so it can turn distance sorting off
+        assert b'id="nearMe" aria-pressed="true" >' in response.data
+
+        names_by_id = {
+            org_id: name for name, org_id in directory_organizations.items()
+        }
+        _, context = capture_templates[-1]
+        names = [names_by_id[org_id] for org_id in context["organization_ids"]]
+        assert names == ["Beta Health", "Alpha Aid", "Gamma Legal"]
+        assert context["distances"][directory_organizations["Beta Health"]] == 0
+        assert context["next_cursor"] is None
+
+        client.get(
+            "/health/search", query_string={"near": near, "radius": 1}
+        ).get_data()
+        _, context = capture_templates[-1]
+        names = [names_by_id[org_id] for org_id in context["organization_ids"]]
+        assert names == ["Beta Health"], "Radius not applied"
+
+        client.get(
+            "/health/search",
+            query_string={"near": near, "radius": 10, "service": "Hot Meals"},
+        ).get_data()
+        _, context = capture_templates[-1]
+        names = [names_by_id[org_id] for org_id in context["organization_ids"]]
+        assert names == ["Alpha Aid"], "Filters not applied to nearby results"
+
+        response = client.get("/health/search")
+        assert b'id="near" name="near" value=""' in response.data
+        assert b'id="nearMe" aria-pressed="false" hidden>' in response.data
+        logger.info("Health search ordered by distance.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,267 @@
+"""Project: New Arrivals Chi.
+
+File name: neighborhoods_test.py
+
+Associated Files: neighborhoods.py, commands.py, data_handler.py, main.py
+
+This test suite verifies the neighborhood adjacency graph and the "in or
+near a neighborhood" search built on it.
+
+Methods:
+   * test_build_adjacency
+   * test_expand_neighborhood
+   * test_build_neighborhood_graph_command
+   * test_search_organizations_near_neighborhood
+   * test_health_search_hops
+   * test_health_search_hops_without_graph
+   * test_bundled_neighborhood_graph
+"""
+
+import json
+from new_arrivals_chi.app.commands import build_neighborhood_graph_command
+from new_arrivals_chi.app.data_handler import search_organizations
+from new_arrivals_chi.app.neighborhoods import (
+    build_adjacency,
+    expand_neighborhood,
+    load_neighborhood_graph,
+    reload_neighborhood_graph,
+)
+from new_arrivals_chi.app.utils import load_neighborhoods
+
+NEIGHBORHOODS = ["Bridgeport", "Hyde_Park", "Little_Village", "Pilsen"]
+
+
+def square(west, south, name, multi=False):
+    """Returns a GeoJSON feature of a 0.01 degree square."""
+    ring = [
+        [west, south],
+        [west + 0.01, south],
+        [west + 0.01, south + 0.01],
+        [west, south + 0.01],
+        [west, south],
+    ]
+    geometry = {"type": "Polygon", "coordinates": [ring]}
+    if multi:
+        geometry = {"type": "MultiPolygon", "coordinates": [[ring]]}
+    return {
+        "type": "Feature",
+        "properties": {"pri_neigh": name},
+        "geometry": geometry,
+    }
+
+
+# Little Village | Pilsen | Bridgeport in a row, Hyde Park touching
+# Bridgeport's south-east corner, and a neighborhood the app does not list
+BOUNDARIES = [
+    square(-87.71, 41.84, "Little Village"),
+    square(-87.70, 41.84, "Pilsen"),
+    square(-87.69, 41.84, "BRIDGEPORT", multi=True),
+    square(-87.68, 41.83, "Hyde Park"),
+    square(-87.50, 41.70, "Atlantis"),
+]
+
+
+def test_build_adjacency(setup_logger):
+    """Test boundaries sharing an edge or a corner are adjacent."""
+    logger = setup_logger("test_build_adjacency")
+    try:
+        graph, unmatched = build_adjacency(
+            BOUNDARIES, "pri_neigh", NEIGHBORHOODS
+        )
+        assert graph == {
+            "Bridgeport": ["Hyde_Park", "Pilsen"],
+            "Hyde_Park": ["Bridgeport"],
+            "Little_Village": ["Pilsen"],
+            "Pilsen": ["Bridgeport", "Little_Village"],
+        }
+        assert unmatched == ["Atlantis"]
+        logger.info("Adjacency built from boundaries.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_expand_neighborhood(neighborhood_graph, setup_logger):
+    """Test neighborhoods are expanded hop by hop and cached."""
+    logger = setup_logger("test_expand_neighborhood")
+    try:
+        assert expand_neighborhood("Pilsen", 0) == ("Pilsen",)
+        assert expand_neighborhood("Pilsen", 1) == (
+            "Bridgeport",
+            "Little_Village",
+            "Pilsen",
+        )
+        assert expand_neighborhood("Pilsen", 2) == (
+            "Bridgeport",
+            "Hyde_Park",
+            "Little_Village",
+            "Pilsen",
+        )
+        assert expand_neighborhood("Pilsen", 5) == expand_neighborhood(
+            "Pilsen", 2
+        )
+        assert expand_neighborhood("Andersonville", 2) == ("Andersonville",)
+
+        expand_neighborhood("Pilsen", 1)
+        assert expand_neighborhood.cache_info().hits >= 1, "Not cached"
+        logger.info("Neighborhoods expanded.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_build_neighborhood_graph_command(
+    app, neighborhood_graph, tmp_path, setup_logger
+):
+    """Test the CLI command writes the graph and reports unknown names."""
+    logger = setup_logger("test_build_neighborhood_graph_command")
+    boundaries = tmp_path / "boundaries.geojson"
+    boundaries.write_text(
+        json.dumps({"type": "FeatureCollection", "features": BOUNDARIES[:3]})
+    )
+    try:
+        expand_neighborhood("Pilsen", 2)
+        result = app.test_cli_runner().invoke(
+            build_neighborhood_graph_command, [str(boundaries)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Wrote adjacency of 3 neighborhoods." in result.output
+
+        with open(neighborhood_graph) as file:
+            assert json.load(file)["Bridgeport"] == ["Pilsen"]
+        assert "Hyde_Park" not in load_neighborhood_graph()
+        assert expand_neighborhood("Pilsen", 2) == (
+            "Bridgeport",
+            "Little_Village",
+            "Pilsen",
+        ), "Stale expansion served"
+        logger.info("Neighborhood graph command wrote the graph.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_organizations_near_neighborhood(
+    client, directory_organizations, neighborhood_graph, setup_logger
+):
+    """Test the directory search widens the neighborhood filter."""
+    logger = setup_logger("test_search_organizations_near_neighborhood")
+    try:
+        pilsen = [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Gamma Legal"],
+        ]
+        ids, _ = search_organizations(neighborhood="Pilsen")
+        assert ids == pilsen
+        ids, _ = search_organizations(
+            neighborhood="Pilsen", neighborhood_hops=1
+        )
+        assert ids == pilsen
+
+        ids, _ = search_organizations(
+            neighborhood="Pilsen", neighborhood_hops=2
+        )
+        assert ids == [
+            directory_organizations["Alpha Aid"],
+            directory_organizations["Beta Health"],
+            directory_organizations["Gamma Legal"],
+        ]
+        logger.info("Neighborhood filter widened.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_health_search_hops(
+    client,
+    directory_organizations,
+    neighborhood_graph,
+    capture_templates,
+    setup_logger,
+):
+    """Test the health search page passes hops to the search."""
+    logger = setup_logger("test_health_search_hops")
+    try:
+        client.get(
+            "/health/search",
+            query_string={"neighborhood": "Hyde_Park", "hops": "2"},
+        ).get_data()
+        _, context = capture_templates[-1]
+        assert context["organization_ids"] == [
+            directory_organizations[name]
+            for name in ("Alpha Aid", "Beta Health", "Gamma Legal")
+        ]
+
+        client.get(
+            "/health/search",
+            query_string={"neighborhood": "Hyde_Park", "hops": "9"},
+        ).get_data()
+        _, context = capture_templates[-1]
+        assert len(context["organization_ids"]) == 3, "Hops not capped"
+        assert context["widen_neighborhoods"]
+        logger.info("Health search widened the neighborhood filter.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_health_search_hops_without_graph(
+    client,
+    directory_organizations,
+    neighborhood_graph,
+    capture_templates,
+    setup_logger,
+):
+    """Test hops is hidden and ignored when no adjacency graph is bundled."""
+    logger = setup_logger("test_health_search_hops_without_graph")
+    with open(neighborhood_graph, "w") as file:
+        file.write("{}")
+    reload_neighborhood_graph()
+    try:
+        response = client.get(
+            "/health/search",
+            query_string={"neighborhood": "Hyde_Park", "hops": "2"},
+        )
+        assert b'id="hops"' not in response.get_data()
+
+        _, context = capture_templates[-1]
+        assert not context["widen_neighborhoods"]
+        assert context["organization_ids"] == [
+            directory_organizations["Beta Health"]
+        ]
+        assert "hops" not in context["active_filters"], "Ignored hops shown"
+        logger.info("Hops hidden without a graph.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_bundled_neighborhood_graph(
+    client, directory_organizations, capture_templates, setup_logger
+):
+    """Test the bundled adjacency graph widens health searches."""
+    logger = setup_logger("test_bundled_neighborhood_graph")
+    reload_neighborhood_graph()
+    try:
+        graph = load_neighborhood_graph()
+        assert set(graph) <= set(load_neighborhoods()), "Unknown neighborhood"
+        for name, neighbors in graph.items():
+            assert name not in neighbors
+            for neighbor in neighbors:
+                assert name in graph[neighbor], f"{name} not symmetric"
+        assert "Little_Village" in expand_neighborhood("Pilsen", 1)
+
+        # Beta Health is in Hyde Park, which borders Kenwood
+        response = client.get(
+            "/health/search",
+            query_string={"neighborhood": "Kenwood", "hops": "1"},
+        )
+        assert b'id="hops"' in response.get_data()
+        _, context = capture_templates[-1]
+        assert context["organization_ids"] == [
+            directory_organizations["Beta Health"]
+        ]
+        logger.info("Bundled graph widened the search.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,165 @@
+"""Project: New Arrivals Chi.
+
+File name: occurrences_test.py
+
+Associated Files: occurrences.py, data_handler.py
+
+This test suite verifies how service date repeat rules are expanded into
+occurrences and how the expanded calendar is cached.
+
+Methods:
+   * test_occurrence_dates_periodic
+   * test_occurrence_dates_monthly
+   * test_periodic_dates_shared_per_cycle
+   * test_find_occurrences
+   * test_calendar_cached_until_written
+"""
+
+from datetime import date
+from new_arrivals_chi.app.data_handler import change_organization_status
+from new_arrivals_chi.app.occurrences import (
+    calendar_cache,
+    find_occurrences,
+    occurrence_dates,
+    periodic_dates,
+    retrieve_calendar,
+)
+
+WEEK_START = date(2026, 10, 19)
+WEEK_END = date(2026, 10, 25)
+
+
+def test_occurrence_dates_periodic(setup_logger):
+    """Test daily, weekly and every other week rules."""
+    logger = setup_logger("test_occurrence_dates_periodic")
+    try:
+        anchor = date(2026, 10, 1)
+        daily = occurrence_dates(anchor, "every day", WEEK_START, WEEK_END)
+        assert len(daily) == 7 and daily[0] == WEEK_START
+
+        weekly = occurrence_dates(anchor, "every week", WEEK_START, WEEK_END)
+        assert weekly == (date(2026, 10, 22),), "Wrong weekday"
+
+        biweekly = occurrence_dates(
+            date(2026, 10, 13),
+            "every other week",
+            WEEK_START,
+            date(2026, 11, 10),
+        )
+        assert biweekly == (date(2026, 10, 27), date(2026, 11, 10))
+
+        late = occurrence_dates(
+            date(2026, 10, 24), "every day", WEEK_START, WEEK_END
+        )
+        assert late == (
+            date(2026, 10, 24),
+            date(2026, 10, 25),
+        ), "Occurrences before the first date"
+        assert (
+            occurrence_dates(
+                date(2027, 1, 1), "every day", WEEK_START, WEEK_END
+            )
+            == ()
+        )
+        logger.info("Periodic rules expanded.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_occurrence_dates_monthly(setup_logger):
+    """Test monthly rules skip months without the anchor's day."""
+    logger = setup_logger("test_occurrence_dates_monthly")
+    try:
+        dates = occurrence_dates(
+            date(2026, 1, 31),
+            "every month",
+            date(2026, 1, 1),
+            date(2026, 5, 31),
+        )
+        assert dates == (
+            date(2026, 1, 31),
+            date(2026, 3, 31),
+            date(2026, 5, 31),
+        )
+
+        dates = occurrence_dates(
+            date(2025, 6, 15),
+            "every month",
+            date(2026, 11, 20),
+            date(2027, 1, 10),
+        )
+        assert dates == (date(2026, 12, 15),), "Year boundary mishandled"
+        logger.info("Monthly rules expanded.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_periodic_dates_shared_per_cycle(setup_logger):
+    """Test rules on the same cycle share one computed sequence."""
+    logger = setup_logger("test_periodic_dates_shared_per_cycle")
+    try:
+        first = occurrence_dates(
+            date(2026, 1, 6), "every week", WEEK_START, WEEK_END
+        )
+        second = occurrence_dates(
+            date(2025, 3, 4), "every week", WEEK_START, WEEK_END
+        )
+        assert first is second, "Same cycle expanded twice"
+        assert periodic_dates.cache_info().hits > 0
+        logger.info("Cycles shared between rules.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_find_occurrences(client, directory_organizations, setup_logger):
+    """Test the occurrences of listed services in a week, with filters."""
+    logger = setup_logger("test_find_occurrences")
+    try:
+        occurrences = find_occurrences(WEEK_START, WEEK_END)
+        assert [
+            (occurrence["organization"], occurrence["service"])
+            for occurrence in occurrences
+        ] == [
+            ("Alpha Aid", "Hot Meals"),
+            ("Beta Health", "Counseling"),
+            ("Beta Health", "Vaccinations"),
+            ("Gamma Legal", "Legal Advice"),
+        ], "Unlisted organizations or wrong order"
+        assert {occurrence["date"] for occurrence in occurrences} == {
+            WEEK_START
+        }
+
+        food = find_occurrences(WEEK_START, WEEK_END, categories=["Food"])
+        assert [occurrence["service"] for occurrence in food] == ["Hot Meals"]
+
+        beta = find_occurrences(
+            WEEK_START,
+            WEEK_END,
+            organization_id=directory_organizations["Beta Health"],
+        )
+        assert len(beta) == 2
+        logger.info("Occurrences found.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_calendar_cached_until_written(
+    client, directory_organizations, setup_logger
+):
+    """Test the calendar of a window is cached until an organization write."""
+    logger = setup_logger("test_calendar_cached_until_written")
+    try:
+        calendar = retrieve_calendar(WEEK_START, WEEK_END)
+        assert retrieve_calendar(WEEK_START, WEEK_END) is calendar
+        assert calendar_cache.stats()["hits"] == 1
+
+        change_organization_status(directory_organizations["Alpha Aid"])
+        assert retrieve_calendar(WEEK_START, WEEK_END) is not calendar
+        logger.info("Calendar cached until written.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
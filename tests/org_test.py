@@ -11,10 +11,20 @@ Methods:
    * test_create_organization_dashboard
    * test_organization_dashboard_page
    * test_create_post_new_org
+   * test_provision_organization
+   * test_provision_organization_rolled_back
+   * test_add_organization_provisions_user
 """
 
-from new_arrivals_chi.app.database import Organization
-from new_arrivals_chi.app.data_handler import create_organization_profile
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from new_arrivals_chi.app.database import db, Organization, User
+from new_arrivals_chi.app.data_handler import (
+    bcrypt,
+    create_organization_profile,
+    provision_organization,
+)
 from http import HTTPStatus
 
 
@@ -67,3 +77,108 @@ def test_organization_dashboard_page(
     except AssertionError as e:
         logger.error(f"Test failed: {str(e)}")
         raise
+
+
+def remove_provisioned(email):
+    """Deletes a provisioned user and its organization."""
+    user = User.query.filter_by(email=email).first()
+    if user is not None:
+        organization = user.organization
+        db.session.delete(user)
+        if organization is not None:
+            db.session.delete(organization)
+        db.session.commit()
+
+
+def test_provision_organization(client, setup_logger):
+    """Test an organization and its user are created in one transaction."""
+    logger = setup_logger("test_provision_organization")
+    log = []
+
+    def log_statement(conn, cursor, statement, parameters, context, many):
+        log.append(statement.split("(")[0].strip())
+
+    def log_commit(conn):
+        log.append("COMMIT")
+
+    event.listen(db.engine, "before_cursor_execute", log_statement)
+    event.listen(db.engine, "commit", log_commit)
+    try:
+        user = provision_organization(
+            "Provisioned Org", "312-555-0100", "new@example.com", "new312"
+        )
+
+        # A new organization is not listed, so it has no read model row
+        provisioning = log[: log.index("COMMIT")]
+        assert provisioning == [
+            "INSERT INTO organizations",
+            "INSERT INTO users",
+        ], "Organization and user not written in one flush"
+
+        assert user.organization.name == "Provisioned Org"
+        assert user.organization.status == "HIDDEN"
+        assert bcrypt.check_password_hash(user.password, "new312")
+        logger.info("Organization provisioned.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        event.remove(db.engine, "before_cursor_execute", log_statement)
+        event.remove(db.engine, "commit", log_commit)
+        remove_provisioned("new@example.com")
+
+
+def test_provision_organization_rolled_back(test_user, setup_logger):
+    """Test no organization is kept when its user cannot be created."""
+    logger = setup_logger("test_provision_organization_rolled_back")
+    try:
+        with pytest.raises(IntegrityError):
+            provision_organization(
+                "Duplicate Org", "312-555-0100", test_user.email, "test312"
+            )
+
+        assert Organization.query.filter_by(name="Duplicate Org").count() == 0
+        assert User.query.filter_by(email=test_user.email).count() == 1
+        logger.info("Provisioning rolled back.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_add_organization_provisions_user(
+    client, logged_in_state, test_user, capture_templates, setup_logger
+):
+    """Test the add organization page creates the organization and user."""
+    logger = setup_logger("test_add_organization_provisions_user")
+    test_user.role = "admin"
+    db.session.commit()
+    form = {
+        "email": "partner@example.com",
+        "email-confirm": "partner@example.com",
+        "phone-number": "312-555-0100",
+        "org-name": "Partner Org",
+    }
+    try:
+        response = client.post("/add_organization", data=form)
+        assert response.status_code == HTTPStatus.OK
+        assert capture_templates[-1][0].name == "add_organization_success.html"
+
+        user = User.query.filter_by(email="partner@example.com").one()
+        assert user.organization.name == "Partner Org"
+        assert bcrypt.check_password_hash(user.password, "partner312")
+
+        # Adding the same email address again creates nothing; the page only
+        # shows the first flashed message, so earlier ones are dropped
+        with client.session_transaction() as session:
+            session.pop("_flashes", None)
+        form["org-name"] = "Second Partner Org"
+        response = client.post("/add_organization", data=form)
+        assert capture_templates[-1][0].name == "add_organization.html"
+        assert b"Email address already exists" in response.data
+        assert Organization.query.filter_by(name=form["org-name"]).count() == 0
+        logger.info("Organization and user provisioned.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        remove_provisioned("partner@example.com")
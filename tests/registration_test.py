@@ -0,0 +1,156 @@
+"""Project: New Arrivals Chi.
+
+File name: registration_test.py
+
+Associated Files: data_handler.py, authorize_routes.py
+
+This test suite verifies that an organization's location and hours are
+registered in a single transaction.
+
+Methods:
+   * test_org_registration_single_transaction
+   * test_org_registration_rolled_back
+   * test_org_registration_read_model_rolled_back
+"""
+
+import pytest
+from flask_login import login_user
+from sqlalchemy import event
+from new_arrivals_chi.app import data_handler
+from new_arrivals_chi.app.database import (
+    db,
+    Hours,
+    Location,
+    OrganizationDirectory,
+    Service,
+)
+from new_arrivals_chi.app.data_handler import org_registration
+
+LOCATION = {
+    "street": "1 Main St",
+    "zip-code": "60608",
+    "city": "Chicago",
+    "state": "IL",
+    "neighborhood": "Pilsen",
+}
+
+
+def test_org_registration_single_transaction(
+    app, test_user, test_organization, setup_logger
+):
+    """Test a week of split shifts is written in one transaction."""
+    logger = setup_logger("test_org_registration_single_transaction")
+    hours = {
+        str(day): [("09:00", "12:00"), ("13:00", "17:00")]
+        for day in range(1, 8)
+    }
+    # With a service, the located organization is listed in the directory
+    service = Service(service="Hot Meals", category="Food", access="Any")
+    test_organization.services.append(service)
+    db.session.commit()
+    log = []
+
+    def log_statement(conn, cursor, statement, parameters, context, many):
+        log.append(statement.split("(")[0].strip())
+
+    def log_commit(conn):
+        log.append("COMMIT")
+
+    try:
+        with app.test_request_context():
+            login_user(test_user)
+            event.listen(db.engine, "before_cursor_execute", log_statement)
+            event.listen(db.engine, "commit", log_commit)
+            org_registration(LOCATION, hours)
+
+        # The directory read model is refreshed in the same, single commit
+        assert log.count("COMMIT") == 1, "Committed more than once"
+        registration = log[: log.index("COMMIT")]
+        assert registration.count("INSERT INTO locations") == 1
+        assert registration.count("INSERT INTO hours") == 1
+        assert registration.count("INSERT INTO organizations_hours") == 1
+        assert registration.count("INSERT INTO organization_directory") == 1
+        entry = db.session.get(OrganizationDirectory, test_organization.id)
+        assert entry.neighborhood == "Pilsen"
+
+        organization = test_organization
+        db.session.refresh(organization)
+        assert organization.locations.latitude is not None, "Not geocoded"
+        assert len(organization.hours) == 14
+        monday = sorted(
+            (row.start_minute, row.end_minute)
+            for row in organization.hours
+            if row.day_of_week == 1
+        )
+        assert monday == [(540, 720), (780, 1020)]
+        assert {row.created_by for row in organization.hours} == {test_user.id}
+        logger.info("Registration written in one transaction.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        event.remove(db.engine, "before_cursor_execute", log_statement)
+        event.remove(db.engine, "commit", log_commit)
+        location = test_organization.locations
+        for row in list(test_organization.hours):
+            db.session.delete(row)
+        test_organization.location_id = None
+        if location is not None:
+            db.session.delete(location)
+        test_organization.services.remove(service)
+        db.session.delete(service)
+        OrganizationDirectory.query.filter_by(
+            organization_id=test_organization.id
+        ).delete()
+        db.session.commit()
+
+
+def test_org_registration_rolled_back(
+    app, test_user, test_organization, setup_logger
+):
+    """Test nothing is kept when registration fails part way."""
+    logger = setup_logger("test_org_registration_rolled_back")
+    locations = Location.query.count()
+    hours = Hours.query.count()
+    try:
+        with app.test_request_context():
+            login_user(test_user)
+            with pytest.raises(ValueError):
+                org_registration(
+                    LOCATION, {"1": [("09:00", "12:00"), ("13:00", "25:00")]}
+                )
+
+        assert Location.query.count() == locations, "Location kept"
+        assert Hours.query.count() == hours, "Hours kept"
+        assert db.session.get(type(test_organization), test_organization.id)
+        assert test_organization.location_id is None
+        logger.info("Registration rolled back.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_org_registration_read_model_rolled_back(
+    app, test_user, test_organization, monkeypatch, setup_logger
+):
+    """Test nothing is kept when the read model cannot be refreshed."""
+    logger = setup_logger("test_org_registration_read_model_rolled_back")
+    locations = Location.query.count()
+
+    def fail_refresh(organization_id):
+        raise RuntimeError("read model unavailable")
+
+    monkeypatch.setattr(data_handler, "refresh_directory_entry", fail_refresh)
+    try:
+        with app.test_request_context():
+            login_user(test_user)
+            with pytest.raises(RuntimeError):
+                org_registration(LOCATION, {"1": [("09:00", "12:00")]})
+
+        assert Location.query.count() == locations, "Location kept"
+        assert test_organization.location_id is None
+        assert not test_organization.hours, "Hours kept"
+        logger.info("Registration rolled back with its read model.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,219 @@
+"""Project: New Arrivals Chi.
+
+File name: render_cache_test.py
+
+Associated Files: render_cache.py, main.py, utils.py
+
+This test suite verifies the caches of rendered informational pages and of
+the rows of the health search table.
+
+Methods:
+   * test_page_rendered_once
+   * test_pages_cached_per_language
+   * test_template_change_invalidates
+   * test_signed_in_page_not_cached
+   * test_search_rows_cached
+   * test_search_rows_distance
+   * test_cached_rows_not_loaded
+   * test_search_page_streamed
+"""
+
+import gzip
+import re
+from http import HTTPStatus
+from new_arrivals_chi.app import main
+from new_arrivals_chi.app import render_cache as render_cache_module
+from new_arrivals_chi.app.cache import bump_organization_version
+from new_arrivals_chi.app.constants import STREAM_CHUNK_SIZE
+from new_arrivals_chi.app.main import DISTANCE_SLOT
+from new_arrivals_chi.app.render_cache import fragment_cache, render_cache
+
+
+def test_page_rendered_once(anonymous_client, capture_templates, setup_logger):
+    """Test a page is rendered once, then served from the cache."""
+    logger = setup_logger("test_page_rendered_once")
+    try:
+        render_cache.clear()
+        first = anonymous_client.get("/legal/tps_info")
+        second = anonymous_client.get("/legal/tps_info")
+        assert second.status_code == HTTPStatus.OK
+        assert second.mimetype == "text/html"
+        assert second.data == first.data
+        assert [template.name for template, _ in capture_templates] == [
+            "tps_info.html"
+        ]
+        assert render_cache.stats()["hits"] == 1
+        logger.info("Page rendered once.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_pages_cached_per_language(anonymous_client, setup_logger):
+    """Test languages get their own entry, except unsupported ones."""
+    logger = setup_logger("test_pages_cached_per_language")
+    try:
+        render_cache.clear()
+        english = anonymous_client.get("/about").data
+        spanish = anonymous_client.get("/about?lang=es").data
+        assert spanish != english
+        assert b'<html lang="es">' in spanish
+
+        for lang in ("en", "xx", "%3Cscript%3E"):
+            response = anonymous_client.get(f"/about?lang={lang}")
+            assert response.data == english
+        assert render_cache.stats()["size"] == 2
+        logger.info("Pages cached per language.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_template_change_invalidates(
+    anonymous_client, capture_templates, monkeypatch, setup_logger
+):
+    """Test pages are rendered again once their templates change."""
+    logger = setup_logger("test_template_change_invalidates")
+    try:
+        render_cache.clear()
+        anonymous_client.get("/general")
+        monkeypatch.setattr(
+            render_cache_module, "template_modified", lambda: 2e9
+        )
+        anonymous_client.get("/general")
+        anonymous_client.get("/general")
+        assert len(capture_templates) == 2
+        logger.info("Template change invalidated the page.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_signed_in_page_not_cached(
+    client, logged_in_state, capture_templates, setup_logger
+):
+    """Test pages rendered for a signed-in user are not cached."""
+    logger = setup_logger("test_signed_in_page_not_cached")
+    try:
+        render_cache.clear()
+        client.get("/about")
+        response = client.get("/about")
+        assert b"Logout" in response.data
+        assert len(capture_templates) == 2
+        assert render_cache.stats()["size"] == 0
+        logger.info("Signed-in page not cached.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        client.get("/logout")
+
+
+def test_search_rows_cached(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test search rows are rendered once per organization version."""
+    logger = setup_logger("test_search_rows_cached")
+    try:
+        fragment_cache.clear()
+        first = anonymous_client.get("/health/search").data
+        assert fragment_cache.stats()["misses"] == 3
+        assert first.count(b"<tr>") == 4
+        assert DISTANCE_SLOT.encode() not in first
+
+        second = anonymous_client.get("/health/search?neighborhood=Pilsen").data
+        assert fragment_cache.stats()["hits"] == 2
+        assert b"Alpha Aid" in second
+
+        # Only the written organization's row is rendered again
+        bump_organization_version(directory_organizations["Alpha Aid"])
+        third = anonymous_client.get("/health/search").data
+        assert third == first
+        assert fragment_cache.stats()["misses"] == 4
+
+        # Every language has its own rows
+        anonymous_client.get("/health/search?lang=es").get_data()
+        assert fragment_cache.stats()["misses"] == 7
+        logger.info("Search rows cached.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_rows_distance(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test near searches fill each cached row with its own distance."""
+    logger = setup_logger("test_search_rows_distance")
+    try:
+        fragment_cache.clear()
+        anonymous_client.get("/health/search").get_data()
+        response = anonymous_client.get(
+            "/health/search",
+            query_string={"near": "41.8022,-87.6006", "radius": 10},
+        )
+        assert len(re.findall(rb"<br />\d+\.\d mi", response.data)) == 3
+        assert fragment_cache.stats()["hits"] == 3
+        assert response.data.count(b"<br />0.0 mi") == 1
+        assert DISTANCE_SLOT.encode() not in response.data
+        logger.info("Distances filled into cached rows.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_cached_rows_not_loaded(
+    anonymous_client, directory_organizations, monkeypatch, setup_logger
+):
+    """Test only organizations whose row is not cached are read."""
+    logger = setup_logger("test_cached_rows_not_loaded")
+    loaded = []
+    retrieve = main.retrieve_directory_entries
+
+    def record(organization_ids):
+        loaded.append(organization_ids)
+        return retrieve(organization_ids)
+
+    monkeypatch.setattr(main, "retrieve_directory_entries", record)
+    try:
+        fragment_cache.clear()
+        first = anonymous_client.get("/health/search").data
+        assert len(loaded) == 1 and len(loaded[0]) == 3
+
+        assert anonymous_client.get("/health/search").data == first
+        assert len(loaded) == 1, "Cached rows were read again"
+
+        alpha = directory_organizations["Alpha Aid"]
+        bump_organization_version(alpha)
+        assert anonymous_client.get("/health/search").data == first
+        assert loaded[1] == [alpha]
+        logger.info("Only missing rows loaded.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_page_streamed(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test the search page is streamed in chunks, compressed or not."""
+    logger = setup_logger("test_search_page_streamed")
+    try:
+        response = anonymous_client.get("/health/search")
+        assert response.is_streamed
+        assert "ETag" in response.headers
+        chunks = list(response.response)
+        assert len(chunks) > 1
+        assert all(len(chunk) >= STREAM_CHUNK_SIZE for chunk in chunks[:-1])
+        page = b"".join(chunks)
+        assert b"Gamma Legal" in page and b"</table>" in page
+
+        compressed = anonymous_client.get(
+            "/health/search", headers={"Accept-Encoding": "gzip"}
+        )
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(compressed.data) == page
+        logger.info("Search page streamed.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,323 @@
+"""Project: New Arrivals Chi.
+
+File name: schedule_test.py
+
+Associated Files: schedule.py, database.py, data_handler.py, api_routes.py,
+main.py
+
+This test suite verifies the minute-of-week representation of opening hours
+and the "open now" / "open at" filters built on it.
+
+Methods:
+   * test_hours_minutes_set_on_write
+   * test_open_hours_index
+   * test_local_minute_of_week
+   * test_search_organizations_open_at
+   * test_open_route
+   * test_health_search_open_now
+   * test_retrieve_hours_sorted
+   * test_weekly_schedule
+   * test_organization_schedule_route
+   * test_schedule_follows_other_processes
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from http import HTTPStatus
+from new_arrivals_chi.app import main
+from new_arrivals_chi.app.cache import bump_organization_version
+from new_arrivals_chi.app.database import (
+    db,
+    Hours,
+    OrganizationDirectory,
+    minute_of_week,
+)
+from new_arrivals_chi.app.data_handler import (
+    retrieve_hours,
+    search_organizations,
+)
+from new_arrivals_chi.app.schedule import (
+    OpenHoursIndex,
+    WeeklySchedule,
+    local_minute_of_week,
+    schedule_cache,
+)
+
+MONDAY_10AM = minute_of_week(1, time(10, 0))
+
+
+def test_hours_minutes_set_on_write(client, setup_logger):
+    """Test the minute-of-week range follows the day and times."""
+    logger = setup_logger("test_hours_minutes_set_on_write")
+    hours = Hours(
+        day_of_week=2, opening_time=time(8, 30), closing_time=time(16, 0)
+    )
+    db.session.add(hours)
+    db.session.commit()
+    try:
+        assert (hours.start_minute, hours.end_minute) == (1950, 2400)
+
+        hours.day_of_week = 7
+        hours.closing_time = time(23, 59)
+        db.session.commit()
+        assert (hours.start_minute, hours.end_minute) == (9150, 10079)
+        assert minute_of_week("3", "09:15") == 2 * 1440 + 555
+        logger.info("Minute-of-week range kept in step.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+    finally:
+        db.session.delete(hours)
+        db.session.commit()
+
+
+def test_open_hours_index(setup_logger):
+    """Test lookups, windows, ranges spanning buckets and removal."""
+    logger = setup_logger("test_open_hours_index")
+    try:
+        index = OpenHoursIndex()
+        index.update(1, [(540, 720), (780, 1020)])
+        index.update(2, [(600, 660)])
+        index.update(3, [(1980, 2400)])
+
+        assert index.open_during(600) == [1, 2]
+        assert index.open_during(720) == [], "Closing minute counted as open"
+        assert index.open_during(900) == [1], "Later bucket not indexed"
+        assert index.open_during(540, 720) == [1]
+        assert index.open_during(700, 800) == [], "Window spans a break"
+        assert index.open_during(2000, 2100) == [3]
+
+        index.update(1, [(600, 630)])
+        assert index.open_during(900) == [], "Stale range kept"
+        index.remove(2)
+        assert index.open_during(600) == [1]
+        assert len(index) == 2
+        logger.info("Opening hours index answered lookups.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_local_minute_of_week(setup_logger):
+    """Test datetimes are converted to Chicago minutes of the week."""
+    logger = setup_logger("test_local_minute_of_week")
+    try:
+        assert local_minute_of_week(datetime(2026, 10, 19, 10, 0)) == (
+            MONDAY_10AM
+        )
+        utc = datetime(2026, 10, 19, 15, 0, tzinfo=timezone.utc)
+        assert local_minute_of_week(utc) == MONDAY_10AM, "Offset ignored"
+        assert 0 <= local_minute_of_week() < 7 * 1440
+        logger.info("Minutes of the week computed in Chicago time.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_organizations_open_at(
+    client, directory_organizations, setup_logger
+):
+    """Test the directory search filters on the minute-of-week range."""
+    logger = setup_logger("test_search_organizations_open_at")
+    try:
+        ids, _ = search_organizations(open_at=MONDAY_10AM)
+        assert ids == [directory_organizations["Alpha Aid"]]
+
+        ids, _ = search_organizations(open_at=minute_of_week(1, time(12, 30)))
+        assert ids == [], "Organization open during its lunch break"
+        logger.info("Directory search filtered on open hours.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_open_route(client, directory_organizations, setup_logger):
+    """Test the open route looks up a time and a window."""
+    logger = setup_logger("test_open_route")
+    try:
+        response = client.get("/api/open?at=2026-10-19T10:00")
+        assert response.status_code == HTTPStatus.OK
+        assert response.get_json() == {
+            "minute_of_week": MONDAY_10AM,
+            "organization_ids": [directory_organizations["Alpha Aid"]],
+        }
+
+        response = client.get("/api/open?at=2026-10-20T09:00&until=15:30")
+        assert response.get_json()["organization_ids"] == [
+            directory_organizations["Beta Health"]
+        ]
+        response = client.get("/api/open?at=2026-10-19T10:00&until=13:00")
+        assert response.get_json()["organization_ids"] == []
+
+        assert client.get("/api/open?at=soon").status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+        response = client.get("/api/open?at=2026-10-19T10:00&until=09:00")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        logger.info("Open route answered lookups.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_health_search_open_now(
+    client,
+    directory_organizations,
+    capture_templates,
+    monkeypatch,
+    setup_logger,
+):
+    """Test the health search page filters on organizations open now."""
+    logger = setup_logger("test_health_search_open_now")
+    monkeypatch.setattr(main, "local_minute_of_week", lambda: MONDAY_10AM)
+    try:
+        response = client.get("/health/search", query_string={"open": "now"})
+        assert response.status_code == HTTPStatus.OK
+        assert b"Alpha Aid" in response.data
+
+        _, context = capture_templates[-1]
+        assert context["organization_ids"] == [
+            directory_organizations["Alpha Aid"]
+        ], "Open now filter not applied"
+        assert context["active_filters"] == {"open": "now"}
+        logger.info("Health search filtered on open now.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_retrieve_hours_sorted(setup_logger):
+    """Test hours rows are grouped by day and ordered by opening time."""
+    logger = setup_logger("test_retrieve_hours_sorted")
+    rows = [
+        Hours(
+            day_of_week=day,
+            opening_time=time(opening),
+            closing_time=time(closing),
+        )
+        for day, opening, closing in [
+            (3, 14, 18),
+            (1, 13, 17),
+            (3, 8, 12),
+            (1, 9, 12),
+        ]
+    ]
+    try:
+        hours = retrieve_hours(rows)
+        assert list(hours) == [
+            "monday",
+            "tuesday",
+            "wednesday",
+            "thursday",
+            "friday",
+            "saturday",
+            "sunday",
+        ]
+        assert [slot.open for slot in hours["monday"]] == [time(9), time(13)]
+        assert [slot.open for slot in hours["wednesday"]] == [
+            time(8),
+            time(14),
+        ]
+        assert hours["tuesday"] == ()
+        logger.info("Hours sorted.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_weekly_schedule(setup_logger):
+    """Test today's hours, closing time and next opening of a schedule."""
+    logger = setup_logger("test_weekly_schedule")
+    monday_1pm = minute_of_week(1, time(13, 0))
+    friday_9am = minute_of_week(5, time(9, 0))
+    schedule = WeeklySchedule.from_intervals(
+        [(friday_9am, friday_9am + 480), (monday_1pm, monday_1pm + 240)]
+    )
+    try:
+        assert schedule.intervals[0] == (monday_1pm, monday_1pm + 240)
+        assert schedule.today(MONDAY_10AM) == ((monday_1pm, monday_1pm + 240),)
+        assert schedule.today(minute_of_week(2, time(10))) == ()
+
+        assert schedule.open_until(MONDAY_10AM) is None
+        assert schedule.open_until(monday_1pm) == monday_1pm + 240
+        assert schedule.open_until(monday_1pm + 240) is None, "Half-open"
+
+        assert schedule.next_opening(MONDAY_10AM) == monday_1pm
+        assert schedule.next_opening(monday_1pm) == friday_9am
+        assert (
+            schedule.next_opening(friday_9am + 60) == monday_1pm
+        ), "Next week not wrapped"
+        assert WeeklySchedule.from_intervals([]).next_opening(0) is None
+        logger.info("Weekly schedule answered lookups.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_organization_schedule_route(
+    client, directory_organizations, setup_logger
+):
+    """Test the schedule route answers from the cached weekly schedule."""
+    logger = setup_logger("test_organization_schedule_route")
+    alpha = directory_organizations["Alpha Aid"]
+    try:
+        schedule_cache.clear()
+        response = client.get(f"/api/open/{alpha}?at=2026-10-19T10:00")
+        assert response.status_code == HTTPStatus.OK
+        assert response.get_json() == {
+            "organization_id": alpha,
+            "minute_of_week": MONDAY_10AM,
+            "open_until": minute_of_week(1, time(12)),
+            "today": [[540, 720], [780, 1020]],
+            "next_opening": minute_of_week(1, time(13)),
+        }
+
+        response = client.get(f"/api/open/{alpha}?at=2026-10-25T10:00")
+        data = response.get_json()
+        assert data["open_until"] is None and data["today"] == []
+        assert data["next_opening"] == minute_of_week(1, time(9))
+        assert schedule_cache.stats()["hits"] == 1
+
+        bump_organization_version(alpha)
+        client.get(f"/api/open/{alpha}")
+        assert schedule_cache.stats()["misses"] == 2, "Not rebuilt on write"
+
+        unlisted = directory_organizations["Delta No Services"]
+        assert client.get(f"/api/open/{unlisted}").status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+        assert client.get(f"/api/open/{alpha}?at=soon").status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+        logger.info("Schedule route answered lookups.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_schedule_follows_other_processes(
+    client,
+    directory_organizations,
+    directory_checked_every_lookup,
+    setup_logger,
+):
+    """Test schedules show hours changed by another process."""
+    logger = setup_logger("test_schedule_follows_other_processes")
+    alpha = directory_organizations["Alpha Aid"]
+    try:
+        response = client.get(f"/api/open/{alpha}?at=2026-10-19T10:00")
+        assert response.get_json()["today"] == [[540, 720], [780, 1020]]
+
+        # Written like another process would, without this process's hooks
+        # or versions; its clock puts the write a second after the last one
+        latest = db.session.query(db.func.max(OrganizationDirectory.updated_at))
+        entry = db.session.get(OrganizationDirectory, alpha)
+        entry.hours = {"monday": [["10:00:00", "11:00:00"]]}
+        entry.updated_at = latest.scalar() + timedelta(seconds=1)
+        db.session.commit()
+
+        response = client.get(f"/api/open/{alpha}?at=2026-10-19T10:00")
+        assert response.get_json()["today"] == [[600, 660]], "Stale hours"
+        logger.info("Schedule followed another process.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
@@ -0,0 +1,133 @@
+"""Project: New Arrivals Chi.
+
+File name: search_test.py
+
+Associated Files: data_handler.py, api_routes.py, database.py
+
+This test suite verifies the full-text search over organization names and
+services.
+
+Methods:
+   * test_full_text_search_ranks_matches
+   * test_full_text_search_requires_every_word
+   * test_full_text_search_follows_writes
+   * test_search_route
+   * test_postgres_search_index
+"""
+
+from http import HTTPStatus
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from new_arrivals_chi.app.database import (
+    db,
+    Organization,
+    OrganizationDirectory,
+)
+from new_arrivals_chi.app.data_handler import (
+    full_text_search,
+    invalidate_organization,
+    refresh_directory_entry,
+)
+
+
+def test_full_text_search_ranks_matches(
+    client, directory_organizations, setup_logger
+):
+    """Test name matches rank above service matches and prefixes match."""
+    logger = setup_logger("test_full_text_search_ranks_matches")
+    try:
+        assert full_text_search("h") == [
+            directory_organizations["Beta Health"],
+            directory_organizations["Alpha Aid"],
+        ], "Name match not ranked first"
+        assert full_text_search("VACCINATION") == [
+            directory_organizations["Beta Health"]
+        ]
+        assert full_text_search("clothing") == [], "Unlisted org matched"
+        assert full_text_search("  ") == []
+        logger.info("Full-text search ranked matches.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_full_text_search_requires_every_word(
+    client, directory_organizations, setup_logger
+):
+    """Test every word of the query must match."""
+    logger = setup_logger("test_full_text_search_requires_every_word")
+    try:
+        assert full_text_search("legal advice") == [
+            directory_organizations["Gamma Legal"]
+        ]
+        assert full_text_search("legal meals") == []
+        assert full_text_search('"food*) -') == [
+            directory_organizations["Alpha Aid"]
+        ], "Query syntax not escaped"
+        logger.info("Full-text search required every word.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_full_text_search_follows_writes(
+    client, directory_organizations, setup_logger
+):
+    """Test the search index follows read model writes."""
+    logger = setup_logger("test_full_text_search_follows_writes")
+    org_id = directory_organizations["Gamma Legal"]
+    try:
+        organization = db.session.get(Organization, org_id)
+        organization.name = "Gamma Immigration Clinic"
+        organization.services[0].service_note = "Asylum interviews"
+        refresh_directory_entry(org_id)
+        db.session.commit()
+        invalidate_organization(org_id)
+
+        assert full_text_search("asylum") == [org_id], "Note not indexed"
+        assert full_text_search("clinic") == [org_id], "Name not reindexed"
+
+        db.session.delete(db.session.get(OrganizationDirectory, org_id))
+        db.session.commit()
+        assert full_text_search("clinic") == [], "Deleted row still indexed"
+        logger.info("Full-text search followed writes.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_route(client, directory_organizations, setup_logger):
+    """Test the search route returns ranked organization ids."""
+    logger = setup_logger("test_search_route")
+    try:
+        response = client.get("/api/search?q=h&limit=1")
+        assert response.status_code == HTTPStatus.OK
+        assert response.get_json() == {
+            "query": "h",
+            "organization_ids": [directory_organizations["Beta Health"]],
+        }
+
+        response = client.get("/api/search?limit=abc")
+        assert response.get_json()["organization_ids"] == []
+        logger.info("Search route returned ranked ids.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_postgres_search_index(setup_logger):
+    """Test Postgres gets a GIN index over the weighted search document."""
+    logger = setup_logger("test_postgres_search_index")
+    try:
+        index = next(
+            index
+            for index in OrganizationDirectory.__table__.indexes
+            if index.name == "ix_organization_directory_search"
+        )
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        assert "USING gin" in ddl
+        assert "setweight(to_tsvector('simple'::regconfig, name)" in ddl
+        logger.info("Postgres search index compiled.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
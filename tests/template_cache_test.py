@@ -0,0 +1,87 @@
+"""Project: New Arrivals Chi.
+
+File name: template_cache_test.py
+
+Associated Files: template_cache.py, commands.py
+
+This test suite verifies the bytecode cache of compiled templates.
+
+Methods:
+   * test_precompile_templates
+   * test_templates_loaded_from_bytecode
+   * test_bytecode_cache_disabled
+"""
+
+import pytest
+from jinja2 import Environment, FileSystemBytecodeCache
+from new_arrivals_chi.app.template_cache import (
+    init_bytecode_cache,
+    precompile_templates,
+)
+
+
+def test_precompile_templates(app, bytecode_directory, setup_logger):
+    """Test every template is compiled into the cache once."""
+    logger = setup_logger("test_precompile_templates")
+    try:
+        result = app.test_cli_runner().invoke(args=["precompile-templates"])
+        assert result.exit_code == 0, result.output
+
+        compiled, _ = precompile_templates(app)
+        assert "base.html" in compiled
+        assert len(compiled) > 30
+        assert f"Compiled {len(compiled)} templates" in result.output
+
+        files = {
+            path: path.stat().st_mtime_ns
+            for path in bytecode_directory.iterdir()
+        }
+        assert len(files) == len(compiled)
+
+        # Up to date bytecode is not written again
+        precompile_templates(app)
+        assert {
+            path: path.stat().st_mtime_ns
+            for path in bytecode_directory.iterdir()
+        } == files
+        logger.info("Templates precompiled.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_templates_loaded_from_bytecode(app, bytecode_directory, setup_logger):
+    """Test a new environment loads templates without compiling them."""
+    logger = setup_logger("test_templates_loaded_from_bytecode")
+    try:
+        precompile_templates(app)
+
+        def compile_source(*args, **kwargs):
+            raise AssertionError("Template compiled despite cached bytecode")
+
+        environment = Environment(
+            loader=app.jinja_env.loader,
+            bytecode_cache=FileSystemBytecodeCache(str(bytecode_directory)),
+        )
+        environment.compile = compile_source
+        assert environment.get_template("home.html") is not None
+        logger.info("Template loaded from bytecode.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_bytecode_cache_disabled(app, monkeypatch, setup_logger):
+    """Test an empty cache directory disables the bytecode cache."""
+    logger = setup_logger("test_bytecode_cache_disabled")
+    monkeypatch.setitem(app.config, "JINJA_BYTECODE_CACHE_DIR", "")
+    monkeypatch.setattr(app.jinja_env, "bytecode_cache", None)
+    try:
+        init_bytecode_cache(app)
+        assert app.jinja_env.bytecode_cache is None
+        with pytest.raises(RuntimeError):
+            precompile_templates(app)
+        logger.info("Bytecode cache disabled.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
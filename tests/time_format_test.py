@@ -0,0 +1,75 @@
+"""Project: New Arrivals Chi.
+
+File name: time_format_test.py
+
+Associated Files: utils.py, health_search_row.html, organization.html
+
+This test suite verifies that times of day are formatted for the language of
+the page.
+
+Methods:
+   * test_format_time_for_locale
+   * test_search_hours_formatted
+   * test_organization_hours_formatted
+"""
+
+import re
+from datetime import time
+from new_arrivals_chi.app.utils import format_time_for_locale
+
+
+def page_text(response):
+    """Returns the text of a page with its whitespace collapsed."""
+    return re.sub(r"\s+", " ", response.get_data(as_text=True))
+
+
+def test_format_time_for_locale(setup_logger):
+    """Test times are formatted per language, and only once."""
+    logger = setup_logger("test_format_time_for_locale")
+    try:
+        format_time_for_locale.cache_clear()
+        assert format_time_for_locale(time(13, 30), "en") == "1:30\u202fPM"
+        assert format_time_for_locale(time(13, 30), "es") == "13:30"
+
+        format_time_for_locale(time(13, 30), "en")
+        assert format_time_for_locale.cache_info().hits == 1
+        logger.info("Times formatted per language.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_search_hours_formatted(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test the health search table shows hours in the page's language."""
+    logger = setup_logger("test_search_hours_formatted")
+    try:
+        english = page_text(anonymous_client.get("/health/search"))
+        assert "Monday: 9:00 AM - 12:00 PM, 1:00 PM - 5:00 PM" in english
+        assert "Tuesday: 8:00 AM - 4:00 PM" in english
+
+        spanish = page_text(anonymous_client.get("/health/search?lang=es"))
+        assert "Monday: 9:00 - 12:00, 13:00 - 17:00" in spanish
+        assert "Tuesday: 8:00 - 16:00" in spanish
+        assert " AM" not in spanish
+        logger.info("Search hours formatted.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_organization_hours_formatted(
+    anonymous_client, directory_organizations, setup_logger
+):
+    """Test the organization page shows hours in the page's language."""
+    logger = setup_logger("test_organization_hours_formatted")
+    try:
+        alpha = directory_organizations["Alpha Aid"]
+        page = page_text(anonymous_client.get(f"/org/{alpha}?lang=es"))
+        assert "9:00 - 12:00 , 13:00 - 17:00" in page
+        assert "9:00 AM" not in page
+        logger.info("Organization hours formatted.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
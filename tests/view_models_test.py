@@ -0,0 +1,103 @@
+"""Project: New Arrivals Chi.
+
+File name: view_models_test.py
+
+Associated Files: view_models.py, data_handler.py, api_routes.py
+
+This test suite verifies the read-only views of organizations built by the
+read path.
+
+Methods:
+   * test_views_read_only
+   * test_views_dictionary_access
+   * test_views_serialized
+"""
+
+import dataclasses
+import json
+from datetime import time
+import pytest
+from new_arrivals_chi.app.api_routes import json_default
+from new_arrivals_chi.app.data_handler import (
+    extract_organization,
+    retrieve_directory_entry,
+)
+from new_arrivals_chi.app.view_models import (
+    HoursSlot,
+    LocationView,
+    OrganizationView,
+    ServiceView,
+)
+
+
+def test_views_read_only(directory_organizations, setup_logger):
+    """Test organizations are built as immutable, slotted views."""
+    logger = setup_logger("test_views_read_only")
+    try:
+        organization = extract_organization(
+            directory_organizations["Alpha Aid"]
+        )
+        assert isinstance(organization, OrganizationView)
+        assert isinstance(organization.service[0], ServiceView)
+        assert organization.hours["monday"] == (
+            HoursSlot(time(9), time(12)),
+            HoursSlot(time(13), time(17)),
+        )
+
+        for view in (organization, organization.service[0]):
+            assert not hasattr(view, "__dict__"), "View is not slotted"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            organization.name = "Changed"
+        with pytest.raises(TypeError):
+            organization.hours["monday"] = ()
+        logger.info("Views are read only.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_views_dictionary_access(directory_organizations, setup_logger):
+    """Test views are read like the dictionaries they replace."""
+    logger = setup_logger("test_views_dictionary_access")
+    try:
+        entry = retrieve_directory_entry(directory_organizations["Alpha Aid"])
+        assert entry["name"] == entry.name == "Alpha Aid"
+        assert entry["hours"]["monday"][0]["open"] == time(9)
+        assert entry["service"][0]["service"] == "Hot Meals"
+        assert entry.get("email") is None
+        assert "hours_summary" not in entry
+        with pytest.raises(KeyError):
+            entry["email"]
+
+        assert dict(entry)["id"] == entry.id
+        assert entry.service[0].dates == ()
+        logger.info("Views read like dictionaries.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise
+
+
+def test_views_serialized(directory_organizations, setup_logger):
+    """Test views are serialized to the JSON of the former dictionaries."""
+    logger = setup_logger("test_views_serialized")
+    try:
+        organization = extract_organization(
+            directory_organizations["Alpha Aid"]
+        )
+        record = json.loads(json.dumps(organization, default=json_default))
+        assert list(record) == list(OrganizationView.__dataclass_fields__)
+        assert record["hours"]["monday"][0] == {
+            "open": "09:00:00",
+            "close": "12:00:00",
+        }
+        assert record["service"][0]["service"] == "Hot Meals"
+
+        location = LocationView("1 Main St", "60608", "Chicago", "IL", True, "")
+        assert location.to_dict()["street address"] == "1 Main St"
+        assert dict(location) == location.to_dict()
+        assert location["street address"] == location.street_address
+        assert "street_address" not in location
+        logger.info("Views serialized.")
+    except AssertionError as e:
+        logger.error(f"Test failed: {str(e)}")
+        raise